@@ -2,3 +2,6 @@ from squadai.agent import Agent
 from squadai.squad import Squad
 from squadai.process import Process
 from squadai.task import Task
+from squadai.tasks.executor_backend import ExecutorBackend
+from squadai.tasks.map_reduce_task import MapReduceTask
+from squadai.pipeline import Pipeline, PipelineStage
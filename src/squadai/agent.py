@@ -1,4 +1,6 @@
+import asyncio
 import os
+import threading
 import uuid
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -22,9 +24,20 @@ from pydantic_core import PydanticCustomError
 
 from squadai.agents import CacheHandler, SquadAgentExecutor, SquadAgentParser, ToolsHandler
 from squadai.memory.contextual.contextual_memory import ContextualMemory
-from squadai.utilities import I18N, Logger, Prompts, RPMController
+from squadai.squads.events import TaskStartedEvent, TokenStreamHandler
+from squadai.utilities import (
+    I18N,
+    CallPolicy,
+    CancellationToken,
+    Logger,
+    Prompts,
+    RPMController,
+)
+from squadai.utilities.cancellation import CancellationHandler
 from squadai.utilities.token_counter_callback import TokenCalcHandler, TokenProcess
 
+MAX_COMPILED_EXECUTORS = 16
+
 
 class Agent(BaseModel):
     """Represents an agent in a system.
@@ -43,8 +56,10 @@ class Agent(BaseModel):
             max_iter: Maximum number of iterations for an agent to execute a task.
             memory: Whether the agent should have memory or not.
             max_rpm: Maximum number of requests per minute for the agent execution to be respected.
+            call_policy: Retries, backoff, timeout and hedging of the LLM calls of the agent.
             verbose: Whether the agent execution should be in verbose mode.
             allow_delegation: Whether the agent is allowed to delegate tasks to other agents.
+            replicas: Number of replicas of the agent working at the same time on the work delegated to it, unlimited by default.
             tools: Tools at agents disposal
             step_callback: Callback to be executed after each step of the agent execution.
             callbacks: A list of callback functions from the langchain library that are triggered during the agent's execution process
@@ -54,7 +69,15 @@ class Agent(BaseModel):
     _logger: Logger = PrivateAttr()
     _rpm_controller: RPMController = PrivateAttr(default=None)
     _request_within_rpm_limit: Any = PrivateAttr(default=None)
-    _token_process: TokenProcess = TokenProcess()
+    _cancellation_token: Optional[CancellationToken] = PrivateAttr(default=None)
+    _busy_replicas: int = PrivateAttr(default=0)
+    _compiled_executors: Dict[Tuple[Any, ...], SquadAgentExecutor] = PrivateAttr(
+        default_factory=dict
+    )
+    _compiled_executors_lock: threading.Lock = PrivateAttr(
+        default_factory=threading.Lock
+    )
+    _token_process: TokenProcess = PrivateAttr(default_factory=TokenProcess)
 
     formatting_errors: int = 0
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -78,6 +101,10 @@ class Agent(BaseModel):
         default=None,
         description="Maximum number of requests per minute for the agent execution to be respected.",
     )
+    call_policy: CallPolicy = Field(
+        default_factory=CallPolicy,
+        description="Retries, backoff, timeout and hedging of the LLM calls of the agent.",
+    )
     verbose: bool = Field(
         default=False, description="Verbose mode for the Agent Execution"
     )
@@ -87,6 +114,11 @@ class Agent(BaseModel):
     tools: Optional[List[Any]] = Field(
         default_factory=list, description="Tools at agents disposal"
     )
+    replicas: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Number of replicas of the agent working at the same time on the work delegated to it, unlimited by default.",
+    )
     max_iter: Optional[int] = Field(
         default=25, description="Maximum iterations for an agent to execute a task"
     )
@@ -168,6 +200,16 @@ class Agent(BaseModel):
     @model_validator(mode="after")
     def set_agent_executor(self) -> "Agent":
         """set agent executor is set."""
+        self._count_llm_tokens()
+
+        if not self.agent_executor:
+            if not self.cache_handler:
+                self.cache_handler = CacheHandler()
+            self.set_cache_handler(self.cache_handler)
+        return self
+
+    def _count_llm_tokens(self) -> None:
+        """Counts the tokens of the language model in the usage of the agent."""
         if hasattr(self.llm, "model_name"):
             token_handler = TokenCalcHandler(self.llm.model_name, self._token_process)
 
@@ -181,17 +223,12 @@ class Agent(BaseModel):
             ):
                 self.llm.callbacks.append(token_handler)
 
-        if not self.agent_executor:
-            if not self.cache_handler:
-                self.cache_handler = CacheHandler()
-            self.set_cache_handler(self.cache_handler)
-        return self
-
     def execute_task(
         self,
         task: Any,
         context: Optional[str] = None,
         tools: Optional[List[Any]] = None,
+        cancellation_token: Optional[CancellationToken] = None,
     ) -> str:
         """Execute a task with the agent.
 
@@ -199,52 +236,155 @@ class Agent(BaseModel):
             task: Task to execute.
             context: Context to execute the task in.
             tools: Tools to use for the task.
+            cancellation_token: Token to stop this execution, defaults to the token
+                of the squad execution.
+
+        Returns:
+            Output of the agent
+        """
+        if self.squad:
+            self.squad._emit(TaskStartedEvent(task=task.description, agent=self.role))
+
+        task_prompt = self._task_prompt(task, context)
+
+        if self.squad and self.squad.memory:
+            memory = self._contextual_memory().build_context_for_task(task, context)
+            task_prompt = self._add_memory_to_prompt(task_prompt, memory)
+
+        cancellation_token = cancellation_token or self._cancellation_token
+        agent_executor = self._call_executor(task, tools, cancellation_token)
+
+        result = agent_executor.invoke(
+            self._executor_inputs(agent_executor, task_prompt),
+            config=self._executor_config(task, cancellation_token),
+        )["output"]
+
+        return result
+
+    async def aexecute_task(
+        self,
+        task: Any,
+        context: Optional[str] = None,
+        tools: Optional[List[Any]] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> str:
+        """Execute a task with the agent without blocking the event loop.
+
+        Args:
+            task: Task to execute.
+            context: Context to execute the task in.
+            tools: Tools to use for the task.
+            cancellation_token: Token to stop this execution, defaults to the token
+                of the squad execution.
 
         Returns:
             Output of the agent
         """
-        if self.tools_handler:
-            self.tools_handler.last_used_tool = {}
+        if self.squad:
+            self.squad._emit(TaskStartedEvent(task=task.description, agent=self.role))
+
+        task_prompt = self._task_prompt(task, context)
+
+        if self.squad and self.squad.memory:
+            memory = await asyncio.to_thread(
+                self._contextual_memory().build_context_for_task, task, context
+            )
+            task_prompt = self._add_memory_to_prompt(task_prompt, memory)
+
+        cancellation_token = cancellation_token or self._cancellation_token
+        agent_executor = self._call_executor(task, tools, cancellation_token)
+
+        result = (
+            await agent_executor.ainvoke(
+                self._executor_inputs(agent_executor, task_prompt),
+                config=self._executor_config(task, cancellation_token),
+            )
+        )["output"]
+
+        return result
 
+    def _task_prompt(self, task: Any, context: Optional[str]) -> str:
+        """Build the prompt of the task, including its context."""
         task_prompt = task.prompt()
 
         if context:
             task_prompt = self.i18n.slice("task_with_context").format(
                 task=task_prompt, context=context
             )
+        return task_prompt
 
-        if self.squad and self.squad.memory:
-            contextual_memory = ContextualMemory(
-                self.squad._short_term_memory,
-                self.squad._long_term_memory,
-                self.squad._entity_memory,
-            )
-            memory = contextual_memory.build_context_for_task(task, context)
-            if memory.strip() != "":
-                task_prompt += self.i18n.slice("memory").format(memory=memory)
-
-        tools = tools or self.tools
-        parsed_tools = self._parse_tools(tools)
-
-        self.create_agent_executor(tools=tools)
-        self.agent_executor.tools = parsed_tools
-        self.agent_executor.task = task
+    def _contextual_memory(self) -> ContextualMemory:
+        return ContextualMemory(
+            self.squad._short_term_memory,
+            self.squad._long_term_memory,
+            self.squad._entity_memory,
+        )
 
-        self.agent_executor.tools_description = render_text_description(parsed_tools)
-        self.agent_executor.tools_names = self.__tools_names(parsed_tools)
+    def _add_memory_to_prompt(self, task_prompt: str, memory: str) -> str:
+        if memory.strip() != "":
+            task_prompt += self.i18n.slice("memory").format(memory=memory)
+        return task_prompt
 
-        result = self.agent_executor.invoke(
-            {
-                "input": task_prompt,
-                "tool_names": self.agent_executor.tools_names,
-                "tools": self.agent_executor.tools_description,
+    def _call_executor(
+        self,
+        task: Any,
+        tools: Optional[List[Any]],
+        cancellation_token: Optional[CancellationToken],
+    ) -> SquadAgentExecutor:
+        """Executor isolated for a single execution of a task.
+
+        It shares the compiled runnable and tools of the agent, but keeps the task,
+        iterations and last used tool of the call to itself, so the agent can run
+        several tasks or delegations at once.
+        """
+        agent_executor = self.compile_agent_executor(tools)
+        return SquadAgentExecutor.construct(
+            **{
+                **agent_executor.__dict__,
+                "task": task,
+                "squad": self.squad,
+                "cancellation_token": cancellation_token,
+                "tools_handler": (
+                    ToolsHandler(
+                        cache=self.tools_handler.cache, parent=self.tools_handler
+                    )
+                    if self.tools_handler
+                    else None
+                ),
             }
-        )["output"]
-
-        if self.max_rpm:
-            self._rpm_controller.stop_rpm_counter()
+        )
 
-        return result
+    def _executor_config(
+        self, task: Any, cancellation_token: Optional[CancellationToken]
+    ) -> Optional[Dict[str, Any]]:
+        """Callbacks streaming the tokens of the agent, counting the tokens of the
+        task execution and against the TPM limit, and stopping it once cancelled."""
+        callbacks = []
+        token_process = getattr(task, "_token_process", None)
+        if token_process is not None and hasattr(self.llm, "model_name"):
+            callbacks.append(TokenCalcHandler(self.llm.model_name, token_process))
+        if (
+            self._rpm_controller
+            and self._rpm_controller.max_tpm
+            and hasattr(self.llm, "model_name")
+        ):
+            callbacks.append(
+                TokenCalcHandler(self.llm.model_name, self._rpm_controller)
+            )
+        if self.squad and self.squad._event_handler:
+            callbacks.append(TokenStreamHandler(self.role, self.squad._emit))
+        if cancellation_token:
+            callbacks.append(CancellationHandler(cancellation_token))
+        return {"callbacks": callbacks} if callbacks else None
+
+    def _executor_inputs(
+        self, agent_executor: SquadAgentExecutor, task_prompt: str
+    ) -> Dict[str, str]:
+        return {
+            "input": task_prompt,
+            "tool_names": agent_executor.tools_names,
+            "tools": agent_executor.tools_description,
+        }
 
     def set_cache_handler(self, cache_handler: CacheHandler) -> None:
         """Set the cache handler for the agent.
@@ -271,12 +411,56 @@ class Agent(BaseModel):
     def create_agent_executor(self, tools=None) -> None:
         """Create an agent executor for the agent.
 
-        Returns:
-            An instance of the SquadAgentExecutor class.
+        Executors are compiled once for each set of tools and configuration of the
+        agent, later calls reuse them. The role, goal and backstory are bound when
+        the executor runs, so interpolating new inputs doesn't compile them again.
         """
+        self.agent_executor = self.compile_agent_executor(tools)
+
+    def compile_agent_executor(self, tools=None) -> SquadAgentExecutor:
+        """Executor of the agent for the tools, compiled on first use."""
         tools = tools or self.tools
 
+        key = self._executor_key(tools)
+        agent_executor = self._compiled_executors.get(key)
+        if agent_executor is None:
+            agent_executor = self._build_agent_executor(tools)
+            with self._compiled_executors_lock:
+                self._compiled_executors[key] = agent_executor
+                # Tools built for an execution, like delegation tools, are new
+                # objects each time, so the oldest executors are dropped.
+                while len(self._compiled_executors) > MAX_COMPILED_EXECUTORS:
+                    del self._compiled_executors[next(iter(self._compiled_executors))]
+        return agent_executor
+
+    def _executor_key(self, tools: List[Any]) -> Tuple[Any, ...]:
+        """Everything a compiled executor depends on.
+
+        Objects are identified by their id, the executor keeps them alive. The squad
+        is bound to each call of the executor instead.
+        """
+        return (
+            tuple(id(tool) for tool in tools),
+            id(self.llm),
+            id(self.function_calling_llm),
+            id(self.i18n),
+            id(self.step_callback),
+            id(self.tools_handler),
+            id(self._rpm_controller),
+            id(self.callbacks),
+            self.verbose,
+            self.max_iter,
+            self.max_execution_time,
+            self.system_template,
+            self.prompt_template,
+            self.response_template,
+        )
+
+    def _build_agent_executor(self, tools: List[Any]) -> SquadAgentExecutor:
         agent_args = {
+            "role": lambda x: self.role,
+            "goal": lambda x: self.goal,
+            "backstory": lambda x: self.backstory,
             "input": lambda x: x["input"],
             "tools": lambda x: x["tools"],
             "tool_names": lambda x: x["tool_names"],
@@ -285,12 +469,13 @@ class Agent(BaseModel):
             ),
         }
 
+        parsed_tools = self._parse_tools(tools)
         executor_args = {
             "llm": self.llm,
             "i18n": self.i18n,
             "squad": self.squad,
             "squad_agent": self,
-            "tools": self._parse_tools(tools),
+            "tools": parsed_tools,
             "verbose": self.verbose,
             "original_tools": tools,
             "handle_parsing_errors": True,
@@ -300,12 +485,14 @@ class Agent(BaseModel):
             "tools_handler": self.tools_handler,
             "function_calling_llm": self.function_calling_llm,
             "callbacks": self.callbacks,
+            "call_policy": self.call_policy,
         }
 
         if self._rpm_controller:
             executor_args["request_within_rpm_limit"] = (
                 self._rpm_controller.check_or_wait
             )
+            executor_args["rpm_controller"] = self._rpm_controller
 
         prompt = Prompts(
             i18n=self.i18n,
@@ -315,12 +502,6 @@ class Agent(BaseModel):
             response_template=self.response_template,
         ).task_execution()
 
-        execution_prompt = prompt.partial(
-            goal=self.goal,
-            role=self.role,
-            backstory=self.backstory,
-        )
-
         stop_words = [self.i18n.slice("observation")]
         if self.response_template:
             stop_words.append(
@@ -328,9 +509,12 @@ class Agent(BaseModel):
             )
 
         bind = self.llm.bind(stop=stop_words)
-        inner_agent = agent_args | execution_prompt | bind | SquadAgentParser(agent=self)
-        self.agent_executor = SquadAgentExecutor(
-            agent=RunnableAgent(runnable=inner_agent), **executor_args
+        inner_agent = agent_args | prompt | bind | SquadAgentParser(agent=self)
+        return SquadAgentExecutor(
+            agent=RunnableAgent(runnable=inner_agent),
+            tools_description=render_text_description(parsed_tools),
+            tools_names=self.__tools_names(parsed_tools),
+            **executor_args,
         )
 
     def interpolate_inputs(self, inputs: Dict[str, Any]) -> None:
@@ -347,6 +531,41 @@ class Agent(BaseModel):
             self.goal = self._original_goal.format(**inputs)
             self.backstory = self._original_backstory.format(**inputs)
 
+    def copy(self) -> "Agent":
+        """Create a copy of the agent to run in another squad execution.
+
+        The copy shares the tools, cache handler and RPM controller of the agent,
+        but counts its own token usage. Its executors are compiled on first use.
+        """
+        llm = self.llm
+        if hasattr(llm, "model_name"):
+            llm = llm.copy(
+                update={
+                    "callbacks": [
+                        handler
+                        for handler in llm.callbacks or []
+                        if not isinstance(handler, TokenCalcHandler)
+                    ]
+                }
+            )
+
+        copied_agent = self.model_copy(
+            update={
+                "id": uuid.uuid4(),
+                "llm": llm,
+                "tools": list(self.tools),
+                "agent_executor": None,
+                "squad": None,
+                "formatting_errors": 0,
+            }
+        )
+        copied_agent._token_process = TokenProcess()
+        copied_agent._compiled_executors = {}
+        copied_agent._compiled_executors_lock = threading.Lock()
+        copied_agent._busy_replicas = 0
+        copied_agent._count_llm_tokens()
+        return copied_agent
+
     def increment_formatting_errors(self) -> None:
         """Count the formatting errors of the agent."""
         self.formatting_errors += 1
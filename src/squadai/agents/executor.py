@@ -1,10 +1,15 @@
+import asyncio
+import contextlib
 import threading
 import time
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 
 from langchain.agents import AgentExecutor
 from langchain.agents.agent import ExceptionTool
-from langchain.callbacks.manager import CallbackManagerForChainRun
+from langchain.callbacks.manager import (
+    AsyncCallbackManagerForChainRun,
+    CallbackManagerForChainRun,
+)
 from langchain_core.agents import AgentAction, AgentFinish, AgentStep
 from langchain_core.exceptions import OutputParserException
 from langchain_core.pydantic_v1 import root_validator
@@ -16,6 +21,7 @@ from squadai.agents.tools_handler import ToolsHandler
 from squadai.memory.entity.entity_memory_item import EntityMemoryItem
 from squadai.memory.long_term.long_term_memory_item import LongTermMemoryItem
 from squadai.memory.short_term.short_term_memory_item import ShortTermMemoryItem
+from squadai.squads.events import AgentActionEvent, SquadEvent, ToolObservationEvent
 from squadai.tools.tool_usage import ToolUsage, ToolUsageErrorException
 from squadai.utilities import I18N
 from squadai.utilities.converter import ConverterError
@@ -35,6 +41,9 @@ class SquadAgentExecutor(AgentExecutor):
     squad: Any = None
     function_calling_llm: Any = None
     request_within_rpm_limit: Any = None
+    rpm_controller: Any = None
+    call_policy: Any = None
+    cancellation_token: Any = None
     tools_handler: InstanceOf[ToolsHandler] = None
     max_iterations: Optional[int] = 15
     have_forced_answer: bool = False
@@ -49,6 +58,66 @@ class SquadAgentExecutor(AgentExecutor):
         values["force_answer_max_iterations"] = values["max_iterations"] - 2
         return values
 
+    def _in_flight_limit(self):
+        """Slot of the in-flight limit held for the duration of an LLM call."""
+        if not self.rpm_controller:
+            return contextlib.nullcontext()
+        return self.rpm_controller.limit(self._model_name(), self.cancellation_token)
+
+    def _ain_flight_limit(self):
+        """Async version of `_in_flight_limit`."""
+        if not self.rpm_controller:
+            return contextlib.nullcontext()
+        return self.rpm_controller.alimit(self._model_name(), self.cancellation_token)
+
+    def _plan(
+        self,
+        intermediate_steps: List[Tuple[AgentAction, str]],
+        run_manager: Optional[CallbackManagerForChainRun],
+        inputs: Dict[str, str],
+    ) -> Union[AgentAction, AgentFinish]:
+        """Call the LLM to see what to do, following the call policy. Each attempt
+        and hedge is a request of its own, counted against the rate limits."""
+
+        def plan():
+            if self.request_within_rpm_limit:
+                self.request_within_rpm_limit(self.cancellation_token)
+            with self._in_flight_limit():
+                return self.agent.plan(
+                    intermediate_steps,
+                    callbacks=run_manager.get_child() if run_manager else None,
+                    **inputs,
+                )
+
+        if not self.call_policy:
+            return plan()
+        return self.call_policy.call(plan, self.cancellation_token, kind="plan")
+
+    async def _aplan(
+        self,
+        intermediate_steps: List[Tuple[AgentAction, str]],
+        run_manager: Optional[AsyncCallbackManagerForChainRun],
+        inputs: Dict[str, str],
+    ) -> Union[AgentAction, AgentFinish]:
+        """Async version of `_plan`."""
+
+        async def aplan():
+            if self.rpm_controller:
+                await self.rpm_controller.acheck_or_wait(self.cancellation_token)
+            async with self._ain_flight_limit():
+                return await self.agent.aplan(
+                    intermediate_steps,
+                    callbacks=run_manager.get_child() if run_manager else None,
+                    **inputs,
+                )
+
+        if not self.call_policy:
+            return await aplan()
+        return await self.call_policy.acall(aplan, self.cancellation_token, kind="plan")
+
+    def _model_name(self) -> str:
+        return getattr(self.llm, "model_name", None) or type(self.llm).__name__
+
     def _should_force_answer(self) -> bool:
         return (
             self.iterations == self.force_answer_max_iterations
@@ -119,47 +188,48 @@ class SquadAgentExecutor(AgentExecutor):
 
         # Let's start tracking the number of iterations and time elapsed
         self.iterations = 0
+        self.have_forced_answer = False
         time_elapsed = 0.0
         start_time = time.time()
 
         # We now enter the agent loop (until it returns something).
         while self._should_continue(self.iterations, time_elapsed):
-            if not self.request_within_rpm_limit or self.request_within_rpm_limit():
-                next_step_output = self._take_next_step(
-                    name_to_tool_map,
-                    color_mapping,
-                    inputs,
-                    intermediate_steps,
-                    run_manager=run_manager,
+            self._raise_if_cancelled()
+            next_step_output = self._take_next_step(
+                name_to_tool_map,
+                color_mapping,
+                inputs,
+                intermediate_steps,
+                run_manager=run_manager,
+            )
+
+            if self.step_callback:
+                self.step_callback(next_step_output)
+
+            if isinstance(next_step_output, AgentFinish):
+                # Creating long term memory
+                create_long_term_memory = threading.Thread(
+                    target=self._create_long_term_memory, args=(next_step_output,)
                 )
+                create_long_term_memory.start()
 
-                if self.step_callback:
-                    self.step_callback(next_step_output)
+                return self._return(
+                    next_step_output, intermediate_steps, run_manager=run_manager
+                )
 
-                if isinstance(next_step_output, AgentFinish):
-                    # Creating long term memory
-                    create_long_term_memory = threading.Thread(
-                        target=self._create_long_term_memory, args=(next_step_output,)
-                    )
-                    create_long_term_memory.start()
+            intermediate_steps.extend(next_step_output)
 
+            if len(next_step_output) == 1:
+                next_step_action = next_step_output[0]
+                # See if tool should return directly
+                tool_return = self._get_tool_return(next_step_action)
+                if tool_return is not None:
                     return self._return(
-                        next_step_output, intermediate_steps, run_manager=run_manager
+                        tool_return, intermediate_steps, run_manager=run_manager
                     )
 
-                intermediate_steps.extend(next_step_output)
-
-                if len(next_step_output) == 1:
-                    next_step_action = next_step_output[0]
-                    # See if tool should return directly
-                    tool_return = self._get_tool_return(next_step_action)
-                    if tool_return is not None:
-                        return self._return(
-                            tool_return, intermediate_steps, run_manager=run_manager
-                        )
-
-                self.iterations += 1
-                time_elapsed = time.time() - start_time
+            self.iterations += 1
+            time_elapsed = time.time() - start_time
         output = self.agent.return_stopped_response(
             self.early_stopping_method, intermediate_steps, **inputs
         )
@@ -189,11 +259,7 @@ class SquadAgentExecutor(AgentExecutor):
             intermediate_steps = self._prepare_intermediate_steps(intermediate_steps)
 
             # Call the LLM to see what to do.
-            output = self.agent.plan(
-                intermediate_steps,
-                callbacks=run_manager.get_child() if run_manager else None,
-                **inputs,
-            )
+            output = self._plan(intermediate_steps, run_manager, inputs)
 
         except OutputParserException as e:
             if isinstance(self.handle_parsing_errors, bool):
@@ -273,17 +339,11 @@ class SquadAgentExecutor(AgentExecutor):
         for agent_action in actions:
             if run_manager:
                 run_manager.on_agent_action(agent_action, color="green")
-
-            tool_usage = ToolUsage(
-                tools_handler=self.tools_handler,
-                tools=self.tools,
-                original_tools=self.original_tools,
-                tools_description=self.tools_description,
-                tools_names=self.tools_names,
-                function_calling_llm=self.function_calling_llm,
-                task=self.task,
-                action=agent_action,
+            self._emit(
+                AgentActionEvent(agent=self.squad_agent.role, action=agent_action)
             )
+
+            tool_usage = self._create_tool_usage(agent_action)
             tool_calling = tool_usage.parse(agent_action.log)
 
             if isinstance(tool_calling, ToolUsageErrorException):
@@ -298,8 +358,227 @@ class SquadAgentExecutor(AgentExecutor):
                         tool=tool_calling.tool_name,
                         tools=", ".join([tool.name.casefold() for tool in self.tools]),
                     )
+            self._emit(
+                ToolObservationEvent(
+                    agent=self.squad_agent.role,
+                    tool=agent_action.tool,
+                    tool_input=agent_action.tool_input,
+                    observation=observation,
+                )
+            )
+            yield AgentStep(action=agent_action, observation=observation)
+
+    async def _acall(
+        self,
+        inputs: Dict[str, str],
+        run_manager: Optional[AsyncCallbackManagerForChainRun] = None,
+    ) -> Dict[str, Any]:
+        """Run text through and get agent response without blocking the event loop."""
+        name_to_tool_map = {tool.name: tool for tool in self.tools}
+        color_mapping = get_color_mapping(
+            [tool.name.casefold() for tool in self.tools],
+            excluded_colors=["green", "red"],
+        )
+        intermediate_steps: List[Tuple[AgentAction, str]] = []
+        if self.task.human_input:
+            self.should_ask_for_human_input = True
+
+        self.iterations = 0
+        self.have_forced_answer = False
+        time_elapsed = 0.0
+        start_time = time.time()
+
+        while self._should_continue(self.iterations, time_elapsed):
+            self._raise_if_cancelled()
+            next_step_output = await self._atake_next_step(
+                name_to_tool_map,
+                color_mapping,
+                inputs,
+                intermediate_steps,
+                run_manager=run_manager,
+            )
+
+            if self.step_callback:
+                self.step_callback(next_step_output)
+
+            if isinstance(next_step_output, AgentFinish):
+                create_long_term_memory = threading.Thread(
+                    target=self._create_long_term_memory, args=(next_step_output,)
+                )
+                create_long_term_memory.start()
+
+                return await self._areturn(
+                    next_step_output, intermediate_steps, run_manager=run_manager
+                )
+
+            intermediate_steps.extend(next_step_output)
+
+            if len(next_step_output) == 1:
+                next_step_action = next_step_output[0]
+                tool_return = self._get_tool_return(next_step_action)
+                if tool_return is not None:
+                    return await self._areturn(
+                        tool_return, intermediate_steps, run_manager=run_manager
+                    )
+
+            self.iterations += 1
+            time_elapsed = time.time() - start_time
+        output = self.agent.return_stopped_response(
+            self.early_stopping_method, intermediate_steps, **inputs
+        )
+
+        return await self._areturn(output, intermediate_steps, run_manager=run_manager)
+
+    async def _aiter_next_step(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        inputs: Dict[str, str],
+        intermediate_steps: List[Tuple[AgentAction, str]],
+        run_manager: Optional[AsyncCallbackManagerForChainRun] = None,
+    ) -> AsyncIterator[Union[AgentFinish, AgentAction, AgentStep]]:
+        """Async version of `_iter_next_step`, awaiting the LLM, tools and memory."""
+        try:
+            if self._should_force_answer():
+                error = self._i18n.errors("force_final_answer")
+                output = AgentAction("_Exception", error, error)
+                self.have_forced_answer = True
+                yield AgentStep(action=output, observation=error)
+                return
+
+            intermediate_steps = self._prepare_intermediate_steps(intermediate_steps)
+
+            output = await self._aplan(intermediate_steps, run_manager, inputs)
+
+        except OutputParserException as e:
+            if isinstance(self.handle_parsing_errors, bool):
+                raise_error = not self.handle_parsing_errors
+            else:
+                raise_error = False
+            if raise_error:
+                raise ValueError(
+                    "An output parsing error occurred. "
+                    "In order to pass this error back to the agent and have it try "
+                    "again, pass `handle_parsing_errors=True` to the AgentExecutor. "
+                    f"This is the error: {str(e)}"
+                )
+            if isinstance(self.handle_parsing_errors, bool):
+                if e.send_to_llm:
+                    observation = f"\n{str(e.observation)}"
+                else:
+                    observation = ""
+            elif isinstance(self.handle_parsing_errors, str):
+                observation = f"\n{self.handle_parsing_errors}"
+            elif callable(self.handle_parsing_errors):
+                observation = f"\n{self.handle_parsing_errors(e)}"
+            else:
+                raise ValueError("Got unexpected type of `handle_parsing_errors`")
+            output = AgentAction("_Exception", observation, "")
+
+            if run_manager:
+                await run_manager.on_agent_action(output, color="green")
+
+            tool_run_kwargs = self.agent.tool_run_logging_kwargs()
+            observation = await ExceptionTool().arun(
+                output.tool_input,
+                verbose=False,
+                color=None,
+                callbacks=run_manager.get_child() if run_manager else None,
+                **tool_run_kwargs,
+            )
+
+            if self._should_force_answer():
+                error = self._i18n.errors("force_final_answer")
+                output = AgentAction("_Exception", error, error)
+                yield AgentStep(action=output, observation=error)
+                return
+
+            yield AgentStep(action=output, observation=observation)
+            return
+
+        if isinstance(output, AgentFinish):
+            if self.should_ask_for_human_input:
+                self.should_ask_for_human_input = False
+                human_feedback = await asyncio.to_thread(
+                    self._ask_human_input, output.return_values["output"]
+                )
+                action = AgentAction(
+                    tool="Human Input", tool_input=human_feedback, log=output.log
+                )
+                yield AgentStep(
+                    action=action,
+                    observation=self._i18n.slice("human_feedback").format(
+                        human_feedback=human_feedback
+                    ),
+                )
+                return
+
+            else:
+                yield output
+                return
+
+        await asyncio.to_thread(self._create_short_term_memory, output)
+
+        actions: List[AgentAction]
+        actions = [output] if isinstance(output, AgentAction) else output
+        for agent_action in actions:
+            yield agent_action
+
+        for agent_action in actions:
+            if run_manager:
+                await run_manager.on_agent_action(agent_action, color="green")
+            self._emit(
+                AgentActionEvent(agent=self.squad_agent.role, action=agent_action)
+            )
+
+            tool_usage = self._create_tool_usage(agent_action)
+            tool_calling = await asyncio.to_thread(tool_usage.parse, agent_action.log)
+
+            if isinstance(tool_calling, ToolUsageErrorException):
+                observation = tool_calling.message
+            else:
+                if tool_calling.tool_name.casefold().strip() in [
+                    name.casefold().strip() for name in name_to_tool_map
+                ]:
+                    observation = await tool_usage.ause(tool_calling, agent_action.log)
+                else:
+                    observation = self._i18n.errors("wrong_tool_name").format(
+                        tool=tool_calling.tool_name,
+                        tools=", ".join([tool.name.casefold() for tool in self.tools]),
+                    )
+            self._emit(
+                ToolObservationEvent(
+                    agent=self.squad_agent.role,
+                    tool=agent_action.tool,
+                    tool_input=agent_action.tool_input,
+                    observation=observation,
+                )
+            )
             yield AgentStep(action=agent_action, observation=observation)
 
+    def _raise_if_cancelled(self) -> None:
+        if self.cancellation_token:
+            self.cancellation_token.raise_if_cancelled()
+
+    def _emit(self, event: SquadEvent) -> None:
+        if self.squad:
+            self.squad._emit(event)
+
+    def _create_tool_usage(self, agent_action: AgentAction) -> ToolUsage:
+        return ToolUsage(
+            tools_handler=self.tools_handler,
+            tools=self.tools,
+            original_tools=self.original_tools,
+            tools_description=self.tools_description,
+            tools_names=self.tools_names,
+            function_calling_llm=self.function_calling_llm,
+            task=self.task,
+            action=agent_action,
+            cancellation_token=self.cancellation_token,
+            rpm_controller=self.rpm_controller,
+            call_policy=self.call_policy,
+        )
+
     def _ask_human_input(self, final_answer: dict) -> str:
         """Get human input."""
         return input(
@@ -0,0 +1,94 @@
+import asyncio
+import math
+import threading
+from typing import Any, List, Optional, Set, Tuple
+
+from squadai.utilities import CancellationToken
+
+_replicas_released = threading.Condition()
+_async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+
+
+def acquire_replica(
+    agents: List[Any], cancellation_token: Optional[CancellationToken] = None
+) -> Any:
+    """Take a free replica of the agents sharing a role, waiting for one otherwise.
+
+    The agent with the most free replicas is picked, spreading the work across
+    agents declared with the same role. Agents without `replicas` set take any
+    number of delegations at the same time.
+    """
+    with _replicas_released:
+        while True:
+            if cancellation_token:
+                cancellation_token.raise_if_cancelled()
+
+            agent = _take_replica(agents)
+            if agent is not None:
+                return agent
+
+            _replicas_released.wait(0.1 if cancellation_token else None)
+
+
+async def aacquire_replica(
+    agents: List[Any], cancellation_token: Optional[CancellationToken] = None
+) -> Any:
+    """Async version of `acquire_replica`, waiting without blocking the event loop.
+
+    The replica is taken without awaiting, so a cancelled wait never holds one.
+    """
+    while True:
+        if cancellation_token:
+            cancellation_token.raise_if_cancelled()
+        with _replicas_released:
+            agent = _take_replica(agents)
+            if agent is not None:
+                return agent
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            _async_waiters.add(waiter)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter[1]), timeout=0.1 if cancellation_token else None
+            )
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with _replicas_released:
+                _async_waiters.discard(waiter)
+
+
+def release_replica(agent: Any) -> None:
+    """Give a replica taken with `acquire_replica` back."""
+    with _replicas_released:
+        agent._busy_replicas -= 1
+        _replicas_released.notify_all()
+        for loop, future in _async_waiters:
+            try:
+                loop.call_soon_threadsafe(_set_result, future)
+            except RuntimeError:
+                pass
+
+
+def _take_replica(agents: List[Any]) -> Optional[Any]:
+    """Take a replica of the agent with the most free ones, if any is free. Must
+    be called holding `_replicas_released`."""
+    agent = max(
+        agents, key=lambda agent: (_free_replicas(agent), -agent._busy_replicas)
+    )
+    if _free_replicas(agent) <= 0:
+        return None
+    agent._busy_replicas += 1
+    return agent
+
+
+def _free_replicas(agent: Any) -> float:
+    if agent.replicas is None:
+        return math.inf
+    return agent.replicas - agent._busy_replicas
+
+
+def _set_result(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
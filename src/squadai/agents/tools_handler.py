@@ -11,9 +11,20 @@ class ToolsHandler:
     last_used_tool: ToolCalling = {}
     cache: CacheHandler
 
-    def __init__(self, cache: Optional[CacheHandler] = None):
-        """Initialize the callback handler."""
+    def __init__(
+        self,
+        cache: Optional[CacheHandler] = None,
+        parent: Optional["ToolsHandler"] = None,
+    ):
+        """Initialize the callback handler.
+
+        Args:
+            cache: Cache to store the tool results in.
+            parent: Handler of the agent, also recording the last tool used when
+                this one handles a single execution.
+        """
         self.cache = cache
+        self.parent = parent
         self.last_used_tool = {}
 
     def on_tool_use(
@@ -24,6 +35,8 @@ class ToolsHandler:
     ) -> Any:
         """Run when tool ends running."""
         self.last_used_tool = calling
+        if self.parent:
+            self.parent.last_used_tool = calling
         if self.cache and should_cache and calling.tool_name != CacheTools().name:
             self.cache.add(
                 tool=calling.tool_name,
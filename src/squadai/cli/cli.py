@@ -1,6 +1,8 @@
 import click
 
 from .create_squad import create_squad
+from .run_squad import run_squad
+from .serve_squad import serve_squad
 
 
 @click.group()
@@ -15,5 +17,73 @@ def create(project_name):
     create_squad(project_name)
 
 
+@squadai.command()
+@click.argument("squad", required=False)
+@click.option("--host", default="127.0.0.1", help="Host to listen on.")
+@click.option("--port", default=8000, type=int, help="Port to listen on.")
+@click.option(
+    "--workers",
+    default=2,
+    type=click.IntRange(min=1),
+    help="Number of worker processes kicking off the squad.",
+)
+@click.option(
+    "--max-queue-size",
+    default=16,
+    type=click.IntRange(min=0),
+    help="Number of kickoffs waiting for a worker, beyond which new ones are rejected.",
+)
+def serve(squad, host, port, workers, max_queue_size):
+    """Serve a squad over a local HTTP API.
+
+    SQUAD is the squad to serve as module:attribute, defaulting to the squad of
+    the project in the current directory.
+    """
+    serve_squad(squad, host, port, workers, max_queue_size)
+
+
+@squadai.command()
+@click.argument("squad", required=False)
+@click.option(
+    "--inputs",
+    "inputs_path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSONL file with the inputs of a kickoff per line.",
+)
+@click.option(
+    "--output",
+    "output_path",
+    type=click.Path(dir_okay=False),
+    help="JSONL file the results are appended to, defaults to INPUTS.results.jsonl.",
+)
+@click.option(
+    "--workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of worker processes kicking off the squad.",
+)
+@click.option(
+    "--max-rpm",
+    type=click.IntRange(min=1),
+    help="Maximum number of requests per minute of all the workers together.",
+)
+def run(squad, inputs_path, output_path, workers, max_rpm):
+    """Kick off a squad for each line of a JSONL file of inputs.
+
+    SQUAD is the squad to kick off as module:attribute, defaulting to the squad
+    of the project in the current directory. Inputs that already have a result
+    in the output file are skipped, so an interrupted run can be resumed.
+    """
+    ran, skipped, failed = run_squad(squad, inputs_path, output_path, workers, max_rpm)
+    click.secho(
+        f"Kicked off the squad for {ran} inputs, {failed} failed, {skipped} skipped as already done.",
+        fg="red" if failed else "green",
+        bold=True,
+    )
+    if failed:
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
     squadai()
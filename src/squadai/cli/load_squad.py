@@ -0,0 +1,62 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+def load_squad(target: Optional[str] = None):
+    """Load the squad of a project.
+
+    Args:
+        target: `module:attribute` pointing at a squad, at a function returning one,
+            or at a class decorated with `SquadBase`. Defaults to the `SquadBase`
+            class of the project created with `squadai create` in the current
+            directory.
+    """
+    from squadai.squad import Squad
+
+    if target is None:
+        target = _project_target()
+
+    module_name, _, attribute = target.partition(":")
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    module = importlib.import_module(module_name)
+
+    if attribute:
+        squad = getattr(module, attribute)
+    else:
+        squad = next(
+            (
+                value
+                for value in vars(module).values()
+                if getattr(value, "is_squad_class", False)
+            ),
+            None,
+        )
+        if squad is None:
+            raise Exception(f"No class decorated with SquadBase in {module_name}.")
+
+    if getattr(squad, "is_squad_class", False):
+        squad = squad().squad()
+    elif callable(squad) and not isinstance(squad, Squad):
+        squad = squad()
+
+    if not isinstance(squad, Squad):
+        raise Exception(f"{target} is not a squad.")
+    return squad
+
+
+def _project_target() -> str:
+    """Module of the squad of the project in the current directory."""
+    src = Path.cwd() / "src"
+    squad_modules = sorted(src.glob("*/squad.py")) if src.is_dir() else []
+    if not squad_modules:
+        raise Exception(
+            "No squad found, run it from the root directory of a project created with `squadai create` or pass the squad as module:attribute."
+        )
+
+    if str(src) not in sys.path:
+        sys.path.insert(0, str(src))
+    return f"{squad_modules[0].parent.name}.squad"
@@ -0,0 +1,198 @@
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+import click
+
+from .load_squad import load_squad
+
+
+def run_squad(
+    target: Optional[str],
+    inputs_path: str,
+    output_path: Optional[str] = None,
+    workers: int = 1,
+    max_rpm: Optional[int] = None,
+) -> Tuple[int, int, int]:
+    """Kick off a squad for each line of a JSONL file of inputs.
+
+    The inputs are worked on by worker processes, each loading and preparing the
+    squad once. One JSON line is appended to the output file per input, with its
+    result or error, usage metrics and timings. Inputs that already have a
+    result in the output file are skipped, so an interrupted run picks up where
+    it stopped.
+
+    Args:
+        target: Squad to kick off, see `load_squad`.
+        inputs_path: JSONL file with a dictionary of inputs per line.
+        output_path: JSONL file the results are appended to, defaults to the
+            inputs file with a `.results.jsonl` suffix.
+        workers: Number of worker processes.
+        max_rpm: Maximum number of requests per minute of all the workers.
+
+    Returns:
+        Number of inputs kicked off, skipped and failed.
+    """
+    output_path = output_path or str(Path(inputs_path).with_suffix(".results.jsonl"))
+    completed = _completed_inputs(output_path)
+
+    context = multiprocessing.get_context("spawn")
+    jobs = context.Queue(maxsize=workers * 2)
+    results = context.Queue()
+    rpm_budget = f"squadai-run-{uuid.uuid4().hex}"
+    processes = [
+        context.Process(
+            target=_work,
+            args=(target, jobs, results, max_rpm, rpm_budget),
+            daemon=True,
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    skipped = 0
+    pending = [0]
+    fed = threading.Event()
+    feed_errors = []
+
+    def feed() -> None:
+        nonlocal skipped
+        try:
+            for index, inputs in _read_inputs(inputs_path):
+                if index in completed:
+                    skipped += 1
+                    continue
+                pending[0] += 1
+                jobs.put((index, inputs))
+            for _ in processes:
+                jobs.put(None)
+        except BaseException as e:
+            feed_errors.append(e)
+        finally:
+            fed.set()
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    ran = failed = written = 0
+    try:
+        with open(output_path, "a+") as output:
+            _end_last_line(output)
+            while not fed.is_set() or written < pending[0]:
+                if feed_errors:
+                    raise feed_errors[0]
+                try:
+                    result = results.get(timeout=1)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        raise Exception("The workers exited before the end of the run.")
+                    continue
+
+                if "load_error" in result:
+                    raise Exception(result["load_error"])
+
+                output.write(json.dumps(result, default=str) + "\n")
+                output.flush()
+                written += 1
+                ran += 1
+                if "error" in result:
+                    failed += 1
+                    click.secho(
+                        f"Input {result['index']} failed: {result['error']}", fg="red"
+                    )
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    return ran, skipped, failed
+
+
+def _read_inputs(inputs_path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yields the position and inputs of each non-empty line of the inputs file."""
+    with open(inputs_path, "r") as file:
+        lines = (line for line in file if line.strip())
+        for index, line in enumerate(lines):
+            yield index, json.loads(line)
+
+
+def _completed_inputs(output_path: str) -> Set[int]:
+    """Positions of the inputs with a result in the output file."""
+    if not os.path.exists(output_path):
+        return set()
+
+    completed = set()
+    with open(output_path, "r") as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if "result" in result:
+                completed.add(result["index"])
+    return completed
+
+
+def _end_last_line(output) -> None:
+    """Finish the last line of the output file, cut when a run was interrupted."""
+    output.seek(0, os.SEEK_END)
+    if output.tell() == 0:
+        return
+    output.seek(output.tell() - 1)
+    if output.read(1) != "\n":
+        output.write("\n")
+
+
+def _work(target, jobs, results, max_rpm, rpm_budget) -> None:
+    """Worker process: loads and prepares the squad, then kicks it off for each
+    inputs."""
+    try:
+        squad = load_squad(target)
+        if max_rpm:
+            _share_rpm_budget(squad, max_rpm, rpm_budget)
+        squad.prepare()
+    except BaseException as e:
+        results.put({"load_error": str(e)})
+        return
+
+    while (job := jobs.get()) is not None:
+        index, inputs = job
+        started_at = time.time()
+        result: Dict[str, Any] = {"index": index, "inputs": inputs}
+        try:
+            output = squad.kickoff(inputs)
+            result["result"] = (
+                output.model_dump() if hasattr(output, "model_dump") else output
+            )
+            result["usage_metrics"] = squad.usage_metrics
+        except Exception as e:
+            result["error"] = str(e)
+        result["timings"] = {
+            "started_at": started_at,
+            "duration": time.time() - started_at,
+        }
+        results.put(result)
+
+
+def _share_rpm_budget(squad, max_rpm: int, budget: str) -> None:
+    """Count the requests of the agents of the squad against the budget shared
+    by the workers of the run, on top of the limits they already have."""
+    from squadai.utilities import SharedRPMController
+
+    controllers: Dict[int, SharedRPMController] = {}
+    for agent in squad.agents:
+        controller = agent._rpm_controller
+        if id(controller) not in controllers:
+            controllers[id(controller)] = SharedRPMController(
+                max_rpm=max_rpm,
+                logger=squad._logger,
+                budget=budget,
+                agent_rpm_controller=controller,
+            )
+        agent._rpm_controller = controllers[id(controller)]
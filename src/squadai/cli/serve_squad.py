@@ -0,0 +1,396 @@
+import http.server
+import json
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import click
+
+from .load_squad import load_squad
+
+TERMINAL_EVENTS = ("result", "error")
+
+
+class SquadServer:
+    """Pool of warm worker processes working on a bounded queue of kickoffs.
+
+    Each worker loads the squad once and then kicks it off for one job at a time,
+    so a kickoff doesn't pay for importing and building the squad. Jobs beyond
+    the ones the workers are running and `max_queue_size` waiting ones are
+    rejected rather than queued.
+    """
+
+    def __init__(
+        self,
+        target: Optional[str] = None,
+        workers: int = 2,
+        max_queue_size: int = 16,
+    ):
+        self.target = target
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs = self._context.Queue()
+        self._events = self._context.Queue()
+        self._cancellations = [self._context.Queue() for _ in range(workers)]
+        self._processes: List[Any] = [None] * workers
+        self._streams: Dict[str, queue.Queue] = {}
+        self._running: Dict[str, int] = {}
+        self._abandoned: Set[str] = set()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def start(self) -> None:
+        """Start the workers, returning once all of them have loaded the squad."""
+        for index in range(self.workers):
+            self._processes[index] = self._spawn(index)
+
+        ready = 0
+        while ready < self.workers:
+            try:
+                _, _, kind, line = self._events.get(timeout=1)
+            except queue.Empty:
+                if all(process.is_alive() for process in self._processes):
+                    continue
+                self.close()
+                raise Exception("A worker exited while loading the squad.")
+            if kind == "error":
+                self.close()
+                raise Exception(json.loads(line)["error"])
+            ready += 1
+
+        threading.Thread(target=self._dispatch, daemon=True).start()
+
+    def close(self) -> None:
+        """Stop the workers, cancelling the jobs they are running."""
+        self._closed.set()
+        with self._lock:
+            for job_id, index in self._running.items():
+                self._cancellations[index].put(job_id)
+        for index, process in enumerate(self._processes):
+            if process is None:
+                continue
+            self._jobs.put(None)
+            self._cancellations[index].put(None)
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    def submit(self, inputs: Dict[str, Any]) -> Optional[Tuple[str, queue.Queue]]:
+        """Queue a kickoff, unless the queue is full.
+
+        Returns:
+            Identifier of the job and queue of its events, or None when the job
+            was rejected.
+        """
+        with self._lock:
+            if len(self._streams) >= self.workers + self.max_queue_size:
+                return None
+            job_id = uuid.uuid4().hex
+            stream: queue.Queue = queue.Queue()
+            self._streams[job_id] = stream
+
+        self._jobs.put((job_id, inputs))
+        return job_id, stream
+
+    def results(self, job_id: str, stream: queue.Queue) -> Iterator[Tuple[str, str]]:
+        """Yields the type and JSON line of the events of a job, until its result
+        or error. Once the caller stops reading, the job is cancelled."""
+        try:
+            while True:
+                kind, line = stream.get()
+                yield kind, line
+                if kind in TERMINAL_EVENTS:
+                    return
+        except GeneratorExit:
+            self.cancel(job_id)
+            raise
+
+    def cancel(self, job_id: str) -> None:
+        """Cancel a job, as soon as it starts when it is still queued."""
+        with self._lock:
+            if job_id not in self._streams:
+                return
+            if job_id in self._running:
+                self._cancellations[self._running[job_id]].put(job_id)
+            else:
+                self._abandoned.add(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of workers and of running and queued jobs."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": len(self._running),
+                "queued": len(self._streams) - len(self._running),
+                "max_queue_size": self.max_queue_size,
+            }
+
+    def _spawn(self, index: int):
+        process = self._context.Process(
+            target=_work,
+            args=(
+                self.target,
+                index,
+                self._jobs,
+                self._events,
+                self._cancellations[index],
+            ),
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def _dispatch(self) -> None:
+        """Route the events of the workers to the streams of their jobs."""
+        checked_at = time.monotonic()
+        while not self._closed.is_set():
+            if time.monotonic() - checked_at > 1:
+                self._replace_exited_workers()
+                checked_at = time.monotonic()
+            try:
+                index, job_id, kind, line = self._events.get(timeout=1)
+            except queue.Empty:
+                continue
+            if job_id is None:
+                continue
+
+            with self._lock:
+                if kind == "started":
+                    self._running[job_id] = index
+                    if job_id in self._abandoned:
+                        self._cancellations[index].put(job_id)
+                stream = self._streams.get(job_id)
+                if kind in TERMINAL_EVENTS:
+                    self._streams.pop(job_id, None)
+                    self._running.pop(job_id, None)
+                    self._abandoned.discard(job_id)
+            if stream is not None:
+                stream.put((kind, line))
+
+    def _replace_exited_workers(self) -> None:
+        """Fail the jobs of the workers that exited, and start new workers."""
+        for index, process in enumerate(self._processes):
+            if process.is_alive() or self._closed.is_set():
+                continue
+
+            with self._lock:
+                job_ids = [job_id for job_id, i in self._running.items() if i == index]
+                streams = []
+                for job_id in job_ids:
+                    streams.append(self._streams.pop(job_id, None))
+                    self._running.pop(job_id, None)
+                    self._abandoned.discard(job_id)
+            for stream in streams:
+                if stream is not None:
+                    stream.put(
+                        (
+                            "error",
+                            json.dumps(
+                                {
+                                    "type": "error",
+                                    "error": "The worker running the kickoff exited.",
+                                }
+                            ),
+                        )
+                    )
+            self._processes[index] = self._spawn(index)
+
+
+class SquadHTTPServer(http.server.ThreadingHTTPServer):
+    """Local HTTP API submitting kickoffs to a `SquadServer`.
+
+    `POST /kickoff` takes `{"inputs": {...}, "stream": false}` and answers with
+    the result of the squad, or with its events as JSON lines when streaming.
+    It answers 503 when the queue is full. `GET /health` gives the number of
+    running and queued jobs.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], squad_server: SquadServer):
+        super().__init__(address, _SquadRequestHandler)
+        self.squad_server = squad_server
+
+
+class _SquadRequestHandler(http.server.BaseHTTPRequestHandler):
+    server: SquadHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            return self._send(404, json.dumps({"error": "Not found."}))
+        self._send(200, json.dumps(self.server.squad_server.stats()))
+
+    def do_POST(self) -> None:
+        if self.path != "/kickoff":
+            return self._send(404, json.dumps({"error": "Not found."}))
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            inputs = body.get("inputs", {})
+            if not isinstance(inputs, dict):
+                raise ValueError
+        except (ValueError, AttributeError):
+            return self._send(
+                400,
+                json.dumps(
+                    {"error": "The body must be a JSON object with an inputs object."}
+                ),
+            )
+
+        job = self.server.squad_server.submit(inputs)
+        if job is None:
+            return self._send(
+                503,
+                json.dumps({"error": "Too many kickoffs queued, retry later."}),
+                {"Retry-After": "1"},
+            )
+
+        events = self.server.squad_server.results(*job)
+        if body.get("stream", False):
+            return self._stream(events)
+
+        for kind, line in events:
+            if kind in TERMINAL_EVENTS:
+                self._send(200 if kind == "result" else 500, line)
+
+    def _stream(self, events: Iterator[Tuple[str, str]]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for _, line in events:
+                data = f"{line}\n".encode()
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            events.close()
+
+    def _send(
+        self, status: int, body: str, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve_squad(target, host, port, workers, max_queue_size):
+    """Serve a squad over a local HTTP API."""
+    squad_server = SquadServer(target, workers, max_queue_size)
+    click.secho(f"Loading the squad in {workers} workers...", fg="green")
+    squad_server.start()
+
+    http_server = SquadHTTPServer((host, port), squad_server)
+    click.secho(
+        f"Serving the squad on http://{host}:{http_server.server_port}",
+        fg="green",
+        bold=True,
+    )
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+        squad_server.close()
+
+
+def _work(target, index, jobs, events, cancellations) -> None:
+    """Worker process: loads the squad, then kicks it off for each job."""
+    from squadai.utilities import CancellationToken
+
+    def send(job_id, payload):
+        events.put((index, job_id, payload["type"], json.dumps(payload, default=str)))
+
+    try:
+        squad = load_squad(target).prepare()
+    except BaseException as e:
+        return send(None, {"type": "error", "error": str(e)})
+    send(None, {"type": "ready"})
+
+    current: List[Any] = [None]
+
+    def listen() -> None:
+        while (job_id := cancellations.get()) is not None:
+            job = current[0]
+            if job is not None and job[0] == job_id:
+                job[1].cancel()
+
+    threading.Thread(target=listen, daemon=True).start()
+
+    while (job := jobs.get()) is not None:
+        job_id, inputs = job
+        token = CancellationToken()
+        current[0] = (job_id, token)
+        send(job_id, {"type": "started"})
+        try:
+            for event in squad.kickoff_stream(inputs, cancellation_token=token):
+                send(job_id, _event_payload(event))
+        except BaseException as e:
+            send(job_id, {"type": "error", "error": str(e)})
+        finally:
+            current[0] = None
+
+
+def _event_payload(event) -> Dict[str, Any]:
+    """JSON payload of a squad event."""
+    from pydantic import BaseModel
+
+    from squadai.squads.events import (
+        AgentActionEvent,
+        FinalResultEvent,
+        TaskOutputEvent,
+        TaskStartedEvent,
+        TokenChunkEvent,
+        ToolObservationEvent,
+    )
+
+    if isinstance(event, TaskStartedEvent):
+        return {"type": "task_started", "task": event.task, "agent": event.agent}
+    if isinstance(event, TokenChunkEvent):
+        return {"type": "token", "agent": event.agent, "text": event.text}
+    if isinstance(event, AgentActionEvent):
+        return {
+            "type": "agent_action",
+            "agent": event.agent,
+            "tool": event.action.tool,
+            "tool_input": event.action.tool_input,
+        }
+    if isinstance(event, ToolObservationEvent):
+        return {
+            "type": "tool_observation",
+            "agent": event.agent,
+            "tool": event.tool,
+            "observation": event.observation,
+        }
+    if isinstance(event, TaskOutputEvent):
+        return {
+            "type": "task_output",
+            "task": event.output.description,
+            "output": event.output.raw_output,
+        }
+    if isinstance(event, FinalResultEvent):
+        result = event.result
+        return {
+            "type": "result",
+            "result": (
+                result.model_dump() if isinstance(result, BaseModel) else result
+            ),
+            "usage_metrics": event.usage_metrics,
+        }
+    return {"type": type(event).__name__}
@@ -1,4 +1,5 @@
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
 
 from squadai.memory.long_term.long_term_memory_item import LongTermMemoryItem
 from squadai.memory.memory import Memory
@@ -30,3 +31,22 @@ class LongTermMemory(Memory):
 
     def search(self, task: str, latest_n: int = 3) -> Dict[str, Any]:
         return self.storage.load(task, latest_n)
+
+    def save_execution(
+        self, task: str, agent: str, duration: float, token_usage: Dict[str, int]
+    ) -> None:
+        """Records the wall time and token usage of an execution of the task."""
+        self.storage.save_execution(
+            task_description=task,
+            agent=agent,
+            duration=duration,
+            token_usage=token_usage,
+            datetime=str(time.time()),
+        )
+
+    def expected_duration(self, task: str, latest_n: int = 5) -> Optional[float]:
+        """Average wall time of the latest executions of the task, if it ran before."""
+        executions = self.storage.load_executions(task, latest_n)
+        if not executions:
+            return None
+        return sum(execution["duration"] for execution in executions) / len(executions)
@@ -1,6 +1,6 @@
 import json
 import sqlite3
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Union
 
 from squadai.utilities import Printer
 from squadai.utilities.paths import db_storage_path
@@ -18,7 +18,7 @@ class LTMSQLiteStorage:
 
     def _initialize_db(self):
         """
-        Initializes the SQLite database and creates LTM table
+        Initializes the SQLite database and creates LTM and task executions tables
         """
         try:
             with sqlite3.connect(self.db_path) as conn:
@@ -34,6 +34,20 @@ class LTMSQLiteStorage:
                     )
                 """
                 )
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS task_executions (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        task_description TEXT,
+                        agent TEXT,
+                        duration REAL,
+                        total_tokens INTEGER,
+                        prompt_tokens INTEGER,
+                        completion_tokens INTEGER,
+                        datetime TEXT
+                    )
+                """
+                )
 
                 conn.commit()
         except sqlite3.Error as e:
@@ -99,3 +113,73 @@ class LTMSQLiteStorage:
                 color="red",
             )
         return None
+
+    def save_execution(
+        self,
+        task_description: str,
+        agent: str,
+        duration: float,
+        token_usage: Dict[str, int],
+        datetime: str,
+    ) -> None:
+        """Saves the wall time and token usage of a task execution with error handling."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                INSERT INTO task_executions (task_description, agent, duration, total_tokens, prompt_tokens, completion_tokens, datetime)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                    (
+                        task_description,
+                        agent,
+                        duration,
+                        token_usage.get("total_tokens", 0),
+                        token_usage.get("prompt_tokens", 0),
+                        token_usage.get("completion_tokens", 0),
+                        datetime,
+                    ),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"MEMORY ERROR: An error occurred while saving a task execution: {e}",
+                color="red",
+            )
+
+    def load_executions(
+        self, task_description: str, latest_n: int
+    ) -> List[Dict[str, Any]]:
+        """Queries the latest executions of a task by its description with error handling."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"""
+                    SELECT agent, duration, total_tokens, prompt_tokens, completion_tokens, datetime
+                    FROM task_executions
+                    WHERE task_description = ?
+                    ORDER BY id DESC
+                    LIMIT {latest_n}
+                """,
+                    (task_description,),
+                )
+                return [
+                    {
+                        "agent": row[0],
+                        "duration": row[1],
+                        "total_tokens": row[2],
+                        "prompt_tokens": row[3],
+                        "completion_tokens": row[4],
+                        "datetime": row[5],
+                    }
+                    for row in cursor.fetchall()
+                ]
+
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"MEMORY ERROR: An error occurred while querying task executions: {e}",
+                color="red",
+            )
+        return []
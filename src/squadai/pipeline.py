@@ -0,0 +1,211 @@
+import queue
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, field_validator
+
+from squadai.squad import Squad
+from squadai.utilities import CancellationToken
+
+_DONE = object()
+
+
+class PipelineStage(BaseModel):
+    """Squad working on the items of a pipeline, with its own limits.
+
+    Attributes:
+        squad: Squad kicked off for each item.
+        max_concurrency: Number of items the stage works on at the same time.
+        max_queue_size: Number of items waiting for the stage, beyond which the previous stage waits too.
+        output_key: Input under which the output of the stage is handed over to the next one.
+    """
+
+    squad: Squad = Field(description="Squad kicked off for each item.")
+    max_concurrency: int = Field(
+        default=1,
+        gt=0,
+        description="Number of items the stage works on at the same time.",
+    )
+    max_queue_size: int = Field(
+        default=1,
+        gt=0,
+        description="Number of items waiting for the stage, beyond which the previous stage waits too.",
+    )
+    output_key: str = Field(
+        default="output",
+        description="Input under which the output of the stage is handed over to the next one.",
+    )
+
+
+class Pipeline(BaseModel):
+    """Chain of squads working on a stream of inputs.
+
+    Each item goes through the stages in order, the inputs of a stage being the
+    inputs of the previous one plus its output under its `output_key`. The stages
+    work on different items at the same time, with bounded queues between them,
+    so the pipeline goes as fast as its slowest stage while a stage falling behind
+    holds back the ones before it.
+
+    Attributes:
+        stages: Stages of the pipeline, squads being stages with the default limits.
+        usage_metrics: Token usage of all the executions of the last run.
+    """
+
+    stages: List[PipelineStage] = Field(
+        min_length=1,
+        description="Stages of the pipeline, squads being stages with the default limits.",
+    )
+    usage_metrics: Optional[dict] = Field(
+        default=None,
+        description="Token usage of all the executions of the last run.",
+    )
+
+    @field_validator("stages", mode="before")
+    @classmethod
+    def _wrap_squads(cls, stages: Any) -> Any:
+        """Turn the squads given as stages into stages with the default limits."""
+        if not isinstance(stages, list):
+            return stages
+        return [
+            PipelineStage(squad=stage) if isinstance(stage, Squad) else stage
+            for stage in stages
+        ]
+
+    def run(
+        self,
+        inputs_list: List[Dict[str, Any]],
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> List[Any]:
+        """Runs every set of inputs through the pipeline.
+
+        Returns:
+            Outputs of the last stage, in the order of the inputs.
+        """
+        results: List[Any] = [None] * len(inputs_list)
+        for index, result in self.stream(inputs_list, cancellation_token):
+            results[index] = result
+        return results
+
+    def stream(
+        self,
+        inputs: Iterable[Dict[str, Any]],
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> Iterator[Tuple[int, Any]]:
+        """Runs a stream of inputs through the pipeline, yielding the outputs of the
+        last stage as soon as they are ready.
+
+        Inputs are only read once the first stage has room for them. Errors are
+        raised when reached, cancelling the rest of the run, and so does the caller
+        stopping reading.
+
+        Yields:
+            Position of the inputs in the stream and output of the last stage.
+        """
+        token = (
+            cancellation_token.child() if cancellation_token else CancellationToken()
+        )
+        queues = [queue.Queue(maxsize=stage.max_queue_size) for stage in self.stages]
+        results: queue.Queue = queue.Queue()
+        squads = [
+            [stage.squad.copy() for _ in range(stage.max_concurrency)]
+            for stage in self.stages
+        ]
+        running = [stage.max_concurrency for stage in self.stages]
+        usage_metrics: List[Optional[dict]] = []
+        lock = threading.Lock()
+
+        def feed() -> None:
+            try:
+                for index, item_inputs in enumerate(inputs):
+                    self._put(queues[0], (index, item_inputs), token)
+                self._finish_stage(queues[0], self.stages[0], token)
+            except BaseException as e:
+                results.put(e)
+
+        def work(stage_index: int, squad: Squad) -> None:
+            stage = self.stages[stage_index]
+            last_stage = stage_index == len(self.stages) - 1
+            try:
+                while (item := self._get(queues[stage_index], token)) is not _DONE:
+                    index, item_inputs = item
+                    output = squad.kickoff(item_inputs, cancellation_token=token)
+                    with lock:
+                        usage_metrics.append(squad.usage_metrics)
+                    if last_stage:
+                        results.put((index, output))
+                    else:
+                        self._put(
+                            queues[stage_index + 1],
+                            (index, {**item_inputs, stage.output_key: output}),
+                            token,
+                        )
+            except BaseException as e:
+                results.put(e)
+                return
+
+            with lock:
+                running[stage_index] -= 1
+                finished = running[stage_index] == 0
+            if not finished:
+                return
+            if last_stage:
+                results.put(_DONE)
+            else:
+                try:
+                    self._finish_stage(
+                        queues[stage_index + 1], self.stages[stage_index + 1], token
+                    )
+                except BaseException as e:
+                    results.put(e)
+
+        threading.Thread(target=feed, daemon=True).start()
+        for stage_index, stage_squads in enumerate(squads):
+            for squad in stage_squads:
+                threading.Thread(
+                    target=work, args=(stage_index, squad), daemon=True
+                ).start()
+
+        try:
+            while (result := results.get()) is not _DONE:
+                if isinstance(result, BaseException):
+                    raise result
+                yield result
+        finally:
+            token.cancel()
+            self._aggregate_usage_metrics(usage_metrics)
+
+    def _finish_stage(
+        self, stage_queue: queue.Queue, stage: PipelineStage, token: CancellationToken
+    ) -> None:
+        """Tells every worker of the stage there are no items left."""
+        for _ in range(stage.max_concurrency):
+            self._put(stage_queue, _DONE, token)
+
+    def _put(
+        self, stage_queue: queue.Queue, item: Any, token: CancellationToken
+    ) -> None:
+        """Queues an item for a stage, waiting for room unless the run is cancelled."""
+        while True:
+            token.raise_if_cancelled()
+            try:
+                return stage_queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+
+    def _get(self, stage_queue: queue.Queue, token: CancellationToken) -> Any:
+        """Takes the next item of a stage, waiting for it unless the run is cancelled."""
+        while True:
+            token.raise_if_cancelled()
+            try:
+                return stage_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _aggregate_usage_metrics(self, usage_metrics: List[Optional[dict]]) -> None:
+        """Sums up the token usage of the executions of the stages."""
+        metrics = [metrics for metrics in usage_metrics if metrics]
+        self.usage_metrics = (
+            {key: sum([m[key] for m in metrics]) for key in metrics[0]}
+            if metrics
+            else None
+        )
@@ -8,4 +8,5 @@ class Process(str, Enum):
 
     sequential = "sequential"
     hierarchical = "hierarchical"
-    # TODO: consensual = 'consensual'
+    parallel = "parallel"
+    consensual = "consensual"
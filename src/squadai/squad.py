@@ -1,6 +1,12 @@
+import asyncio
 import json
+import os
+import queue
+import threading
 import uuid
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Union
 
 from langchain_core.callbacks import BaseCallbackHandler
 from pydantic import (
@@ -22,10 +28,33 @@ from squadai.memory.entity.entity_memory import EntityMemory
 from squadai.memory.long_term.long_term_memory import LongTermMemory
 from squadai.memory.short_term.short_term_memory import ShortTermMemory
 from squadai.process import Process
+from squadai.squads import (
+    FinalResultEvent,
+    RunJournal,
+    SquadEvent,
+    TaskGraph,
+    TaskOutputEvent,
+    majority_vote,
+)
 from squadai.task import Task
+from squadai.tasks.executor_backend import (
+    ExecutorBackend,
+    get_process_pool,
+    is_delegation_tool,
+    wait_for_worker,
+)
+from squadai.tasks.result_cache import TaskResultCache
+from squadai.tasks.task_output import TaskOutput
 from squadai.telemetry import Telemetry
 from squadai.tools.agent_tools import AgentTools
-from squadai.utilities import I18N, FileHandler, Logger, RPMController
+from squadai.utilities import (
+    I18N,
+    CancellationToken,
+    FileHandler,
+    Logger,
+    RPMController,
+    SharedRPMController,
+)
 
 
 class Squad(BaseModel):
@@ -41,10 +70,20 @@ class Squad(BaseModel):
         manager_callbacks: The callback handlers to be executed by the manager agent when hierarchical process is used
         cache: Whether the squad should use a cache to store the results of the tools execution.
         function_calling_llm: The language model that will run the tool calling for all the agents.
-        process: The process flow that the squad will follow (e.g., sequential, hierarchical).
+        process: The process flow that the squad will follow (e.g., sequential, hierarchical, parallel).
+        max_workers: Maximum number of tasks running at the same time when using the parallel process, of asynchronous tasks running at the same time, or of agents answering a task at the same time when using the consensual process.
+        executor_backend: Where the tasks are executed, inline in the squad process one at a time, in threads, or in worker processes reused across kickoffs.
+        judge: Agent or function deciding the final answer of each task from the answers of the agents when using the consensual process, defaults to a majority vote.
         verbose: Indicates the verbosity level for logging during execution.
         config: Configuration settings for the squad.
         max_rpm: Maximum number of requests per minute for the squad execution to be respected.
+        max_tpm: Maximum number of tokens per minute for the squad execution to be respected.
+        max_in_flight: Maximum number of LLM calls of the squad running at the same time, per model.
+        rate_limit_budget: Name of a budget the RPM and TPM limits are shared in with the other processes of the host using the same name.
+        adaptive_rate_limits: Whether the RPM and in-flight limits adapt to the provider, shrinking on rate limit errors and rising latency and growing back on success.
+        checkpoint: Whether the squad should keep a journal of its task outputs to resume failed executions.
+        result_cache: Whether the squad should reuse the stored result of a task run with the same prompt, context, agent and tools, or the cache to store them in.
+        run_id: Identifier of the last execution of the squad, used to resume it.
         prompt_file: Path to the prompt json file to be used for the squad.
         id: A unique identifier for the squad instance.
         full_output: Whether the squad should return the full output with all tasks outputs or just the final output.
@@ -62,12 +101,29 @@ class Squad(BaseModel):
     _short_term_memory: Optional[InstanceOf[ShortTermMemory]] = PrivateAttr()
     _long_term_memory: Optional[InstanceOf[LongTermMemory]] = PrivateAttr()
     _entity_memory: Optional[InstanceOf[EntityMemory]] = PrivateAttr()
+    _run_journal: Optional[InstanceOf[RunJournal]] = PrivateAttr(default=None)
+    _result_cache: Optional[InstanceOf[TaskResultCache]] = PrivateAttr(default=None)
+    _restored_tasks: List[Task] = PrivateAttr(default_factory=list)
+    _recorded_outputs: Dict[int, TaskOutput] = PrivateAttr(default_factory=dict)
+    _event_handler: Optional[Callable[[SquadEvent], None]] = PrivateAttr(default=None)
+    _cancellation_token: Optional[CancellationToken] = PrivateAttr(default=None)
+    _i18n: Optional[I18N] = PrivateAttr(default=None)
+    _execution_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _async_executor: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
 
     cache: bool = Field(default=True)
     model_config = ConfigDict(arbitrary_types_allowed=True)
     tasks: List[Task] = Field(default_factory=list)
     agents: List[Agent] = Field(default_factory=list)
     process: Process = Field(default=Process.sequential)
+    max_workers: Optional[int] = Field(
+        default=None,
+        description="Maximum number of tasks running at the same time when using the parallel process, or of asynchronous tasks.",
+    )
+    executor_backend: ExecutorBackend = Field(
+        default=ExecutorBackend.thread,
+        description="Where the tasks are executed: inline, in threads or in worker processes.",
+    )
     verbose: Union[int, bool] = Field(default=0)
     memory: bool = Field(
         default=False,
@@ -77,6 +133,18 @@ class Squad(BaseModel):
         default={"provider": "openai"},
         description="Configuration for the embedder to be used for the squad.",
     )
+    checkpoint: bool = Field(
+        default=False,
+        description="Whether the squad should keep a journal of its task outputs to resume failed executions.",
+    )
+    result_cache: Union[bool, InstanceOf[TaskResultCache]] = Field(
+        default=False,
+        description="Whether the squad should reuse the stored result of a task run with the same prompt, context, agent and tools, or the cache to store them in.",
+    )
+    run_id: Optional[str] = Field(
+        default=None,
+        description="Identifier of the last execution of the squad, used to resume it.",
+    )
     usage_metrics: Optional[dict] = Field(
         default=None,
         description="Metrics for the LLM usage during all tasks execution.",
@@ -91,6 +159,10 @@ class Squad(BaseModel):
     manager_agent: Optional[Any] = Field(
         description="Custom agent that will be used as manager.", default=None
     )
+    judge: Optional[Any] = Field(
+        description="Agent or function that decides the final answer of each task in the consensual process.",
+        default=None,
+    )
     manager_callbacks: Optional[List[InstanceOf[BaseCallbackHandler]]] = Field(
         default=None,
         description="A list of callback handlers to be executed by the manager agent when hierarchical process is used",
@@ -113,6 +185,24 @@ class Squad(BaseModel):
         default=None,
         description="Maximum number of requests per minute for the squad execution to be respected.",
     )
+    max_tpm: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of tokens per minute for the squad execution to be respected.",
+    )
+    max_in_flight: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of LLM calls of the squad running at the same time, per model.",
+    )
+    rate_limit_budget: Optional[str] = Field(
+        default=None,
+        description="Name of a budget the RPM and TPM limits are shared in with the other processes of the host using the same name.",
+    )
+    adaptive_rate_limits: bool = Field(
+        default=False,
+        description="Whether the RPM and in-flight limits adapt to the provider, shrinking on rate limit errors and rising latency and growing back on success.",
+    )
     prompt_file: str = Field(
         default=None,
         description="Path to the prompt json file to be used for the squad.",
@@ -153,7 +243,31 @@ class Squad(BaseModel):
         self._logger = Logger(self.verbose)
         if self.output_log_file:
             self._file_handler = FileHandler(self.output_log_file)
-        self._rpm_controller = RPMController(max_rpm=self.max_rpm, logger=self._logger)
+        budget = self.rate_limit_budget
+        if (
+            not budget
+            and self.executor_backend == ExecutorBackend.process
+            and (self.max_rpm or self.max_tpm)
+        ):
+            # Worker processes count the requests in the budget of the squad.
+            budget = f"squadai-squad-{self.id}"
+        if budget:
+            self._rpm_controller = SharedRPMController(
+                budget=budget,
+                max_rpm=self.max_rpm,
+                max_tpm=self.max_tpm,
+                max_in_flight=self.max_in_flight,
+                adaptive=self.adaptive_rate_limits,
+                logger=self._logger,
+            )
+        else:
+            self._rpm_controller = RPMController(
+                max_rpm=self.max_rpm,
+                max_tpm=self.max_tpm,
+                max_in_flight=self.max_in_flight,
+                adaptive=self.adaptive_rate_limits,
+                logger=self._logger,
+            )
         self._telemetry = Telemetry()
         self._telemetry.set_tracer()
         self._telemetry.squad_creation(self)
@@ -168,6 +282,22 @@ class Squad(BaseModel):
             self._entity_memory = EntityMemory(embedder_config=self.embedder)
         return self
 
+    @model_validator(mode="after")
+    def create_run_journal(self) -> "Squad":
+        """Set the journal used to checkpoint the executions."""
+        if self.checkpoint:
+            self._run_journal = RunJournal()
+        return self
+
+    @model_validator(mode="after")
+    def create_result_cache(self) -> "Squad":
+        """Set the cache used to reuse task results across executions."""
+        if isinstance(self.result_cache, TaskResultCache):
+            self._result_cache = self.result_cache
+        elif self.result_cache:
+            self._result_cache = TaskResultCache()
+        return self
+
     @model_validator(mode="after")
     def check_manager_llm(self):
         """Validates that the language model is set when using hierarchical process."""
@@ -190,6 +320,16 @@ class Squad(BaseModel):
 
         return self
 
+    @model_validator(mode="after")
+    def check_tasks_dependencies(self):
+        """Validates that the tasks can be scheduled when using parallel process."""
+        if self.process == Process.parallel and self.tasks:
+            try:
+                TaskGraph(self.tasks)
+            except ValueError as e:
+                raise PydanticCustomError("task_dependency_cycle", str(e), {}) from e
+        return self
+
     @model_validator(mode="after")
     def check_config(self):
         """Validates that the squad is properly configured with agents and tasks."""
@@ -204,11 +344,26 @@ class Squad(BaseModel):
             self._setup_from_config()
 
         if self.agents:
-            for agent in self.agents:
+            for agent in self.agents + self._judge_agents():
                 if self.cache:
                     agent.set_cache_handler(self._cache_handler)
-                if self.max_rpm:
+                if (
+                    self.max_rpm
+                    or self.max_tpm
+                    or self.max_in_flight
+                    or self.adaptive_rate_limits
+                ):
                     agent.set_rpm_controller(self._rpm_controller)
+                if (
+                    self.executor_backend == ExecutorBackend.process
+                    and agent.max_rpm
+                    and not isinstance(agent._rpm_controller, SharedRPMController)
+                ):
+                    agent._rpm_controller = SharedRPMController(
+                        budget=f"squadai-agent-{agent.id}",
+                        max_rpm=agent.max_rpm,
+                        logger=agent._logger,
+                    )
         return self
 
     def _setup_from_config(self):
@@ -239,16 +394,354 @@ class Squad(BaseModel):
         del task_config["agent"]
         return Task(**task_config, agent=task_agent)
 
-    def kickoff(self, inputs: Optional[Dict[str, Any]] = {}) -> str:
-        """Starts the squad to work on its assigned tasks."""
+    def kickoff(
+        self,
+        inputs: Optional[Dict[str, Any]] = {},
+        resume_from: Optional[str] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> str:
+        """Starts the squad to work on its assigned tasks.
+
+        Args:
+            inputs: Inputs to interpolate into the tasks and agents.
+            resume_from: Identifier of a checkpointed execution to resume, skipping
+                the tasks it completed.
+            cancellation_token: Token to stop the execution, which then raises a
+                `SquadCancelledError`.
+        """
+        with self._execution() as squad:
+            return squad._kickoff(inputs, resume_from, cancellation_token)
+
+    def _kickoff(
+        self,
+        inputs: Optional[Dict[str, Any]],
+        resume_from: Optional[str],
+        cancellation_token: Optional[CancellationToken],
+    ) -> str:
+        self._prepare_kickoff(inputs, resume_from, cancellation_token)
+
+        metrics = []
+
+        try:
+            if self.process == Process.sequential:
+                result = self._run_sequential_process()
+            elif self.process == Process.parallel:
+                result = self._run_parallel_process()
+            elif self.process == Process.consensual:
+                result = self._run_consensual_process()
+            elif self.process == Process.hierarchical:
+                result, manager_metrics = self._run_hierarchical_process()
+                metrics.append(manager_metrics)
+
+            else:
+                raise NotImplementedError(
+                    f"The process '{self.process}' is not implemented yet."
+                )
+        finally:
+            self._async_executor.shutdown(wait=False, cancel_futures=True)
+
+        self._set_usage_metrics(metrics)
+
+        return result
+
+    async def kickoff_async(
+        self,
+        inputs: Optional[Dict[str, Any]] = {},
+        resume_from: Optional[str] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> str:
+        """Starts the squad to work on its assigned tasks without blocking the event loop."""
+        with self._execution() as squad:
+            return await squad._kickoff_async(inputs, resume_from, cancellation_token)
+
+    async def _kickoff_async(
+        self,
+        inputs: Optional[Dict[str, Any]],
+        resume_from: Optional[str],
+        cancellation_token: Optional[CancellationToken],
+    ) -> str:
+        self._prepare_kickoff(inputs, resume_from, cancellation_token)
+
+        metrics = []
+
+        try:
+            if self.process == Process.sequential:
+                result = await self._arun_sequential_process()
+            elif self.process == Process.parallel:
+                result = await self._arun_parallel_process()
+            elif self.process == Process.consensual:
+                result = await self._arun_consensual_process()
+            elif self.process == Process.hierarchical:
+                result, manager_metrics = await self._arun_hierarchical_process()
+                metrics.append(manager_metrics)
+
+            else:
+                raise NotImplementedError(
+                    f"The process '{self.process}' is not implemented yet."
+                )
+        finally:
+            self._async_executor.shutdown(wait=False, cancel_futures=True)
+
+        self._set_usage_metrics(metrics)
+
+        return result
+
+    def kickoff_stream(
+        self,
+        inputs: Optional[Dict[str, Any]] = {},
+        resume_from: Optional[str] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> Iterator[SquadEvent]:
+        """Starts the squad and yields the events of its execution as they happen.
+
+        The squad works in a background thread. The last event is a
+        `FinalResultEvent` holding what `kickoff` would have returned, and errors
+        are raised when reached. Once the caller stops reading, the execution is
+        cancelled.
+        """
+        cancellation_token = cancellation_token or CancellationToken()
+        events: queue.Queue = queue.Queue()
+        done = object()
+        closed = threading.Event()
+
+        def emit(event: Any) -> None:
+            if not closed.is_set():
+                events.put(event)
+
+        def run() -> None:
+            try:
+                with self._execution() as squad:
+                    squad._event_handler = emit
+                    try:
+                        result = squad._kickoff(inputs, resume_from, cancellation_token)
+                    finally:
+                        squad._event_handler = None
+                    usage_metrics = squad.usage_metrics
+                emit(FinalResultEvent(result=result, usage_metrics=usage_metrics))
+            except BaseException as e:
+                emit(e)
+            finally:
+                emit(done)
+
+        threading.Thread(target=run, daemon=True).start()
+
+        try:
+            while (event := events.get()) is not done:
+                if isinstance(event, BaseException):
+                    raise event
+                yield event
+        finally:
+            closed.set()
+            cancellation_token.cancel()
+
+    async def kickoff_stream_async(
+        self,
+        inputs: Optional[Dict[str, Any]] = {},
+        resume_from: Optional[str] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncIterator[SquadEvent]:
+        """Async version of `kickoff_stream`, running the squad on the event loop.
+
+        Once the caller stops reading, the execution is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def emit(event: SquadEvent) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        async def run() -> Any:
+            with self._execution() as squad:
+                squad._event_handler = emit
+                try:
+                    result = await squad._kickoff_async(
+                        inputs, resume_from, cancellation_token
+                    )
+                finally:
+                    squad._event_handler = None
+                return FinalResultEvent(
+                    result=result, usage_metrics=squad.usage_metrics
+                )
+
+        execution = asyncio.create_task(run())
+        execution.add_done_callback(lambda _: events.put_nowait(None))
+
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            yield execution.result()
+        finally:
+            execution.cancel()
+
+    def kickoff_for_each(
+        self,
+        inputs_list: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> List[Any]:
+        """Kicks off a copy of the squad for each set of inputs, running them in parallel.
+
+        The copies share the cache handler and the RPM budget of the squad.
+
+        Args:
+            inputs_list: Inputs of each execution.
+            max_concurrency: Maximum number of executions running at the same time.
+            cancellation_token: Token to stop all the executions.
+
+        Returns:
+            Results of the executions, in the order of the inputs.
+        """
+        usage_metrics: List[Optional[dict]] = []
+
+        def kickoff(inputs: Dict[str, Any]) -> Any:
+            squad = self.copy()
+            try:
+                return squad.kickoff(inputs, cancellation_token=cancellation_token)
+            finally:
+                usage_metrics.append(squad.usage_metrics)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            results = list(pool.map(kickoff, inputs_list))
+
+        self._aggregate_usage_metrics(usage_metrics)
+        return results
+
+    async def kickoff_for_each_async(
+        self,
+        inputs_list: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> List[Any]:
+        """Async version of `kickoff_for_each`, running the copies on the event loop."""
+        usage_metrics: List[Optional[dict]] = []
+        semaphore = asyncio.Semaphore(max_concurrency or len(inputs_list) or 1)
+
+        async def kickoff(inputs: Dict[str, Any]) -> Any:
+            async with semaphore:
+                squad = self.copy()
+                try:
+                    return await squad.kickoff_async(
+                        inputs, cancellation_token=cancellation_token
+                    )
+                finally:
+                    usage_metrics.append(squad.usage_metrics)
+
+        results = await asyncio.gather(*[kickoff(inputs) for inputs in inputs_list])
+
+        self._aggregate_usage_metrics(usage_metrics)
+        return list(results)
+
+    def copy(self) -> "Squad":
+        """Create a copy of the squad, with copies of its agents and tasks.
+
+        The copy skips the validation of the squad and shares its cache handler,
+        RPM controller, memories and telemetry.
+        """
+        agents = {agent: agent.copy() for agent in self.agents}
+        tasks: Dict[Task, Task] = {}
+        for task in self.tasks:
+            tasks[task] = task.copy(agents, tasks)
+
+        copied_squad = self.model_copy(
+            update={
+                "id": uuid.uuid4(),
+                "agents": list(agents.values()),
+                "tasks": list(tasks.values()),
+                "manager_agent": (
+                    self.manager_agent.copy() if self.manager_agent else None
+                ),
+                "judge": (
+                    self.judge.copy() if isinstance(self.judge, Agent) else self.judge
+                ),
+                "usage_metrics": None,
+                "run_id": None,
+            }
+        )
+        copied_squad._execution_lock = threading.Lock()
+        copied_squad._event_handler = None
+        copied_squad._cancellation_token = None
+        return copied_squad
+
+    @contextmanager
+    def _execution(self) -> Iterator["Squad"]:
+        """Yields the squad an execution runs on.
+
+        An execution started while another one is running on the squad works on a
+        copy of it, so its outputs, executors, counters and metrics don't collide
+        with the running one. The copy is its run context: its results are only
+        returned to the caller.
+        """
+        if not self._execution_lock.acquire(blocking=False):
+            yield self.copy()
+            return
+
+        try:
+            yield self
+        finally:
+            self._execution_lock.release()
+
+    def _aggregate_usage_metrics(self, usage_metrics: List[Optional[dict]]) -> None:
+        """Sums up the token usage of squad executions."""
+        metrics = [metrics for metrics in usage_metrics if metrics]
+        self.usage_metrics = (
+            {key: sum([m[key] for m in metrics]) for key in metrics[0]}
+            if metrics
+            else None
+        )
+
+    def _prepare_kickoff(
+        self,
+        inputs: Optional[Dict[str, Any]],
+        resume_from: Optional[str] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> None:
+        """Interpolates the inputs and sets the agents up for a new execution."""
         self._execution_span = self._telemetry.squad_execution_span(self)
+        self._cancellation_token = cancellation_token
+
+        if resume_from and not self._run_journal:
+            self._run_journal = RunJournal()
+        if resume_from and not inputs:
+            inputs = self._run_journal.load_inputs(resume_from)
+
         self._interpolate_inputs(inputs)
         self._set_tasks_callbacks()
+        self._start_run(inputs, resume_from)
 
-        i18n = I18N(prompt_file=self.prompt_file)
+        process_pool = (
+            get_process_pool(self.max_workers)
+            if self.executor_backend == ExecutorBackend.process
+            else None
+        )
+        self._async_executor = ThreadPoolExecutor(
+            max_workers=self._max_concurrency(), thread_name_prefix="squadai-task"
+        )
+        for task in self.tasks:
+            task._result_cache = self._result_cache
+            task._executor_backend = self.executor_backend
+            task._process_pool = process_pool
+            task._async_executor = self._async_executor
+            task.future = None
+            task._async_execution_task = None
 
+        self.prepare()
+        for agent in self._token_counted_agents():
+            agent._token_process.reset()
         for agent in self.agents:
-            agent.i18n = i18n
+            agent._cancellation_token = cancellation_token
+
+    def prepare(self) -> "Squad":
+        """Compiles the prompts, tools and executors of the agents.
+
+        Compiled executors are reused by every later kickoff, which only binds its
+        inputs. Kickoffs prepare the squad themselves, calling it beforehand takes
+        the compilation out of the first one.
+        """
+        if self._i18n is None or self._i18n.prompt_file != self.prompt_file:
+            self._i18n = I18N(prompt_file=self.prompt_file)
+
+        for agent in self.agents + self._judge_agents():
+            agent.i18n = self._i18n
             agent.squad = self
 
             if not agent.function_calling_llm:
@@ -258,38 +751,132 @@ class Squad(BaseModel):
 
             agent.create_agent_executor()
 
-        metrics = []
+        if self.process in [Process.sequential, Process.parallel]:
+            for task in self.tasks:
+                if task.agent:
+                    self._add_delegation_tools(task)
+                    task.agent.compile_agent_executor(tools=task.tools)
 
-        if self.process == Process.sequential:
-            result = self._run_sequential_process()
-        elif self.process == Process.hierarchical:
-            result, manager_metrics = self._run_hierarchical_process()
-            metrics.append(manager_metrics)
+        return self
 
-        else:
-            raise NotImplementedError(
-                f"The process '{self.process}' is not implemented yet."
+    def _start_run(
+        self, inputs: Optional[Dict[str, Any]], resume_from: Optional[str]
+    ) -> None:
+        """Starts a new journaled execution, or restores the tasks completed by the resumed one."""
+        self.run_id = resume_from or str(uuid.uuid4())
+        self._restored_tasks = []
+        self._recorded_outputs = {
+            id(task.output): task.output for task in self.tasks if task.output
+        }
+
+        if not self._run_journal:
+            return
+
+        self._run_journal.save_run(self.run_id, inputs)
+        if not resume_from:
+            return
+
+        task_outputs = self._run_journal.load_task_outputs(resume_from)
+        for index, task in enumerate(self.tasks):
+            task_output = task_outputs.get(index)
+            if not task_output or task_output["task_description"] != task.description:
+                continue
+
+            task.output = TaskOutput(
+                description=task.description,
+                exported_output=task._restore_exported_output(
+                    task_output["exported_output"]
+                ),
+                raw_output=task_output["raw_output"],
             )
+            self._restored_tasks.append(task)
+            self._recorded_outputs[id(task.output)] = task.output
+
+    def _is_restored(self, task: Task) -> bool:
+        """Whether the output of the task was restored from the resumed execution."""
+        return task in self._restored_tasks
+
+    def _checkpoint(self) -> None:
+        """Records the outputs of the tasks completed since the last checkpoint.
+
+        The outputs are saved to the journal and streamed as events.
+        """
+        for index, task in enumerate(self.tasks):
+            if not task.output or id(task.output) in self._recorded_outputs:
+                continue
+
+            if self._run_journal:
+                self._run_journal.save_task_output(
+                    run_id=self.run_id,
+                    task_index=index,
+                    task_description=task.description,
+                    raw_output=task.output.raw_output,
+                    exported_output=task.output.exported_output,
+                )
+            self._emit(TaskOutputEvent(output=task.output))
+            self._recorded_outputs[id(task.output)] = task.output
+
+    def _expected_durations(self) -> Optional[Dict[Task, Optional[float]]]:
+        """Wall time the tasks took in their latest executions, from the long term memory."""
+        if not self.memory:
+            return None
+        return {
+            task: self._long_term_memory.expected_duration(task.description)
+            for task in self.tasks
+        }
+
+    def _wait_for_async_tasks(self) -> None:
+        """Waits for the asynchronous tasks still running, raising their errors."""
+        for task in self.tasks:
+            if task.future:
+                wait_for_worker(task.future, self._cancellation_token)
+
+    def _max_concurrency(self) -> Optional[int]:
+        """Maximum number of tasks, or agents answering a task, running at the same time."""
+        if self.executor_backend == ExecutorBackend.inline:
+            return 1
+        return self.max_workers
+
+    def _emit(self, event: SquadEvent) -> None:
+        """Streams an event to the caller of `kickoff_stream`, if any."""
+        if self._event_handler:
+            self._event_handler(event)
+
+    def _judge_agents(self) -> List[Agent]:
+        """The judge of the consensual process, if it's an agent of its own."""
+        if isinstance(self.judge, Agent) and all(
+            agent is not self.judge for agent in self.agents
+        ):
+            return [self.judge]
+        return []
 
+    def _token_counted_agents(self) -> List[Agent]:
+        """Agents whose token usage is counted in the usage metrics of the squad."""
+        agents = self.agents + self._judge_agents()
+        if self.manager_agent:
+            agents.append(self.manager_agent)
+        return agents
+
+    def _set_usage_metrics(self, metrics: List[Optional[Dict[str, Any]]]) -> None:
+        """Sums up the token usage of the manager, the judge and the agents."""
         metrics = metrics + [
-            agent._token_process.get_summary() for agent in self.agents
+            agent._token_process.get_summary()
+            for agent in self.agents + self._judge_agents()
         ]
         self.usage_metrics = {
             key: sum([m[key] for m in metrics if m is not None]) for key in metrics[0]
         }
 
-        return result
-
     def _run_sequential_process(self) -> str:
         """Executes tasks sequentially and returns the final output."""
         task_output = ""
         for task in self.tasks:
-            if task.agent.allow_delegation:
-                agents_for_delegation = [
-                    agent for agent in self.agents if agent != task.agent
-                ]
-                if len(self.agents) > 1 and len(agents_for_delegation) > 0:
-                    task.tools += AgentTools(agents=agents_for_delegation).tools()
+            if self._is_restored(task):
+                if not task.async_execution:
+                    task_output = task.output.exported_output
+                continue
+
+            self._add_delegation_tools(task)
 
             role = task.agent.role if task.agent is not None else "None"
             self._logger.log("debug", f"== Working Agent: {role}", color="bold_purple")
@@ -312,31 +899,396 @@ class Squad(BaseModel):
             if self.output_log_file:
                 self._file_handler.log(agent=role, task=task_output, status="completed")
 
+            self._checkpoint()
+
+        self._wait_for_async_tasks()
+        self._checkpoint()
+        self._finish_execution(task_output)
+        return self._format_output(task_output)
+
+    def _run_parallel_process(self) -> str:
+        """Executes every task as soon as the tasks it depends on are completed.
+
+        Tasks are only handed to the pool once it has a free worker, so the ready
+        task with the longest expected critical path is always the next to start.
+        """
+        graph = TaskGraph(self.tasks, self._expected_durations())
+        started = {task for task in self.tasks if self._is_restored(task)}
+        completed = set(started)
+        futures = {}
+        max_running = self._max_concurrency() or min(32, (os.cpu_count() or 1) + 4)
+
+        with ThreadPoolExecutor(max_workers=max_running) as pool:
+            try:
+                while True:
+                    ready = graph.ready(completed, started)
+                    for task in ready[: max_running - len(futures)]:
+                        started.add(task)
+                        future = pool.submit(
+                            self._execute_graph_task, task, graph.implicit_context(task)
+                        )
+                        futures[future] = task
+
+                    if not futures:
+                        break
+
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = futures.pop(future)
+                        future.result()
+                        completed.add(task)
+                        self._checkpoint()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        final_output = graph.final_task().output
+        task_output = final_output.exported_output if final_output else ""
+
+        self._finish_execution(task_output)
+        return self._format_output(task_output)
+
+    def _execute_graph_task(self, task: Task, context: Optional[str]) -> None:
+        """Executes a single task of the parallel process."""
+        self._add_delegation_tools(task)
+
+        role = task.agent.role if task.agent is not None else "None"
+        self._logger.log("debug", f"== Working Agent: {role}", color="bold_purple")
+        self._logger.log(
+            "info", f"== Starting Task: {task.description}", color="bold_purple"
+        )
+
+        if self.output_log_file:
+            self._file_handler.log(agent=role, task=task.description, status="started")
+
+        task.execute(context=context)
+        if task.async_execution:
+            wait_for_worker(task.future, self._cancellation_token)
+
+        task_output = task.output.raw_output if task.output else ""
+        self._logger.log("debug", f"== [{role}] Task output: {task_output}\n\n")
+
+        if self.output_log_file:
+            self._file_handler.log(agent=role, task=task_output, status="completed")
+
+    def _add_delegation_tools(self, task: Task) -> None:
+        """Gives the task agent the tools to delegate work to the other agents.
+
+        The tools are kept across kickoffs, as long as the other agents are the same.
+        """
+        if task.agent.allow_delegation:
+            agents_for_delegation = [
+                agent for agent in self.agents if agent != task.agent
+            ]
+            delegation_tools = [tool for tool in task.tools if is_delegation_tool(tool)]
+            if delegation_tools and [
+                id(agent) for agent in delegation_tools[0].func.__self__.agents
+            ] == [id(agent) for agent in agents_for_delegation]:
+                return
+
+            task.tools = [tool for tool in task.tools if not is_delegation_tool(tool)]
+            if len(self.agents) > 1 and len(agents_for_delegation) > 0:
+                task.tools += AgentTools(agents=agents_for_delegation).tools()
+
+    def _run_consensual_process(self) -> str:
+        """Sends each task to all the agents at once and lets the judge decide the final answer."""
+        task_output = ""
+        for task in self.tasks:
+            if self._is_restored(task):
+                if not task.async_execution:
+                    task_output = task.output.exported_output
+                continue
+
+            roles = ", ".join([agent.role for agent in self.agents])
+            self._logger.log(
+                "debug", f"== Working Agents: {roles}", color="bold_purple"
+            )
+            self._logger.log(
+                "info", f"== Starting Task: {task.description}", color="bold_purple"
+            )
+
+            if self.output_log_file:
+                self._file_handler.log(
+                    agent=roles, task=task.description, status="started"
+                )
+
+            task_output = task.execute_consensus(
+                agents=self.agents,
+                vote=self._consensus_vote(task),
+                context=task_output,
+                max_workers=self._max_concurrency(),
+            )
+
+            self._logger.log("debug", f"== [{roles}] Task output: {task_output}\n\n")
+
+            if self.output_log_file:
+                self._file_handler.log(
+                    agent=roles, task=task_output, status="completed"
+                )
+
+            self._checkpoint()
+
         self._finish_execution(task_output)
         return self._format_output(task_output)
 
+    def _consensus_vote(self, task: Task) -> Callable[[List[str]], str]:
+        """Function combining the answers of the agents to a task into its final answer."""
+        if self.judge is None:
+            return majority_vote
+        if not isinstance(self.judge, Agent):
+            return self.judge
+
+        self.judge._cancellation_token = self._cancellation_token
+
+        def judge(answers: List[str]) -> str:
+            judge_task = Task(
+                description=self._i18n.slice("consensus_judge").format(
+                    task=task.description,
+                    answers="\n\n".join(
+                        [
+                            f"{agent.role}: {answer}"
+                            for agent, answer in zip(self.agents, answers)
+                        ]
+                    ),
+                ),
+                expected_output=task.expected_output,
+                agent=self.judge,
+            )
+            return self.judge.execute_task(judge_task)
+
+        return judge
+
     def _run_hierarchical_process(self) -> str:
         """Creates and assigns a manager agent to make sure the squad completes the tasks."""
 
-        i18n = I18N(prompt_file=self.prompt_file)
+        manager = self._create_manager_agent()
+
+        task_output = ""
+        for task in self.tasks:
+            if self._is_restored(task):
+                if not task.async_execution:
+                    task_output = task.output.exported_output
+                continue
+
+            self._logger.log("debug", f"Working Agent: {manager.role}")
+            self._logger.log("info", f"Starting Task: {task.description}")
+
+            if self.output_log_file:
+                self._file_handler.log(
+                    agent=manager.role, task=task.description, status="started"
+                )
+
+            output = task.execute(
+                agent=manager, context=task_output, tools=manager.tools
+            )
+            if not task.async_execution:
+                task_output = output
+
+            self._logger.log("debug", f"[{manager.role}] Task output: {task_output}")
+
+            if self.output_log_file:
+                self._file_handler.log(
+                    agent=manager.role, task=task_output, status="completed"
+                )
+
+            self._checkpoint()
+
+        self._wait_for_async_tasks()
+        self._checkpoint()
+        self._finish_execution(task_output)
+        return self._format_output(task_output), manager._token_process.get_summary()
+
+    def _create_manager_agent(self) -> Agent:
+        """Creates the manager agent of the hierarchical process, or sets up the given one."""
+        i18n = self._i18n
         if self.manager_agent is not None:
             self.manager_agent.allow_delegation = True
             manager = self.manager_agent
-            if len(manager.tools) > 0:
+            # The delegation tools of earlier kickoffs are rebuilt for this one.
+            if any(not is_delegation_tool(tool) for tool in manager.tools):
                 raise Exception("Manager agent should not have tools")
-            manager.tools = AgentTools(agents=self.agents).tools()
+            manager.tools = AgentTools(
+                agents=self.agents,
+                parallel_delegation=True,
+                max_parallel_delegations=self._max_concurrency(),
+            ).tools()
         else:
             manager = Agent(
                 role=i18n.retrieve("hierarchical_manager_agent", "role"),
                 goal=i18n.retrieve("hierarchical_manager_agent", "goal"),
                 backstory=i18n.retrieve("hierarchical_manager_agent", "backstory"),
-                tools=AgentTools(agents=self.agents).tools(),
+                tools=AgentTools(
+                    agents=self.agents,
+                    parallel_delegation=True,
+                    max_parallel_delegations=self._max_concurrency(),
+                ).tools(),
                 llm=self.manager_llm,
                 verbose=True,
             )
+        manager._cancellation_token = self._cancellation_token
+        return manager
 
+    async def _arun_sequential_process(self) -> str:
+        """Async version of `_run_sequential_process`."""
         task_output = ""
         for task in self.tasks:
+            if self._is_restored(task):
+                if not task.async_execution:
+                    task_output = task.output.exported_output
+                continue
+
+            self._add_delegation_tools(task)
+
+            role = task.agent.role if task.agent is not None else "None"
+            self._logger.log("debug", f"== Working Agent: {role}", color="bold_purple")
+            self._logger.log(
+                "info", f"== Starting Task: {task.description}", color="bold_purple"
+            )
+
+            if self.output_log_file:
+                self._file_handler.log(
+                    agent=role, task=task.description, status="started"
+                )
+
+            output = await task.aexecute(context=task_output)
+            if not task.async_execution:
+                task_output = output
+
+            role = task.agent.role if task.agent is not None else "None"
+            self._logger.log("debug", f"== [{role}] Task output: {task_output}\n\n")
+
+            if self.output_log_file:
+                self._file_handler.log(agent=role, task=task_output, status="completed")
+
+            self._checkpoint()
+
+        for task in self.tasks:
+            if task.async_execution:
+                await task.wait_async_execution()
+
+        self._checkpoint()
+        self._finish_execution(task_output)
+        return self._format_output(task_output)
+
+    async def _arun_parallel_process(self) -> str:
+        """Async version of `_run_parallel_process`, bounded by `max_workers`."""
+        graph = TaskGraph(self.tasks, self._expected_durations())
+        started = {task for task in self.tasks if self._is_restored(task)}
+        completed = set(started)
+        running = {}
+        max_running = self._max_concurrency() or len(self.tasks) or 1
+
+        try:
+            while True:
+                ready = graph.ready(completed, started)
+                for task in ready[: max_running - len(running)]:
+                    started.add(task)
+                    running[
+                        asyncio.create_task(
+                            self._aexecute_graph_task(
+                                task, graph.implicit_context(task)
+                            )
+                        )
+                    ] = task
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    task = running.pop(future)
+                    future.result()
+                    completed.add(task)
+                    self._checkpoint()
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+        final_output = graph.final_task().output
+        task_output = final_output.exported_output if final_output else ""
+
+        self._finish_execution(task_output)
+        return self._format_output(task_output)
+
+    async def _aexecute_graph_task(self, task: Task, context: Optional[str]) -> None:
+        """Async version of `_execute_graph_task`."""
+        self._add_delegation_tools(task)
+
+        role = task.agent.role if task.agent is not None else "None"
+        self._logger.log("debug", f"== Working Agent: {role}", color="bold_purple")
+        self._logger.log(
+            "info", f"== Starting Task: {task.description}", color="bold_purple"
+        )
+
+        if self.output_log_file:
+            self._file_handler.log(agent=role, task=task.description, status="started")
+
+        await task.aexecute(context=context)
+        if task.async_execution:
+            await task.wait_async_execution()
+
+        task_output = task.output.raw_output if task.output else ""
+        self._logger.log("debug", f"== [{role}] Task output: {task_output}\n\n")
+
+        if self.output_log_file:
+            self._file_handler.log(agent=role, task=task_output, status="completed")
+
+    async def _arun_consensual_process(self) -> str:
+        """Async version of `_run_consensual_process`."""
+        task_output = ""
+        for task in self.tasks:
+            if self._is_restored(task):
+                if not task.async_execution:
+                    task_output = task.output.exported_output
+                continue
+
+            roles = ", ".join([agent.role for agent in self.agents])
+            self._logger.log(
+                "debug", f"== Working Agents: {roles}", color="bold_purple"
+            )
+            self._logger.log(
+                "info", f"== Starting Task: {task.description}", color="bold_purple"
+            )
+
+            if self.output_log_file:
+                self._file_handler.log(
+                    agent=roles, task=task.description, status="started"
+                )
+
+            task_output = await task.aexecute_consensus(
+                agents=self.agents,
+                vote=self._consensus_vote(task),
+                context=task_output,
+                max_workers=self._max_concurrency(),
+            )
+
+            self._logger.log("debug", f"== [{roles}] Task output: {task_output}\n\n")
+
+            if self.output_log_file:
+                self._file_handler.log(
+                    agent=roles, task=task_output, status="completed"
+                )
+
+            self._checkpoint()
+
+        self._finish_execution(task_output)
+        return self._format_output(task_output)
+
+    async def _arun_hierarchical_process(self) -> str:
+        """Async version of `_run_hierarchical_process`."""
+        manager = self._create_manager_agent()
+
+        task_output = ""
+        for task in self.tasks:
+            if self._is_restored(task):
+                if not task.async_execution:
+                    task_output = task.output.exported_output
+                continue
+
             self._logger.log("debug", f"Working Agent: {manager.role}")
             self._logger.log("info", f"Starting Task: {task.description}")
 
@@ -345,9 +1297,11 @@ class Squad(BaseModel):
                     agent=manager.role, task=task.description, status="started"
                 )
 
-            task_output = task.execute(
+            output = await task.aexecute(
                 agent=manager, context=task_output, tools=manager.tools
             )
+            if not task.async_execution:
+                task_output = output
 
             self._logger.log("debug", f"[{manager.role}] Task output: {task_output}")
 
@@ -356,6 +1310,13 @@ class Squad(BaseModel):
                     agent=manager.role, task=task_output, status="completed"
                 )
 
+            self._checkpoint()
+
+        for task in self.tasks:
+            if task.async_execution:
+                await task.wait_async_execution()
+
+        self._checkpoint()
         self._finish_execution(task_output)
         return self._format_output(task_output), manager._token_process.get_summary()
 
@@ -380,9 +1341,13 @@ class Squad(BaseModel):
         else:
             return output
 
+    @property
+    def rate_limit_metrics(self) -> Dict[str, Any]:
+        """Current rate and in-flight limits of the squad, adaptive ones included,
+        and its usage of the last minute."""
+        return self._rpm_controller.metrics()
+
     def _finish_execution(self, output) -> None:
-        if self.max_rpm:
-            self._rpm_controller.stop_rpm_counter()
         self._telemetry.end_squad(self, output)
 
     def __repr__(self):
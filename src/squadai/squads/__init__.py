@@ -0,0 +1,13 @@
+from .consensus import majority_vote
+from .events import (
+    AgentActionEvent,
+    FinalResultEvent,
+    SquadEvent,
+    TaskOutputEvent,
+    TaskStartedEvent,
+    TokenChunkEvent,
+    TokenStreamHandler,
+    ToolObservationEvent,
+)
+from .run_journal import RunJournal
+from .task_graph import TaskGraph
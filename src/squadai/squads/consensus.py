@@ -0,0 +1,13 @@
+from collections import Counter
+from typing import List
+
+
+def majority_vote(answers: List[str]) -> str:
+    """Pick the answer most agents agree on, the earliest one on a tie.
+
+    Answers are compared ignoring differences in case and whitespace.
+    """
+    normalized = [" ".join(str(answer).split()).casefold() for answer in answers]
+    votes = Counter(normalized)
+    winner = max(normalized, key=lambda answer: votes[answer])
+    return answers[normalized.index(winner)]
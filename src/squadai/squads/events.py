@@ -0,0 +1,73 @@
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.agents import AgentAction
+from langchain_core.callbacks import BaseCallbackHandler
+from pydantic import BaseModel, ConfigDict, Field, InstanceOf
+
+from squadai.tasks.task_output import TaskOutput
+
+
+class SquadEvent(BaseModel):
+    """Base class of the events streamed while a squad is working."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class TaskStartedEvent(SquadEvent):
+    """An agent started working on a task."""
+
+    task: str = Field(description="Description of the task.")
+    agent: str = Field(description="Role of the agent working on the task.")
+
+
+class TokenChunkEvent(SquadEvent):
+    """A chunk of text generated by the language model of an agent."""
+
+    agent: str = Field(description="Role of the agent generating the text.")
+    text: str = Field(description="Generated text.")
+
+
+class AgentActionEvent(SquadEvent):
+    """An agent decided to use a tool."""
+
+    agent: str = Field(description="Role of the agent.")
+    action: InstanceOf[AgentAction] = Field(
+        description="Action the agent decided to take."
+    )
+
+
+class ToolObservationEvent(SquadEvent):
+    """A tool used by an agent returned its result."""
+
+    agent: str = Field(description="Role of the agent that used the tool.")
+    tool: str = Field(description="Name of the tool.")
+    tool_input: Any = Field(description="Input the tool was used with.")
+    observation: str = Field(description="Result of the tool.")
+
+
+class TaskOutputEvent(SquadEvent):
+    """A task was completed."""
+
+    output: TaskOutput = Field(description="Output of the task.")
+
+
+class FinalResultEvent(SquadEvent):
+    """The squad completed all of its tasks."""
+
+    result: Any = Field(description="Result of the squad execution.")
+    usage_metrics: Optional[Dict[str, Any]] = Field(
+        default=None, description="Token usage of the squad execution."
+    )
+
+
+class TokenStreamHandler(BaseCallbackHandler):
+    """Streams the tokens generated by the language model of an agent as events."""
+
+    run_inline = True
+
+    def __init__(self, agent: str, emit: Callable[[SquadEvent], None]):
+        self.agent = agent
+        self.emit = emit
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self.emit(TokenChunkEvent(agent=self.agent, text=token))
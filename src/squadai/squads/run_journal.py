@@ -0,0 +1,157 @@
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from squadai.utilities import Printer
+from squadai.utilities.paths import db_storage_path
+
+
+class RunJournal:
+    """
+    SQLite journal of the squad executions, recording their inputs and the output
+    of every completed task so a failed execution can be resumed.
+    """
+
+    def __init__(self, db_path=f"{db_storage_path()}/squad_runs.db"):
+        self.db_path = db_path
+        self._printer: Printer = Printer()
+        self._initialize_db()
+
+    def _initialize_db(self):
+        """
+        Initializes the SQLite database and creates the runs and task outputs tables
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS squad_runs (
+                        run_id TEXT PRIMARY KEY,
+                        inputs TEXT,
+                        datetime TEXT
+                    )
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS task_outputs (
+                        run_id TEXT,
+                        task_index INTEGER,
+                        task_description TEXT,
+                        raw_output TEXT,
+                        exported_output TEXT,
+                        datetime TEXT,
+                        PRIMARY KEY (run_id, task_index)
+                    )
+                """
+                )
+
+                conn.commit()
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"JOURNAL ERROR: An error occurred during database initialization: {e}",
+                color="red",
+            )
+
+    def save_run(self, run_id: str, inputs: Optional[Dict[str, Any]]) -> None:
+        """Records the inputs of an execution, keeping the ones of a resumed execution."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                INSERT OR IGNORE INTO squad_runs (run_id, inputs, datetime)
+                VALUES (?, ?, ?)
+            """,
+                    (run_id, json.dumps(inputs or {}), str(time.time())),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"JOURNAL ERROR: An error occurred while saving the run: {e}",
+                color="red",
+            )
+
+    def save_task_output(
+        self,
+        run_id: str,
+        task_index: int,
+        task_description: str,
+        raw_output: str,
+        exported_output: Any,
+    ) -> None:
+        """Records the output of a completed task."""
+        if hasattr(exported_output, "model_dump"):
+            exported_output = exported_output.model_dump()
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                INSERT OR REPLACE INTO task_outputs (run_id, task_index, task_description, raw_output, exported_output, datetime)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                    (
+                        run_id,
+                        task_index,
+                        task_description,
+                        raw_output,
+                        json.dumps(exported_output),
+                        str(time.time()),
+                    ),
+                )
+                conn.commit()
+        except (sqlite3.Error, TypeError) as e:
+            self._printer.print(
+                content=f"JOURNAL ERROR: An error occurred while saving the task output: {e}",
+                color="red",
+            )
+
+    def load_inputs(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Queries the inputs an execution was started with."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT inputs FROM squad_runs WHERE run_id = ?", (run_id,)
+                )
+                row = cursor.fetchone()
+                if row:
+                    return json.loads(row[0])
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"JOURNAL ERROR: An error occurred while querying the run: {e}",
+                color="red",
+            )
+        return None
+
+    def load_task_outputs(self, run_id: str) -> Dict[int, Dict[str, Any]]:
+        """Queries the outputs of the tasks an execution completed, by task index."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT task_index, task_description, raw_output, exported_output
+                    FROM task_outputs
+                    WHERE run_id = ?
+                """,
+                    (run_id,),
+                )
+                return {
+                    row[0]: {
+                        "task_description": row[1],
+                        "raw_output": row[2],
+                        "exported_output": json.loads(row[3]),
+                    }
+                    for row in cursor.fetchall()
+                }
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"JOURNAL ERROR: An error occurred while querying the task outputs: {e}",
+                color="red",
+            )
+        return {}
@@ -0,0 +1,135 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from squadai.task import Task
+
+
+class TaskGraph:
+    """Dependency graph of the tasks of a squad.
+
+    A task depends on the tasks listed in its `context`, or, when it has no
+    explicit context, on the last synchronous task before it, which is the
+    output the sequential process would hand over to it. An empty `context`
+    marks a task as independent from the ones before it.
+
+    Ready tasks are handed out longest expected critical path first, the critical
+    path of a task being its expected duration plus the longest critical path of
+    the tasks waiting on it. Tasks without a known duration are expected to take
+    the average of the known ones, so without any history the tasks keep the order
+    they were defined in.
+
+    Attributes:
+        tasks: Tasks of the squad, in the order they were defined.
+        dependencies: Tasks each task has to wait for before it can start.
+        dependents: Tasks waiting on each task.
+        critical_paths: Expected time from the start of each task to the end of the
+            longest chain of tasks waiting on it.
+    """
+
+    def __init__(
+        self,
+        tasks: List["Task"],
+        expected_durations: Optional[Dict["Task", Optional[float]]] = None,
+    ):
+        self.tasks = tasks
+        self.dependencies: Dict["Task", List["Task"]] = {}
+        self.dependents: Dict["Task", List["Task"]] = {task: [] for task in tasks}
+
+        previous_task: Optional["Task"] = None
+        for task in tasks:
+            if task.context is not None:
+                dependencies = [
+                    context_task
+                    for context_task in task.context
+                    if context_task in tasks
+                ]
+            elif previous_task:
+                dependencies = [previous_task]
+            else:
+                dependencies = []
+
+            self.dependencies[task] = dependencies
+            for dependency in dependencies:
+                self.dependents[dependency].append(task)
+
+            if not task.async_execution:
+                previous_task = task
+
+        self._check_for_cycles()
+        self.critical_paths = self._critical_paths(expected_durations or {})
+
+    def ready(self, completed: Set["Task"], started: Set["Task"]) -> List["Task"]:
+        """Tasks that were not started yet and have all their dependencies completed.
+
+        The tasks with the longest expected critical path come first.
+        """
+        return sorted(
+            [
+                task
+                for task in self.tasks
+                if task not in started
+                and all(
+                    dependency in completed for dependency in self.dependencies[task]
+                )
+            ],
+            key=lambda task: -self.critical_paths[task],
+        )
+
+    def implicit_context(self, task: "Task") -> Optional[str]:
+        """Output handed over to a task that has no explicit context."""
+        if task.context is not None or not self.dependencies[task]:
+            return None
+        output = self.dependencies[task][0].output
+        return output.raw_output if output else None
+
+    def final_task(self) -> "Task":
+        """Task whose output is the output of the squad."""
+        sync_tasks = [task for task in self.tasks if not task.async_execution]
+        return sync_tasks[-1] if sync_tasks else self.tasks[-1]
+
+    def _check_for_cycles(self) -> None:
+        visiting: Set["Task"] = set()
+        visited: Set["Task"] = set()
+
+        def visit(task: "Task") -> None:
+            if task in visited:
+                return
+            if task in visiting:
+                raise ValueError(
+                    f"The task '{task.description}' depends on itself through its context."
+                )
+            visiting.add(task)
+            for dependency in self.dependencies[task]:
+                visit(dependency)
+            visiting.remove(task)
+            visited.add(task)
+
+        for task in self.tasks:
+            visit(task)
+
+    def _critical_paths(
+        self, expected_durations: Dict["Task", Optional[float]]
+    ) -> Dict["Task", float]:
+        known_durations = [
+            duration for duration in expected_durations.values() if duration is not None
+        ]
+        default_duration = (
+            sum(known_durations) / len(known_durations) if known_durations else 0.0
+        )
+
+        critical_paths: Dict["Task", float] = {}
+
+        def critical_path(task: "Task") -> float:
+            if task not in critical_paths:
+                duration = expected_durations.get(task)
+                critical_paths[task] = (
+                    default_duration if duration is None else duration
+                ) + max(
+                    [critical_path(dependent) for dependent in self.dependents[task]],
+                    default=0.0,
+                )
+            return critical_paths[task]
+
+        for task in self.tasks:
+            critical_path(task)
+        return critical_paths
@@ -1,17 +1,45 @@
+import asyncio
+import hashlib
+import json
 import os
 import re
-import threading
+import time
 import uuid
-from typing import Any, Dict, List, Optional, Type
+import warnings
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 from langchain_openai import ChatOpenAI
 from pydantic import UUID4, BaseModel, Field, field_validator, model_validator
 from pydantic_core import PydanticCustomError
 
 from squadai.agent import Agent
+from squadai.squads.events import TaskStartedEvent
+from squadai.tasks.executor_backend import (
+    ExecutorBackend,
+    execute_task_spec,
+    is_delegation_tool,
+    task_spec,
+    wait_for_worker,
+)
+from squadai.tasks.result_cache import TaskResultCache
 from squadai.tasks.task_output import TaskOutput
-from squadai.utilities import I18N, Converter, ConverterError, Printer
+from squadai.utilities import (
+    I18N,
+    CancellationToken,
+    Converter,
+    ConverterError,
+    Printer,
+    SquadCancelledError,
+)
 from squadai.utilities.pydantic_schema_parser import PydanticSchemaParser
+from squadai.utilities.token_counter_callback import TokenProcess
 
 
 class Task(BaseModel):
@@ -31,6 +59,9 @@ class Task(BaseModel):
         output_json: Pydantic model for structuring JSON output.
         output_pydantic: Pydantic model for task output.
         tools: List of tools/resources limited for task execution.
+        hedged_executions: Number of executions of the task racing each other, the first one with a valid output wins.
+        hedge_delay: Seconds to wait for the first execution before starting the redundant ones.
+        hedge_agents: Agents running the redundant executions in turn, defaults to the agent of the task.
     """
 
     class Config:
@@ -41,7 +72,7 @@ class Task(BaseModel):
     tools_errors: int = 0
     delegations: int = 0
     i18n: I18N = I18N()
-    thread: threading.Thread = None
+    future: Optional[Future] = None
     prompt_context: Optional[str] = None
     description: str = Field(description="Description of the actual task.")
     expected_output: str = Field(
@@ -93,9 +124,29 @@ class Task(BaseModel):
         description="Whether the task should have a human review the final answer of the agent",
         default=False,
     )
+    hedged_executions: int = Field(
+        default=1,
+        gt=0,
+        description="Number of executions of the task racing each other, the first one with a valid output wins and the others are cancelled.",
+    )
+    hedge_delay: float = Field(
+        default=0,
+        ge=0,
+        description="Seconds to wait for the first execution before starting the redundant ones.",
+    )
+    hedge_agents: Optional[List[Agent]] = Field(
+        default=None,
+        description="Agents running the redundant executions in turn, defaults to the agent of the task.",
+    )
 
     _original_description: str | None = None
     _original_expected_output: str | None = None
+    _async_execution_task: asyncio.Task | None = None
+    _result_cache: TaskResultCache | None = None
+    _executor_backend: ExecutorBackend = ExecutorBackend.thread
+    _process_pool: ProcessPoolExecutor | None = None
+    _async_executor: ThreadPoolExecutor | None = None
+    _token_process: TokenProcess | None = None
 
     def __init__(__pydantic_self__, **data):
         config = data.pop("config", {})
@@ -149,11 +200,15 @@ class Task(BaseModel):
         agent: Agent | None = None,
         context: Optional[str] = None,
         tools: Optional[List[Any]] = None,
-    ) -> str:
+    ) -> str | Future:
         """Execute the task.
 
+        Asynchronous tasks are submitted to the executor of the squad, bounded by
+        its `max_workers`, and their future is kept in `future`.
+
         Returns:
-            Output of the task.
+            Output of the task, or the future of its execution if the task runs
+            asynchronously.
         """
 
         agent = agent or self.agent
@@ -162,23 +217,14 @@ class Task(BaseModel):
                 f"The task '{self.description}' has no agent assigned, therefore it can't be executed directly and should be executed in a Squad using a specific process that support that, like hierarchical."
             )
 
-        if self.context:
-            context = []
-            for task in self.context:
-                if task.async_execution:
-                    task.thread.join()
-                if task and task.output:
-                    context.append(task.output.raw_output)
-            context = "\n".join(context)
+        context = self._context_output(context, agent._cancellation_token)
 
         self.prompt_context = context
         tools = tools or self.tools
 
-        if self.async_execution:
-            self.thread = threading.Thread(
-                target=self._execute, args=(agent, self, context, tools)
-            )
-            self.thread.start()
+        if self.async_execution and self._executor_backend != ExecutorBackend.inline:
+            self.future = self._submit_async_execution(agent, context, tools)
+            return self.future
         else:
             result = self._execute(
                 task=self,
@@ -188,15 +234,505 @@ class Task(BaseModel):
             )
             return result
 
+    async def aexecute(
+        self,
+        agent: Agent | None = None,
+        context: Optional[str] = None,
+        tools: Optional[List[Any]] = None,
+    ) -> Optional[str]:
+        """Execute the task without blocking the event loop.
+
+        Asynchronous tasks are scheduled on the running event loop and can be
+        awaited through `wait_async_execution`.
+
+        Returns:
+            Output of the task, or None if the task runs asynchronously.
+        """
+
+        agent = agent or self.agent
+        if not agent:
+            raise Exception(
+                f"The task '{self.description}' has no agent assigned, therefore it can't be executed directly and should be executed in a Squad using a specific process that support that, like hierarchical."
+            )
+
+        if self.context:
+            for task in self.context:
+                if task.async_execution:
+                    await task.wait_async_execution()
+        context = self._context_output(context)
+
+        self.prompt_context = context
+        tools = tools or self.tools
+
+        if self.async_execution and self._executor_backend != ExecutorBackend.inline:
+            self._async_execution_task = asyncio.create_task(
+                self._aexecute(agent=agent, context=context, tools=tools)
+            )
+        else:
+            return await self._aexecute(agent=agent, context=context, tools=tools)
+
+    def execute_consensus(
+        self,
+        agents: List[Agent],
+        vote: Callable[[List[str]], str],
+        context: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> str:
+        """Execute the task with several agents at once and combine their answers.
+
+        Args:
+            agents: Agents answering the task in parallel.
+            vote: Function combining the answers of the agents into the final one.
+            context: Context to execute the task in, unless the task sets its own.
+            max_workers: Maximum number of agents answering at the same time.
+
+        Returns:
+            Output of the task.
+        """
+        context = self._context_output(context)
+        self.prompt_context = context
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(agents)) as pool:
+            answers = list(
+                pool.map(
+                    lambda agent: agent.execute_task(
+                        task=self, context=context, tools=self._tools_for(agent)
+                    ),
+                    agents,
+                )
+            )
+
+        result = vote(answers)
+        return self._set_output(result, self._export_output(result))
+
+    async def aexecute_consensus(
+        self,
+        agents: List[Agent],
+        vote: Callable[[List[str]], str],
+        context: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> str:
+        """Async version of `execute_consensus`."""
+        if self.context:
+            for task in self.context:
+                if task.async_execution:
+                    await task.wait_async_execution()
+        context = self._context_output(context)
+        self.prompt_context = context
+
+        semaphore = asyncio.Semaphore(max_workers or len(agents))
+
+        async def answer(agent: Agent) -> str:
+            async with semaphore:
+                return await agent.aexecute_task(
+                    task=self, context=context, tools=self._tools_for(agent)
+                )
+
+        answers = await asyncio.gather(*[answer(agent) for agent in agents])
+
+        result = await asyncio.to_thread(vote, list(answers))
+        exported_output = await asyncio.to_thread(self._export_output, result)
+        return self._set_output(result, exported_output)
+
+    async def wait_async_execution(self) -> None:
+        """Wait for an asynchronous execution of the task to finish."""
+        if self._async_execution_task:
+            await self._async_execution_task
+        elif self.future:
+            await asyncio.wrap_future(self.future)
+
+    def _context_output(
+        self,
+        context: Optional[str],
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> Optional[str]:
+        """Join the outputs of the context tasks, or fall back to the given context."""
+        if not self.context:
+            return context
+
+        context = []
+        for task in self.context:
+            if task.async_execution and task.future:
+                wait_for_worker(task.future, cancellation_token)
+            if task and task.output:
+                context.append(task.output.raw_output)
+        return "\n".join(context)
+
+    def _tools_for(self, agent: Agent) -> List[Any]:
+        """Tools of the task for its own agent, the agent tools for any other one."""
+        return self.tools if agent is self.agent else agent.tools
+
+    def _submit_async_execution(self, agent, context, tools) -> Future:
+        """Run the task in the executor of the squad, or in its own thread outside of one."""
+        if self._async_executor:
+            return self._async_executor.submit(
+                self._execute, agent, self, context, tools
+            )
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            return executor.submit(self._execute, agent, self, context, tools)
+        finally:
+            executor.shutdown(wait=False)
+
     def _execute(self, agent, task, context, tools):
+        cache_key = self._result_cache_key(agent, context, tools)
+        cached_result = self._cached_result(cache_key)
+        if cached_result:
+            return self._set_output(*cached_result)
+
+        started_at = time.monotonic()
+        self._token_process = TokenProcess()
+        if self.hedged_executions > 1:
+            result, exported_output = self._race(agent, context, tools)
+            self._record_execution(agent, started_at)
+            self._save_output_file(exported_output)
+            self._cache_result(cache_key, result, exported_output)
+            return self._set_output(result, exported_output)
+
+        if self._runs_in_worker(agent, tools):
+            future = self._submit_to_worker(
+                agent, task_spec(self, agent, context, tools)
+            )
+            result, exported_output = self._worker_result(
+                agent, wait_for_worker(future, agent._cancellation_token)
+            )
+            self._record_execution(agent, started_at)
+            self._cache_result(cache_key, result, exported_output)
+            return self._set_output(result, exported_output)
+
+        result = self._run(agent, context, tools)
+        self._record_execution(agent, started_at)
+
+        exported_output = self._export_output(result)
+        self._cache_result(cache_key, result, exported_output)
+        return self._set_output(result, exported_output)
+
+    async def _aexecute(self, agent, context, tools):
+        cache_key = self._result_cache_key(agent, context, tools)
+        cached_result = await asyncio.to_thread(self._cached_result, cache_key)
+        if cached_result:
+            return self._set_output(*cached_result)
+
+        started_at = time.monotonic()
+        self._token_process = TokenProcess()
+        if self.hedged_executions > 1:
+            result, exported_output = await self._arace(agent, context, tools)
+            await asyncio.to_thread(self._record_execution, agent, started_at)
+            await asyncio.to_thread(self._save_output_file, exported_output)
+            await asyncio.to_thread(
+                self._cache_result, cache_key, result, exported_output
+            )
+            return self._set_output(result, exported_output)
+
+        if self._runs_in_worker(agent, tools):
+            spec = await asyncio.to_thread(task_spec, self, agent, context, tools)
+            future = self._submit_to_worker(agent, spec)
+            result, exported_output = await asyncio.to_thread(
+                self._worker_result, agent, await asyncio.wrap_future(future)
+            )
+            await asyncio.to_thread(self._record_execution, agent, started_at)
+            await asyncio.to_thread(
+                self._cache_result, cache_key, result, exported_output
+            )
+            return self._set_output(result, exported_output)
+
+        result = await self._arun(agent, context, tools)
+        await asyncio.to_thread(self._record_execution, agent, started_at)
+
+        exported_output = await asyncio.to_thread(self._export_output, result)
+        await asyncio.to_thread(self._cache_result, cache_key, result, exported_output)
+        return self._set_output(result, exported_output)
+
+    def _run(
+        self, agent: Agent, context: Optional[str], tools: Optional[List[Any]]
+    ) -> str:
+        """Have the agent work on the task, returning its raw output."""
+        return agent.execute_task(
+            task=self,
+            context=context,
+            tools=tools,
+        )
+
+    async def _arun(
+        self, agent: Agent, context: Optional[str], tools: Optional[List[Any]]
+    ) -> str:
+        """Async version of `_run`."""
+        return await agent.aexecute_task(
+            task=self,
+            context=context,
+            tools=tools,
+        )
+
+    def _race(self, agent: Agent, context, tools) -> Tuple[str, Any]:
+        """Race redundant executions of the task.
+
+        The first execution starts right away and the others once `hedge_delay`
+        passed without a winner. The first output passing the validation of
+        `output_pydantic` or `output_json` wins and the other executions are
+        cancelled. If none passes it, the first output is used, as it would be
+        by a single execution.
+
+        Returns:
+            Raw and exported output of the winning execution.
+        """
+        racers = self._racers(agent, tools)
+        tokens = [self._racer_token(agent) for _ in racers]
+        pool = ThreadPoolExecutor(max_workers=len(racers))
+        running: Dict[Future, int] = {}
+        outputs: List[Tuple[str, Any]] = []
+        errors: List[Exception] = []
+
+        def start(index: int) -> None:
+            racer, racer_tools = racers[index]
+            future = pool.submit(
+                self._run_racer, racer, context, racer_tools, tokens[index]
+            )
+            running[future] = index
+
+        start(0)
+        deadline = time.monotonic() + self.hedge_delay
+        try:
+            while running:
+                waiting = len(running) + len(outputs) + len(errors) < len(racers)
+                done, _ = wait(
+                    running,
+                    timeout=(max(0, deadline - time.monotonic()) if waiting else None),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    running.pop(future)
+                    try:
+                        output = future.result()
+                    except SquadCancelledError:
+                        raise
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    if self._is_valid_output(output[1]):
+                        return output
+                    outputs.append(output)
+
+                if waiting and (time.monotonic() >= deadline or not running):
+                    for index in range(1, len(racers)):
+                        start(index)
+        finally:
+            for token in tokens:
+                token.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if outputs:
+            return outputs[0]
+        raise errors[0]
+
+    async def _arace(self, agent: Agent, context, tools) -> Tuple[str, Any]:
+        """Async version of `_race`, the losing executions are also cancelled on the event loop."""
+        racers = self._racers(agent, tools)
+        tokens = [self._racer_token(agent) for _ in racers]
+        running: Dict[asyncio.Task, int] = {}
+        outputs: List[Tuple[str, Any]] = []
+        errors: List[Exception] = []
+
+        def start(index: int) -> None:
+            racer, racer_tools = racers[index]
+            task = asyncio.create_task(
+                self._arun_racer(racer, context, racer_tools, tokens[index])
+            )
+            running[task] = index
+
+        start(0)
+        deadline = time.monotonic() + self.hedge_delay
+        try:
+            while running:
+                waiting = len(running) + len(outputs) + len(errors) < len(racers)
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=(max(0, deadline - time.monotonic()) if waiting else None),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    running.pop(task)
+                    try:
+                        output = task.result()
+                    except SquadCancelledError:
+                        raise
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    if self._is_valid_output(output[1]):
+                        return output
+                    outputs.append(output)
+
+                if waiting and (time.monotonic() >= deadline or not running):
+                    for index in range(1, len(racers)):
+                        start(index)
+        finally:
+            for token in tokens:
+                token.cancel()
+            for task in running:
+                task.cancel()
+
+        if outputs:
+            return outputs[0]
+        raise errors[0]
+
+    def _racers(
+        self, agent: Agent, tools: Optional[List[Any]]
+    ) -> List[Tuple[Agent, Optional[List[Any]]]]:
+        """Agents running each execution of a race, with their tools."""
+        hedge_agents = self.hedge_agents or [agent]
+        racers = [(agent, tools)]
+        for index in range(self.hedged_executions - 1):
+            racer = hedge_agents[index % len(hedge_agents)]
+            racers.append((racer, tools if racer is agent else racer.tools))
+        return racers
+
+    def _racer_token(self, agent: Agent) -> CancellationToken:
+        """Token stopping a single execution of a race, or the whole squad execution."""
+        if agent._cancellation_token:
+            return agent._cancellation_token.child()
+        return CancellationToken()
+
+    def _run_racer(
+        self,
+        agent: Agent,
+        context: Optional[str],
+        tools: Optional[List[Any]],
+        cancellation_token: CancellationToken,
+    ) -> Tuple[str, Any]:
         result = agent.execute_task(
-            task=task,
+            task=self,
             context=context,
             tools=tools,
+            cancellation_token=cancellation_token,
         )
+        return result, self._convert_output(result)
 
-        exported_output = self._export_output(result)
+    async def _arun_racer(
+        self,
+        agent: Agent,
+        context: Optional[str],
+        tools: Optional[List[Any]],
+        cancellation_token: CancellationToken,
+    ) -> Tuple[str, Any]:
+        result = await agent.aexecute_task(
+            task=self,
+            context=context,
+            tools=tools,
+            cancellation_token=cancellation_token,
+        )
+        return result, await asyncio.to_thread(self._convert_output, result)
 
+    def _is_valid_output(self, exported_output: Any) -> bool:
+        """Whether the exported output passed the validation of the output model."""
+        if self.output_pydantic:
+            return isinstance(exported_output, self.output_pydantic)
+        if self.output_json:
+            return isinstance(exported_output, dict)
+        return True
+
+    def _runs_in_worker(self, agent: Agent, tools: Optional[List[Any]]) -> bool:
+        """Whether the task is sent to a worker process.
+
+        Tasks with delegation tools need the other agents of the squad, so they keep
+        running in the squad process.
+        """
+        if not self._process_pool:
+            return False
+        if any(is_delegation_tool(tool) for tool in tools or agent.tools):
+            warnings.warn(
+                f"The agent of the task '{self.description}' can delegate work to the other agents, so the task runs in the squad process instead of a worker. Set allow_delegation=False on the agent to run its tasks in the workers."
+            )
+            return False
+        return True
+
+    def _submit_to_worker(self, agent: Agent, spec: bytes) -> Future:
+        if agent.squad:
+            agent.squad._emit(TaskStartedEvent(task=self.description, agent=agent.role))
+        return self._process_pool.submit(execute_task_spec, spec)
+
+    def _worker_result(
+        self, agent: Agent, worker_result: Tuple[str, Any, Dict[str, int]]
+    ) -> Tuple[str, Any]:
+        """Account for the token usage of a worker and save the output file of its result."""
+        result, exported_output, usage = worker_result
+        for token_process in [agent._token_process, self._token_process]:
+            token_process.sum_prompt_tokens(usage["prompt_tokens"])
+            token_process.sum_completion_tokens(usage["completion_tokens"])
+            token_process.sum_successful_requests(usage["successful_requests"])
+
+        self._save_output_file(exported_output)
+        return result, exported_output
+
+    def _record_execution(self, agent: Agent, started_at: float) -> None:
+        """Save the wall time and token usage of the execution to the long term memory
+        of the squad, used to start the longest tasks first."""
+        if not agent.squad or not agent.squad.memory:
+            return
+
+        agent.squad._long_term_memory.save_execution(
+            task=self.description,
+            agent=agent.role,
+            duration=time.monotonic() - started_at,
+            token_usage=self._token_process.get_summary(),
+        )
+
+    def _result_cache_key(
+        self, agent: Agent, context: Optional[str], tools: Optional[List[Any]]
+    ) -> Optional[str]:
+        """Fingerprint of everything the result of the task depends on."""
+        if not self._result_cache:
+            return None
+
+        llm = agent.llm
+        output_model = self.output_pydantic or self.output_json
+        fingerprint = {
+            "prompt": self.prompt(),
+            "context": context,
+            "role": agent.role,
+            "goal": agent.goal,
+            "backstory": agent.backstory,
+            "model": getattr(llm, "model_name", None)
+            or getattr(llm, "model", None)
+            or type(llm).__name__,
+            "tools": sorted(
+                [f"{tool.name}: {tool.description}" for tool in tools or agent.tools]
+            ),
+            "output": output_model.model_json_schema() if output_model else None,
+            "output_json": bool(self.output_json),
+        }
+        return hashlib.sha256(
+            json.dumps(fingerprint, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def _cached_result(self, cache_key: Optional[str]) -> Optional[Tuple[str, Any]]:
+        """Raw and exported output stored for the task, saving its output file again."""
+        if not cache_key:
+            return None
+
+        cached_result = self._result_cache.get(cache_key)
+        if not cached_result:
+            return None
+
+        exported_output = self._restore_exported_output(
+            cached_result["exported_output"]
+        )
+        self._save_output_file(exported_output)
+        return cached_result["raw_output"], exported_output
+
+    def _cache_result(
+        self, cache_key: Optional[str], result: str, exported_output: Any
+    ) -> None:
+        if cache_key:
+            self._result_cache.add(cache_key, result, exported_output)
+
+    def _restore_exported_output(self, exported_output: Any) -> Any:
+        """Rebuild the exported output of the task from its JSON representation."""
+        if self.output_pydantic and isinstance(exported_output, dict):
+            return self.output_pydantic.model_validate(exported_output)
+        return exported_output
+
+    def _set_output(self, result: str, exported_output: Any) -> Any:
         self.output = TaskOutput(
             description=self.description,
             exported_output=exported_output,
@@ -233,6 +769,39 @@ class Task(BaseModel):
             self.description = self._original_description.format(**inputs)
             self.expected_output = self._original_expected_output.format(**inputs)
 
+    def copy(self, agents: Dict[Agent, Agent], tasks: Dict["Task", "Task"]) -> "Task":
+        """Create a copy of the task to run in another squad execution.
+
+        Args:
+            agents: Copies of the agents, by the agent they were copied from.
+            tasks: Copies of the tasks defined before this one, used for its context.
+        """
+        copied_task = self.model_copy(
+            update={
+                "id": uuid.uuid4(),
+                "agent": agents.get(self.agent, self.agent),
+                "context": (
+                    [tasks.get(task, task) for task in self.context]
+                    if self.context is not None
+                    else None
+                ),
+                "tools": list(self.tools),
+                "hedge_agents": (
+                    [agents.get(agent, agent) for agent in self.hedge_agents]
+                    if self.hedge_agents is not None
+                    else None
+                ),
+                "output": None,
+                "future": None,
+                "prompt_context": None,
+                "used_tools": 0,
+                "tools_errors": 0,
+                "delegations": 0,
+            }
+        )
+        copied_task._async_execution_task = None
+        return copied_task
+
     def increment_tools_errors(self) -> None:
         """Increment the tools errors counter."""
         self.tools_errors += 1
@@ -242,6 +811,12 @@ class Task(BaseModel):
         self.delegations += 1
 
     def _export_output(self, result: str) -> Any:
+        exported_result = self._convert_output(result)
+        self._save_output_file(exported_result)
+        return exported_result
+
+    def _convert_output(self, result: str) -> Any:
+        """Convert the raw output to the output model of the task, if any."""
         exported_result = result
         instructions = "I'm gonna convert this raw text into valid JSON."
 
@@ -273,7 +848,12 @@ class Task(BaseModel):
                 instructions = f"{instructions}\n\nThe json should have the following structure, with the following keys:\n{model_schema}"
 
             converter = Converter(
-                llm=llm, text=result, model=model, instructions=instructions
+                llm=llm,
+                text=result,
+                model=model,
+                instructions=instructions,
+                rpm_controller=self.agent._rpm_controller,
+                call_policy=self.agent.call_policy,
             )
 
             if self.output_pydantic:
@@ -288,14 +868,15 @@ class Task(BaseModel):
                 )
                 exported_result = result
 
+        return exported_result
+
+    def _save_output_file(self, exported_result: Any) -> None:
         if self.output_file:
             content = (
                 exported_result if not self.output_pydantic else exported_result.json()
             )
             self._save_file(content)
 
-        return exported_result
-
     def _is_gpt(self, llm) -> bool:
         return isinstance(llm, ChatOpenAI) and llm.openai_api_base == None
 
@@ -0,0 +1,231 @@
+import multiprocessing
+import os
+import pickle
+import threading
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from langchain_core.load import dumpd, load
+
+from squadai.utilities import CancellationToken, RPMController, SharedRPMController
+from squadai.utilities.token_counter_callback import TokenCalcHandler
+
+if TYPE_CHECKING:
+    from squadai.agent import Agent
+    from squadai.task import Task
+
+
+class ExecutorBackend(str, Enum):
+    """
+    Class representing where the tasks of a squad are executed
+    """
+
+    inline = "inline"
+    thread = "thread"
+    process = "process"
+
+
+AGENT_SPEC_FIELDS = {
+    "role",
+    "goal",
+    "backstory",
+    "cache",
+    "verbose",
+    "allow_delegation",
+    "max_iter",
+    "max_execution_time",
+    "call_policy",
+    "system_template",
+    "prompt_template",
+    "response_template",
+}
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+_rpm_controllers: Dict[bytes, SharedRPMController] = {}
+_rpm_controllers_lock = threading.Lock()
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Pool of worker processes shared by every execution with the same size.
+
+    The workers are started once and reused across kickoffs, so they only pay the
+    import cost of the library the first time they run a task.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    with _pools_lock:
+        pool = _pools.get(max_workers)
+        if pool is None or pool._broken:
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pools[max_workers] = pool
+        return pool
+
+
+def is_delegation_tool(tool: Any) -> bool:
+    """Whether the tool delegates work to the other agents of the squad."""
+    from squadai.tools.agent_tools import AgentTools
+
+    func = getattr(tool, "func", None)
+    return isinstance(getattr(func, "__self__", None), AgentTools)
+
+
+def task_spec(
+    task: "Task", agent: "Agent", context: Optional[str], tools: List[Any]
+) -> bytes:
+    """Serialize everything a worker process needs to execute the task."""
+    spec = {
+        "agent": {
+            **agent.model_dump(include=AGENT_SPEC_FIELDS),
+            "i18n": agent.i18n,
+            "llm": _dump_llm(agent.llm),
+            "function_calling_llm": _dump_llm(agent.function_calling_llm),
+        },
+        "task": {
+            "description": task.description,
+            "expected_output": task.expected_output,
+            "output_json": task.output_json,
+            "output_pydantic": task.output_pydantic,
+            "i18n": task.i18n,
+        },
+        "context": context,
+        "tools": tools,
+        "rpm_controller": _dump_rpm_controller(agent._rpm_controller),
+    }
+    try:
+        return pickle.dumps(spec)
+    except Exception as e:
+        raise Exception(
+            f"The task '{task.description}' can't be sent to a worker process, its agent, tools and output models must be picklable: {e}"
+        ) from e
+
+
+def execute_task_spec(spec: bytes) -> Tuple[str, Any, Dict[str, int]]:
+    """Execute a task in a worker process.
+
+    Returns:
+        Raw output, exported output and token usage of the task.
+    """
+    from squadai.agent import Agent
+    from squadai.task import Task
+
+    spec = pickle.loads(spec)
+    agent_spec = spec["agent"]
+    agent = Agent(
+        **{
+            **agent_spec,
+            "llm": _load_llm(agent_spec["llm"]),
+            "function_calling_llm": _load_llm(agent_spec["function_calling_llm"]),
+        },
+        tools=spec["tools"],
+    )
+    rpm_controller = _load_rpm_controller(spec["rpm_controller"], agent._logger)
+    if rpm_controller:
+        agent.set_rpm_controller(rpm_controller)
+    task = Task(**spec["task"], agent=agent, tools=spec["tools"])
+
+    result = agent.execute_task(task=task, context=spec["context"], tools=task.tools)
+    exported_output = task._export_output(result)
+    return result, exported_output, agent._token_process.get_summary()
+
+
+def wait_for_worker(
+    future: Future, cancellation_token: Optional[CancellationToken] = None
+) -> Any:
+    """Wait for the result of a worker, stopping early if the execution is cancelled.
+
+    A task already running in a worker is left to finish, as processes can't be
+    interrupted cooperatively.
+    """
+    while True:
+        try:
+            return future.result(timeout=0.1)
+        except FutureTimeoutError:
+            if cancellation_token and cancellation_token.cancelled:
+                future.cancel()
+                cancellation_token.raise_if_cancelled()
+
+
+def _dump_llm(llm: Any) -> Optional[Tuple[str, Any]]:
+    """Portable representation of a language model.
+
+    LangChain serializable models are sent as their constructor arguments, with the
+    secrets read back from the environment of the worker, any other model is
+    pickled. Token counting handlers are dropped, the worker counts its own usage.
+    """
+    if llm is None:
+        return None
+
+    if getattr(llm, "is_lc_serializable", lambda: False)():
+        return "lc", dumpd(llm)
+
+    if getattr(llm, "callbacks", None):
+        llm = llm.copy(
+            update={
+                "callbacks": [
+                    handler
+                    for handler in llm.callbacks
+                    if not isinstance(handler, TokenCalcHandler)
+                ]
+            }
+        )
+    return "pickle", llm
+
+
+def _dump_rpm_controller(controller: Optional[RPMController]) -> Optional[Tuple]:
+    """Portable representation of a rate limiter.
+
+    Shared limiters are rebuilt in the worker on the same budget, so the requests
+    of every process count against the same limits. Any other limiter can only
+    count the calls of its own process, the worker then gets one of its own.
+    """
+    if controller is None:
+        return None
+
+    config = controller.model_dump(exclude={"logger", "agent_rpm_controller"})
+    if not isinstance(controller, SharedRPMController):
+        if controller.max_rpm or controller.max_tpm:
+            warnings.warn(
+                "The rate limits of the agent aren't shared with the worker processes, each of them keeps to the limits on its own. Set a rate_limit_budget on the squad to share them."
+            )
+        return "local", config, None
+    return "shared", config, _dump_rpm_controller(controller.agent_rpm_controller)
+
+
+def _load_rpm_controller(
+    dumped_controller: Optional[Tuple], logger: Any
+) -> Optional[RPMController]:
+    """Rate limiter of the worker, the shared ones being reused across the
+    tasks of the worker so its calls in flight are counted together."""
+    if dumped_controller is None:
+        return None
+
+    kind, config, agent_controller = dumped_controller
+    if kind == "local":
+        return RPMController(**config, logger=logger)
+    key = pickle.dumps(dumped_controller)
+    with _rpm_controllers_lock:
+        if key not in _rpm_controllers:
+            _rpm_controllers[key] = SharedRPMController(
+                **config,
+                logger=logger,
+                agent_rpm_controller=_load_rpm_controller(agent_controller, logger),
+            )
+        return _rpm_controllers[key]
+
+
+def _load_llm(dumped_llm: Optional[Tuple[str, Any]]) -> Any:
+    if dumped_llm is None:
+        return None
+
+    kind, llm = dumped_llm
+    if kind == "lc":
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return load(llm)
+    return llm
@@ -0,0 +1,177 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from pydantic import Field, model_validator
+from pydantic_core import PydanticCustomError
+
+from squadai.agent import Agent
+from squadai.task import Task
+
+
+class MapReduceTask(Task):
+    """Task working on an input too large to be worked on at once.
+
+    The input is split into shards, the items of a list or the chunks of a
+    document. The agent works on the shards in parallel, each one given as the
+    context of the task, and the reduce agent combines their answers into the
+    output of the task.
+
+    Attributes:
+        map_input: Items to work on, or document to split into chunks, defaults to the context of the task.
+        chunk_size: Maximum number of tokens of each chunk of a document.
+        max_workers: Maximum number of shards worked on at the same time.
+        reduce_agent: Agent combining the answers for the shards, defaults to the agent of the task.
+    """
+
+    map_input: Optional[Union[List[Any], str]] = Field(
+        default=None,
+        description="Items to work on, or document to split into chunks, defaults to the context of the task.",
+    )
+    chunk_size: int = Field(
+        default=2000,
+        gt=0,
+        description="Maximum number of tokens of each chunk of a document.",
+    )
+    max_workers: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of shards worked on at the same time.",
+    )
+    reduce_agent: Optional[Agent] = Field(
+        default=None,
+        description="Agent combining the answers for the shards, defaults to the agent of the task.",
+    )
+
+    @model_validator(mode="after")
+    def check_hedging(self):
+        """Check the task isn't hedged, its executions can't be raced."""
+        if self.hedged_executions > 1:
+            raise PydanticCustomError(
+                "hedged_map_reduce",
+                "Map-reduce tasks can't be hedged.",
+                {},
+            )
+        return self
+
+    def shards(self, context: Optional[str] = None) -> List[str]:
+        """Split the input of the task into the shards the agent works on.
+
+        Args:
+            context: Context of the task, split when the task has no `map_input`.
+        """
+        map_input = self.map_input if self.map_input is not None else context
+        if isinstance(map_input, list):
+            return [str(item) for item in map_input]
+        if not map_input:
+            return []
+
+        splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            chunk_size=self.chunk_size, chunk_overlap=0
+        )
+        return splitter.split_text(map_input)
+
+    def copy(self, agents: Dict[Agent, Agent], tasks: Dict[Task, Task]) -> Task:
+        copied_task = super().copy(agents, tasks)
+        copied_task.reduce_agent = agents.get(self.reduce_agent, self.reduce_agent)
+        return copied_task
+
+    def _run(
+        self, agent: Agent, context: Optional[str], tools: Optional[List[Any]]
+    ) -> str:
+        shards = self.shards(context)
+        if len(shards) <= 1:
+            return super()._run(agent, self._shard_context(shards, context), tools)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(shards)) as pool:
+            answers = list(
+                pool.map(
+                    lambda shard: agent.execute_task(
+                        task=self,
+                        context=self._shard_context([shard], context),
+                        tools=tools,
+                    ),
+                    shards,
+                )
+            )
+
+        reduce_agent = self.reduce_agent or agent
+        return reduce_agent.execute_task(self._reduce_task(reduce_agent, answers))
+
+    async def _arun(
+        self, agent: Agent, context: Optional[str], tools: Optional[List[Any]]
+    ) -> str:
+        shards = await asyncio.to_thread(self.shards, context)
+        if len(shards) <= 1:
+            return await super()._arun(
+                agent, self._shard_context(shards, context), tools
+            )
+
+        semaphore = asyncio.Semaphore(self.max_workers or len(shards))
+
+        async def answer(shard: str) -> str:
+            async with semaphore:
+                return await agent.aexecute_task(
+                    task=self,
+                    context=self._shard_context([shard], context),
+                    tools=tools,
+                )
+
+        answers = await asyncio.gather(*[answer(shard) for shard in shards])
+
+        reduce_agent = self.reduce_agent or agent
+        return await reduce_agent.aexecute_task(
+            self._reduce_task(reduce_agent, list(answers))
+        )
+
+    def _shard_context(
+        self, shards: List[str], context: Optional[str]
+    ) -> Optional[str]:
+        """Context the agent works on a shard in, along with the context of the task
+        when the shards come from `map_input`."""
+        if not shards:
+            return context
+        if self.map_input is not None and context:
+            return f"{context}\n\n{shards[0]}"
+        return shards[0]
+
+    def _reduce_task(self, reduce_agent: Agent, answers: List[str]) -> Task:
+        return Task(
+            description=reduce_agent.i18n.slice("map_reduce").format(
+                task=self.description,
+                answers="\n\n".join(
+                    [
+                        f"Part {index}: {answer}"
+                        for index, answer in enumerate(answers, start=1)
+                    ]
+                ),
+            ),
+            expected_output=self.expected_output,
+            agent=reduce_agent,
+        )
+
+    def _runs_in_worker(self, agent: Agent, tools: Optional[List[Any]]) -> bool:
+        """Shards are worked on in threads of the squad process."""
+        return False
+
+    def _result_cache_key(
+        self, agent: Agent, context: Optional[str], tools: Optional[List[Any]]
+    ) -> Optional[str]:
+        """Fingerprint of the task, including its input and reduce agent."""
+        return super()._result_cache_key(
+            agent,
+            json.dumps(
+                {
+                    "context": context,
+                    "map_input": self.map_input,
+                    "chunk_size": self.chunk_size,
+                    "reduce_agent": (
+                        self.reduce_agent.role if self.reduce_agent else None
+                    ),
+                },
+                default=str,
+            ),
+            tools,
+        )
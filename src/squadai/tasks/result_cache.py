@@ -0,0 +1,112 @@
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from squadai.utilities import Printer
+from squadai.utilities.paths import db_storage_path
+
+
+class TaskResultCache:
+    """
+    SQLite cache of task results, keyed by the fingerprint of everything the result
+    depends on, evicting the least recently used results past its maximum size.
+    """
+
+    def __init__(
+        self,
+        db_path=f"{db_storage_path()}/task_result_cache.db",
+        max_size: int = 100 * 1024 * 1024,
+    ):
+        self.db_path = db_path
+        self.max_size = max_size
+        self._printer: Printer = Printer()
+        self._initialize_db()
+
+    def _initialize_db(self):
+        """
+        Initializes the SQLite database and creates the task results table
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS task_results (
+                        key TEXT PRIMARY KEY,
+                        raw_output TEXT,
+                        exported_output TEXT,
+                        size INTEGER,
+                        last_used REAL
+                    )
+                """
+                )
+
+                conn.commit()
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"CACHE ERROR: An error occurred during database initialization: {e}",
+                color="red",
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Queries the result stored for a key, marking it as recently used."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT raw_output, exported_output FROM task_results WHERE key = ?",
+                    (key,),
+                )
+                row = cursor.fetchone()
+                if row:
+                    cursor.execute(
+                        "UPDATE task_results SET last_used = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+                    conn.commit()
+                    return {
+                        "raw_output": row[0],
+                        "exported_output": json.loads(row[1]),
+                    }
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"CACHE ERROR: An error occurred while querying a task result: {e}",
+                color="red",
+            )
+        return None
+
+    def add(self, key: str, raw_output: str, exported_output: Any) -> None:
+        """Stores the result of a task, then evicts results past the maximum size."""
+        if hasattr(exported_output, "model_dump"):
+            exported_output = exported_output.model_dump()
+
+        try:
+            exported_output = json.dumps(exported_output)
+            size = len(raw_output.encode()) + len(exported_output.encode())
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                INSERT OR REPLACE INTO task_results (key, raw_output, exported_output, size, last_used)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                    (key, raw_output, exported_output, size, time.time()),
+                )
+                self._evict(cursor)
+                conn.commit()
+        except (sqlite3.Error, TypeError) as e:
+            self._printer.print(
+                content=f"CACHE ERROR: An error occurred while saving a task result: {e}",
+                color="red",
+            )
+
+    def _evict(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("SELECT key, size FROM task_results ORDER BY last_used DESC")
+        total_size = 0
+        evicted = []
+        for key, size in cursor.fetchall():
+            total_size += size
+            if total_size > self.max_size:
+                evicted.append((key,))
+        cursor.executemany("DELETE FROM task_results WHERE key = ?", evicted)
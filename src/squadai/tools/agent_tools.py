@@ -1,9 +1,16 @@
-from typing import List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from langchain.tools import StructuredTool
 from pydantic import BaseModel, Field
 
 from squadai.agent import Agent
+from squadai.agents.replicas import (
+    aacquire_replica,
+    acquire_replica,
+    release_replica,
+)
 from squadai.task import Task
 from squadai.utilities import I18N
 
@@ -13,11 +20,21 @@ class AgentTools(BaseModel):
 
     agents: List[Agent] = Field(description="List of agents in this squad.")
     i18n: I18N = Field(default=I18N(), description="Internationalization settings.")
+    parallel_delegation: bool = Field(
+        default=False,
+        description="Whether to include the tool delegating several tasks at once.",
+    )
+    max_parallel_delegations: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of delegations of a parallel delegation running at the same time, defaults to the number of agents.",
+    )
 
     def tools(self):
         tools = [
             StructuredTool.from_function(
                 func=self.delegate_work,
+                coroutine=self.adelegate_work,
                 name="Delegate work to co-worker",
                 description=self.i18n.tools("delegate_work").format(
                     coworkers=f"[{', '.join([f'{agent.role}' for agent in self.agents])}]"
@@ -25,12 +42,24 @@ class AgentTools(BaseModel):
             ),
             StructuredTool.from_function(
                 func=self.ask_question,
+                coroutine=self.aask_question,
                 name="Ask question to co-worker",
                 description=self.i18n.tools("ask_question").format(
                     coworkers=f"[{', '.join([f'{agent.role}' for agent in self.agents])}]"
                 ),
             ),
         ]
+        if self.parallel_delegation:
+            tools.append(
+                StructuredTool.from_function(
+                    func=self.delegate_work_in_parallel,
+                    coroutine=self.adelegate_work_in_parallel,
+                    name="Delegate work to co-workers in parallel",
+                    description=self.i18n.tools("delegate_work_in_parallel").format(
+                        coworkers=f"[{', '.join([f'{agent.role}' for agent in self.agents])}]"
+                    ),
+                )
+            )
         return tools
 
     def delegate_work(self, coworker: str, task: str, context: str):
@@ -41,8 +70,103 @@ class AgentTools(BaseModel):
         """Useful to ask a question, opinion or take from a co-worker passing all necessary context and names."""
         return self._execute(coworker, question, context)
 
+    async def adelegate_work(self, coworker: str, task: str, context: str):
+        """Useful to delegate a specific task to a co-worker passing all necessary context and names."""
+        return await self._aexecute(coworker, task, context)
+
+    async def aask_question(self, coworker: str, question: str, context: str):
+        """Useful to ask a question, opinion or take from a co-worker passing all necessary context and names."""
+        return await self._aexecute(coworker, question, context)
+
+    def delegate_work_in_parallel(self, delegations: List[Dict[str, str]]):
+        """Useful to delegate several independent tasks at once, each with its co-worker and all necessary context."""
+        if not delegations:
+            return self.i18n.errors("agent_tool_invalid_delegation")
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(delegations), self._max_parallel_delegations())
+        ) as executor:
+            results = list(executor.map(self._delegate, delegations))
+        return "\n\n".join(results)
+
+    async def adelegate_work_in_parallel(self, delegations: List[Dict[str, str]]):
+        """Useful to delegate several independent tasks at once, each with its co-worker and all necessary context."""
+        if not delegations:
+            return self.i18n.errors("agent_tool_invalid_delegation")
+
+        semaphore = asyncio.Semaphore(self._max_parallel_delegations())
+
+        async def delegate(delegation):
+            async with semaphore:
+                return await self._adelegate(delegation)
+
+        results = await asyncio.gather(
+            *[delegate(delegation) for delegation in delegations]
+        )
+        return "\n\n".join(results)
+
+    def _max_parallel_delegations(self) -> int:
+        return self.max_parallel_delegations or max(len(self.agents), 1)
+
+    def _delegate(self, delegation):
+        """Execute one of the delegations of a parallel delegation, labelling its result."""
+        if not isinstance(delegation, dict):
+            return self.i18n.errors("agent_tool_invalid_delegation")
+
+        result = self._execute(
+            delegation.get("coworker", ""),
+            delegation.get("task", ""),
+            delegation.get("context", ""),
+        )
+        return self._delegation_result(delegation, result)
+
+    async def _adelegate(self, delegation):
+        """Async version of `_delegate`."""
+        if not isinstance(delegation, dict):
+            return self.i18n.errors("agent_tool_invalid_delegation")
+
+        result = await self._aexecute(
+            delegation.get("coworker", ""),
+            delegation.get("task", ""),
+            delegation.get("context", ""),
+        )
+        return self._delegation_result(delegation, result)
+
+    def _delegation_result(self, delegation, result):
+        return self.i18n.slice("delegation_result").format(
+            coworker=delegation.get("coworker", ""),
+            task=delegation.get("task", ""),
+            result=result,
+        )
+
     def _execute(self, agent, task, context):
-        """Execute the command."""
+        """Execute the command on a free replica of the co-worker."""
+        coworkers = self._coworkers(agent)
+        if isinstance(coworkers, str):
+            return coworkers
+
+        coworker = acquire_replica(coworkers, coworkers[0]._cancellation_token)
+        try:
+            return coworker.execute_task(self._coworker_task(coworker, task), context)
+        finally:
+            release_replica(coworker)
+
+    async def _aexecute(self, agent, task, context):
+        """Execute the command without blocking the event loop."""
+        coworkers = self._coworkers(agent)
+        if isinstance(coworkers, str):
+            return coworkers
+
+        coworker = await aacquire_replica(coworkers, coworkers[0]._cancellation_token)
+        try:
+            return await coworker.aexecute_task(
+                self._coworker_task(coworker, task), context
+            )
+        finally:
+            release_replica(coworker)
+
+    def _coworkers(self, agent):
+        """Find the co-workers with the role, or the error message when there is none."""
         try:
             agent = [
                 available_agent
@@ -63,10 +187,11 @@ class AgentTools(BaseModel):
                 )
             )
 
-        agent = agent[0]
-        task = Task(
+        return agent
+
+    def _coworker_task(self, agent, task):
+        return Task(
             description=task,
             agent=agent,
             expected_output="Your best answer to your co-worker asking you this, accounting for the context shared.",
         )
-        return agent.execute_task(task, context)
@@ -1,15 +1,24 @@
 import ast
+import asyncio
 from difflib import SequenceMatcher
 from textwrap import dedent
-from typing import Any, List, Union
+from typing import Any, List, Optional, Union
 
-from langchain_core.tools import BaseTool
+from langchain_core.tools import BaseTool, StructuredTool, Tool
 from langchain_openai import ChatOpenAI
 
 from squadai.agents.tools_handler import ToolsHandler
 from squadai.telemetry import Telemetry
 from squadai.tools.tool_calling import InstructorToolCalling, ToolCalling
-from squadai.utilities import I18N, Converter, ConverterError, Printer
+from squadai.utilities import (
+    I18N,
+    CallPolicy,
+    CancellationToken,
+    Converter,
+    ConverterError,
+    Printer,
+    SquadCancelledError,
+)
 
 OPENAI_BIGGER_MODELS = ["gpt-4"]
 
@@ -34,6 +43,9 @@ class ToolUsage:
       tools_description: Description of the tools available for the agent.
       tools_names: Names of the tools available for the agent.
       function_calling_llm: Language model to be used for the tool usage.
+      cancellation_token: Token stopping the tool usage once the squad execution is cancelled.
+      rpm_controller: Controller of the rate and in-flight limits the tool calling respects.
+      call_policy: Retries, backoff, timeout and hedging of the tool calling.
     """
 
     def __init__(
@@ -46,6 +58,9 @@ class ToolUsage:
         task: Any,
         function_calling_llm: Any,
         action: Any,
+        cancellation_token: Optional[CancellationToken] = None,
+        rpm_controller: Any = None,
+        call_policy: Optional[CallPolicy] = None,
     ) -> None:
         self._i18n: I18N = I18N()
         self._printer: Printer = Printer()
@@ -61,6 +76,9 @@ class ToolUsage:
         self.task = task
         self.action = action
         self.function_calling_llm = function_calling_llm
+        self.cancellation_token = cancellation_token
+        self.rpm_controller = rpm_controller
+        self.call_policy = call_policy or CallPolicy()
 
         # Set the maximum parsing attempts for bigger models
         if (isinstance(self.function_calling_llm, ChatOpenAI)) and (
@@ -77,19 +95,37 @@ class ToolUsage:
     def use(
         self, calling: Union[ToolCalling, InstructorToolCalling], tool_string: str
     ) -> str:
+        tool = self._tool_for_calling(calling)
+        if isinstance(tool, str):
+            return tool
+        return f"{self._use(tool_string=tool_string, tool=tool, calling=calling)}"
+
+    async def ause(
+        self, calling: Union[ToolCalling, InstructorToolCalling], tool_string: str
+    ) -> str:
+        tool = self._tool_for_calling(calling)
+        if isinstance(tool, str):
+            return tool
+        return (
+            f"{await self._ause(tool_string=tool_string, tool=tool, calling=calling)}"
+        )
+
+    def _tool_for_calling(
+        self, calling: Union[ToolCalling, InstructorToolCalling]
+    ) -> Union[BaseTool, str]:
+        """Select the tool of the calling, or return the error to be observed."""
         if isinstance(calling, ToolUsageErrorException):
             error = calling.message
             self._printer.print(content=f"\n\n{error}\n", color="red")
             self.task.increment_tools_errors()
             return error
         try:
-            tool = self._select_tool(calling.tool_name)
+            return self._select_tool(calling.tool_name)
         except Exception as e:
             error = getattr(e, "message", str(e))
             self.task.increment_tools_errors()
             self._printer.print(content=f"\n\n{error}\n", color="red")
             return error
-        return f"{self._use(tool_string=tool_string, tool=tool, calling=calling)}"
 
     def _use(
         self,
@@ -97,96 +133,177 @@ class ToolUsage:
         tool: BaseTool,
         calling: Union[ToolCalling, InstructorToolCalling],
     ) -> None:
+        if self.cancellation_token:
+            self.cancellation_token.raise_if_cancelled()
+
         if self._check_tool_repeated_usage(calling=calling):
             try:
-                result = self._i18n.errors("task_repeated_usage").format(
-                    tool_names=self.tools_names
-                )
-                self._printer.print(content=f"\n\n{result}\n", color="purple")
-                self._telemetry.tool_repeated_usage(
-                    llm=self.function_calling_llm,
-                    tool_name=tool.name,
-                    attempts=self._run_attempts,
-                )
-                result = self._format_result(result=result)
-                return result
+                return self._repeated_usage_result(tool)
             except Exception:
                 self.task.increment_tools_errors()
 
-        result = None
+        result = self._read_cache(calling)
+
+        if not result:
+            try:
+                result = self._run_tool(tool, calling)
+            except Exception as e:
+                error = self._tool_error(e, tool)
+                if error is not None:
+                    return error
+                return self.use(calling=calling, tool_string=tool_string)
+
+            self._on_tool_use(tool, calling, result)
+
+        return self._tool_result(tool, result)
+
+    async def _ause(
+        self,
+        tool_string: str,
+        tool: BaseTool,
+        calling: Union[ToolCalling, InstructorToolCalling],
+    ) -> None:
+        if self.cancellation_token:
+            self.cancellation_token.raise_if_cancelled()
 
+        if self._check_tool_repeated_usage(calling=calling):
+            try:
+                return self._repeated_usage_result(tool)
+            except Exception:
+                self.task.increment_tools_errors()
+
+        result = self._read_cache(calling)
+
+        if not result:
+            try:
+                result = await self._arun_tool(tool, calling)
+            except Exception as e:
+                error = self._tool_error(e, tool)
+                if error is not None:
+                    return error
+                return await self.ause(calling=calling, tool_string=tool_string)
+
+            self._on_tool_use(tool, calling, result)
+
+        return self._tool_result(tool, result)
+
+    def _repeated_usage_result(self, tool: BaseTool) -> str:
+        result = self._i18n.errors("task_repeated_usage").format(
+            tool_names=self.tools_names
+        )
+        self._printer.print(content=f"\n\n{result}\n", color="purple")
+        self._telemetry.tool_repeated_usage(
+            llm=self.function_calling_llm,
+            tool_name=tool.name,
+            attempts=self._run_attempts,
+        )
+        return self._format_result(result=result)
+
+    def _read_cache(self, calling: Union[ToolCalling, InstructorToolCalling]) -> Any:
         if self.tools_handler.cache:
-            result = self.tools_handler.cache.read(
+            return self.tools_handler.cache.read(
                 tool=calling.tool_name, input=calling.arguments
             )
+        return None
 
-        if not result:
+    def _run_tool(
+        self, tool: BaseTool, calling: Union[ToolCalling, InstructorToolCalling]
+    ) -> Any:
+        self._count_delegation(calling)
+        if calling.arguments:
             try:
-                if calling.tool_name in [
-                    "Delegate work to co-worker",
-                    "Ask question to co-worker",
-                ]:
-                    self.task.increment_delegations()
-
-                if calling.arguments:
-                    try:
-                        acceptable_args = tool.args_schema.schema()["properties"].keys()
-                        arguments = {
-                            k: v
-                            for k, v in calling.arguments.items()
-                            if k in acceptable_args
-                        }
-                        result = tool._run(**arguments)
-                    except Exception:
-                        if tool.args_schema:
-                            arguments = calling.arguments
-                            result = tool._run(**arguments)
-                        else:
-                            arguments = calling.arguments.values()
-                            result = tool._run(*arguments)
+                return tool._run(**self._acceptable_arguments(tool, calling))
+            except Exception:
+                if tool.args_schema:
+                    return tool._run(**calling.arguments)
                 else:
-                    result = tool._run()
-            except Exception as e:
-                self._run_attempts += 1
-                if self._run_attempts > self._max_parsing_attempts:
-                    self._telemetry.tool_usage_error(llm=self.function_calling_llm)
-                    error_message = self._i18n.errors("tool_usage_exception").format(
-                        error=e, tool=tool.name, tool_inputs=tool.description
-                    )
-                    error = ToolUsageErrorException(
-                        f'\n{error_message}.\nMoving on then. {self._i18n.slice("format").format(tool_names=self.tools_names)}'
-                    ).message
-                    self.task.increment_tools_errors()
-                    self._printer.print(content=f"\n\n{error_message}\n", color="red")
-                    return error
-                self.task.increment_tools_errors()
-                return self.use(calling=calling, tool_string=tool_string)
+                    return tool._run(*calling.arguments.values())
+        return tool._run()
+
+    async def _arun_tool(
+        self, tool: BaseTool, calling: Union[ToolCalling, InstructorToolCalling]
+    ) -> Any:
+        """Await the tool when it is natively async, otherwise run it in a thread."""
+        if not self._is_async_tool(tool):
+            return await asyncio.to_thread(self._run_tool, tool, calling)
+
+        self._count_delegation(calling)
+        if calling.arguments:
+            try:
+                return await tool._arun(**self._acceptable_arguments(tool, calling))
+            except Exception:
+                if tool.args_schema:
+                    return await tool._arun(**calling.arguments)
+                else:
+                    return await tool._arun(*calling.arguments.values())
+        return await tool._arun()
 
-            if self.tools_handler:
-                should_cache = True
-                original_tool = next(
-                    (ot for ot in self.original_tools if ot.name == tool.name), None
-                )
-                if (
-                    hasattr(original_tool, "cache_function")
-                    and original_tool.cache_function
-                ):
-                    should_cache = original_tool.cache_function(
-                        calling.arguments, result
-                    )
-
-                self.tools_handler.on_tool_use(
-                    calling=calling, output=result, should_cache=should_cache
-                )
+    def _is_async_tool(self, tool: BaseTool) -> bool:
+        if isinstance(tool, (StructuredTool, Tool)):
+            return tool.coroutine is not None
+        return type(tool)._arun is not BaseTool._arun
+
+    def _count_delegation(
+        self, calling: Union[ToolCalling, InstructorToolCalling]
+    ) -> None:
+        if calling.tool_name in [
+            "Delegate work to co-worker",
+            "Ask question to co-worker",
+        ]:
+            self.task.increment_delegations()
+
+    def _acceptable_arguments(
+        self, tool: BaseTool, calling: Union[ToolCalling, InstructorToolCalling]
+    ) -> dict:
+        acceptable_args = tool.args_schema.schema()["properties"].keys()
+        return {k: v for k, v in calling.arguments.items() if k in acceptable_args}
+
+    def _tool_error(self, e: Exception, tool: BaseTool) -> Optional[str]:
+        """Count a failed tool run, returning the error once attempts are exhausted."""
+        self._run_attempts += 1
+        if self._run_attempts > self._max_parsing_attempts:
+            self._telemetry.tool_usage_error(llm=self.function_calling_llm)
+            error_message = self._i18n.errors("tool_usage_exception").format(
+                error=e, tool=tool.name, tool_inputs=tool.description
+            )
+            error = ToolUsageErrorException(
+                f'\n{error_message}.\nMoving on then. {self._i18n.slice("format").format(tool_names=self.tools_names)}'
+            ).message
+            self.task.increment_tools_errors()
+            self._printer.print(content=f"\n\n{error_message}\n", color="red")
+            return error
+        self.task.increment_tools_errors()
+        return None
+
+    def _on_tool_use(
+        self,
+        tool: BaseTool,
+        calling: Union[ToolCalling, InstructorToolCalling],
+        result: Any,
+    ) -> None:
+        if self.tools_handler:
+            should_cache = True
+            original_tool = next(
+                (ot for ot in self.original_tools if ot.name == tool.name), None
+            )
+            if (
+                hasattr(original_tool, "cache_function")
+                and original_tool.cache_function
+            ):
+                should_cache = original_tool.cache_function(calling.arguments, result)
+
+            self.tools_handler.on_tool_use(
+                calling=calling, output=result, should_cache=should_cache
+            )
 
+    def _tool_result(self, tool: BaseTool, result: Any) -> str:
         self._printer.print(content=f"\n\n{result}\n", color="purple")
         self._telemetry.tool_usage(
             llm=self.function_calling_llm,
             tool_name=tool.name,
             attempts=self._run_attempts,
         )
-        result = self._format_result(result=result)
-        return result
+        return self._format_result(result=result)
 
     def _format_result(self, result: Any) -> None:
         self.task.used_tools += 1
@@ -258,62 +375,86 @@ class ToolUsage:
 
     def _tool_calling(
         self, tool_string: str
-    ) -> Union[ToolCalling, InstructorToolCalling]:
+    ) -> Union[ToolCalling, InstructorToolCalling, ToolUsageErrorException]:
+        def attempt():
+            try:
+                return self._parse_tool_calling(tool_string)
+            except Exception:
+                self._run_attempts += 1
+                raise
+
+        # Parsing the agent's own output doesn't call a model, so it is retried
+        # without waiting.
+        call_policy = (
+            self.call_policy if self.function_calling_llm else CallPolicy(backoff=0)
+        )
         try:
-            if self.function_calling_llm:
-                model = (
-                    InstructorToolCalling
-                    if self._is_gpt(self.function_calling_llm)
-                    else ToolCalling
-                )
-                converter = Converter(
-                    text=f"Only tools available:\n###\n{self._render()}\n\nReturn a valid schema for the tool, the tool name must be exactly equal one of the options, use this text to inform the valid output schema:\n\n{tool_string}```",
-                    llm=self.function_calling_llm,
-                    model=model,
-                    instructions=dedent(
-                        """\
-              The schema should have the following structure, only two keys:
-              - tool_name: str
-              - arguments: dict (with all arguments being passed)
-
-              Example:
-              {"tool_name": "tool name", "arguments": {"arg_name1": "value", "arg_name2": 2}}""",
-                    ),
-                    max_attemps=1,
-                )
-                calling = converter.to_pydantic()
-
-                if isinstance(calling, ConverterError):
-                    raise calling
-            else:
-                tool_name = self.action.tool
-                tool = self._select_tool(tool_name)
-                try:
-                    tool_input = self._validate_tool_input(self.action.tool_input)
-                    arguments = ast.literal_eval(tool_input)
-                except Exception:
-                    return ToolUsageErrorException(
-                        f'{self._i18n.errors("tool_arguments_error")}'
-                    )
-                if not isinstance(arguments, dict):
-                    return ToolUsageErrorException(
-                        f'{self._i18n.errors("tool_arguments_error")}'
-                    )
-                calling = ToolCalling(
-                    tool_name=tool.name,
-                    arguments=arguments,
-                    log=tool_string,
-                )
+            return call_policy.call(
+                attempt,
+                cancellation_token=self.cancellation_token,
+                retry_if=lambda e: True,
+                max_retries=max(self._max_parsing_attempts - self._run_attempts, 0),
+                kind="tool_calling",
+            )
+        except SquadCancelledError:
+            raise
         except Exception as e:
-            self._run_attempts += 1
-            if self._run_attempts > self._max_parsing_attempts:
-                self._telemetry.tool_usage_error(llm=self.function_calling_llm)
-                self.task.increment_tools_errors()
-                self._printer.print(content=f"\n\n{e}\n", color="red")
+            self._telemetry.tool_usage_error(llm=self.function_calling_llm)
+            self.task.increment_tools_errors()
+            self._printer.print(content=f"\n\n{e}\n", color="red")
+            return ToolUsageErrorException(
+                f'{self._i18n.errors("tool_usage_error").format(error=e)}\nMoving on then. {self._i18n.slice("format").format(tool_names=self.tools_names)}'
+            )
+
+    def _parse_tool_calling(
+        self, tool_string: str
+    ) -> Union[ToolCalling, InstructorToolCalling, ToolUsageErrorException]:
+        if self.function_calling_llm:
+            model = (
+                InstructorToolCalling
+                if self._is_gpt(self.function_calling_llm)
+                else ToolCalling
+            )
+            converter = Converter(
+                text=f"Only tools available:\n###\n{self._render()}\n\nReturn a valid schema for the tool, the tool name must be exactly equal one of the options, use this text to inform the valid output schema:\n\n{tool_string}```",
+                llm=self.function_calling_llm,
+                model=model,
+                instructions=dedent(
+                    """\
+          The schema should have the following structure, only two keys:
+          - tool_name: str
+          - arguments: dict (with all arguments being passed)
+
+          Example:
+          {"tool_name": "tool name", "arguments": {"arg_name1": "value", "arg_name2": 2}}""",
+                ),
+                # Retried, timed out and hedged by the policy of the tool calling.
+                max_attemps=1,
+                rpm_controller=self.rpm_controller,
+            )
+            calling = converter.to_pydantic()
+
+            if isinstance(calling, ConverterError):
+                raise calling
+        else:
+            tool_name = self.action.tool
+            tool = self._select_tool(tool_name)
+            try:
+                tool_input = self._validate_tool_input(self.action.tool_input)
+                arguments = ast.literal_eval(tool_input)
+            except Exception:
                 return ToolUsageErrorException(
-                    f'{self._i18n.errors("tool_usage_error").format(error=e)}\nMoving on then. {self._i18n.slice("format").format(tool_names=self.tools_names)}'
+                    f'{self._i18n.errors("tool_arguments_error")}'
                 )
-            return self._tool_calling(tool_string)
+            if not isinstance(arguments, dict):
+                return ToolUsageErrorException(
+                    f'{self._i18n.errors("tool_arguments_error")}'
+                )
+            calling = ToolCalling(
+                tool_name=tool.name,
+                arguments=arguments,
+                log=tool_string,
+            )
 
         return calling
 
@@ -1,3 +1,5 @@
+from .call_policy import CallPolicy
+from .cancellation import CancellationToken, SquadCancelledError
 from .converter import Converter, ConverterError
 from .i18n import I18N
 from .instructor import Instructor
@@ -5,5 +7,6 @@ from .logger import Logger
 from .printer import Printer
 from .prompts import Prompts
 from .rpm_controller import RPMController
+from .shared_rpm_controller import SharedRPMController
 from .fileHandler import FileHandler
 from .parser import YamlParser
@@ -0,0 +1,280 @@
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from squadai.utilities.cancellation import CancellationToken, SquadCancelledError
+from squadai.utilities.rpm_controller import is_rate_limit_error
+
+
+class CallPolicy(BaseModel):
+    """Policy of the LLM calls: retries with exponential backoff and jitter, a
+    timeout per call, and hedged requests.
+
+    A hedged call sends a second identical request once the first one has been
+    running for longer than the given percentile of the latency of the last
+    calls of the same kind, and takes the first response. Calls timing out or hedged run in a
+    thread: a synchronous request left behind can't be interrupted, it runs to
+    completion and its response is dropped.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    max_retries: int = Field(
+        default=0,
+        ge=0,
+        description="Number of times a failed call is retried, on top of the retries of the model client.",
+    )
+    backoff: float = Field(
+        default=0.5,
+        ge=0,
+        description="Delay before the first retry, in seconds, doubled at each retry.",
+    )
+    max_backoff: float = Field(
+        default=30, ge=0, description="Maximum delay before a retry, in seconds."
+    )
+    jitter: bool = Field(
+        default=True,
+        description="Whether the delay is drawn at random up to the backoff, so the retries of concurrent calls spread out.",
+    )
+    timeout: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Time a call is given before failing with a TimeoutError, in seconds.",
+    )
+    hedge_percentile: Optional[float] = Field(
+        default=None,
+        gt=0,
+        lt=100,
+        description="Percentile of the latency of the last calls after which a second identical request is sent.",
+    )
+    hedge_min_samples: int = Field(
+        default=20,
+        ge=1,
+        description="Number of calls whose latency is known before requests are hedged.",
+    )
+    _latencies: Dict[str, Deque[float]] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        cancellation_token: Optional[CancellationToken] = None,
+        retry_if: Optional[Callable[[Exception], bool]] = None,
+        max_retries: Optional[int] = None,
+        kind: str = "call",
+    ) -> Any:
+        """Call `fn` following the policy.
+
+        Args:
+            fn: Function making the call, called again for each retry or hedge.
+            cancellation_token: Token to stop retrying or waiting for the call,
+                which then raises a `SquadCancelledError`.
+            retry_if: Whether a call failing with the error is retried, defaults
+                to `is_transient_error`.
+            max_retries: Number of retries, defaults to the one of the policy.
+            kind: Kind of call, whose latencies are the ones it is hedged on.
+
+        Returns:
+            Result of the first call to succeed.
+        """
+        retry_if = retry_if or is_transient_error
+        max_retries = self.max_retries if max_retries is None else max_retries
+        retries = 0
+        while True:
+            try:
+                return self._attempt(fn, cancellation_token, kind)
+            except SquadCancelledError:
+                raise
+            except Exception as e:
+                if retries >= max_retries or not retry_if(e):
+                    raise
+            delay = self.delay(retries)
+            if cancellation_token:
+                cancellation_token.sleep(delay)
+            else:
+                time.sleep(delay)
+            retries += 1
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        cancellation_token: Optional[CancellationToken] = None,
+        retry_if: Optional[Callable[[Exception], bool]] = None,
+        max_retries: Optional[int] = None,
+        kind: str = "call",
+    ) -> Any:
+        """Async version of `call`, where the requests left behind are cancelled."""
+        retry_if = retry_if or is_transient_error
+        max_retries = self.max_retries if max_retries is None else max_retries
+        retries = 0
+        while True:
+            try:
+                return await self._aattempt(fn, cancellation_token, kind)
+            except SquadCancelledError:
+                raise
+            except Exception as e:
+                if retries >= max_retries or not retry_if(e):
+                    raise
+            await asyncio.sleep(self.delay(retries))
+            if cancellation_token:
+                cancellation_token.raise_if_cancelled()
+            retries += 1
+
+    def delay(self, retry: int) -> float:
+        """Delay before the given retry, counted from 0."""
+        delay = min(self.backoff * 2**retry, self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def hedge_after(self, kind: str = "call") -> Optional[float]:
+        """Time after which a call of the given kind is hedged, once enough of
+        their latencies are known."""
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            latencies = sorted(self._latencies.get(kind, ()))
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        index = int(len(latencies) * self.hedge_percentile / 100)
+        return latencies[min(index, len(latencies) - 1)]
+
+    def _attempt(
+        self,
+        fn: Callable[[], Any],
+        cancellation_token: Optional[CancellationToken],
+        kind: str,
+    ) -> Any:
+        """Make a call, with a hedge and a timeout when the policy has them."""
+        started_at = time.monotonic()
+        hedge_after = self.hedge_after(kind)
+        if self.timeout is None and hedge_after is None:
+            result = fn()
+            self._record(kind, time.monotonic() - started_at)
+            return result
+
+        pending: Set[Future] = {_start(fn)}
+        while True:
+            done, pending = wait(
+                pending,
+                timeout=self._wait_timeout(started_at, hedge_after, cancellation_token),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                if future.exception() is None:
+                    self._record(kind, time.monotonic() - started_at)
+                    return future.result()
+                error = future.exception()
+            if done and not pending:
+                raise error
+
+            if cancellation_token:
+                cancellation_token.raise_if_cancelled()
+            elapsed = time.monotonic() - started_at
+            if self.timeout is not None and elapsed >= self.timeout:
+                raise TimeoutError(f"The call took longer than {self.timeout}s.")
+            if hedge_after is not None and elapsed >= hedge_after:
+                pending.add(_start(fn))
+                hedge_after = None
+
+    async def _aattempt(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        cancellation_token: Optional[CancellationToken],
+        kind: str,
+    ) -> Any:
+        """Async version of `_attempt`."""
+        started_at = time.monotonic()
+        hedge_after = self.hedge_after(kind)
+        if self.timeout is None and hedge_after is None:
+            result = await fn()
+            self._record(kind, time.monotonic() - started_at)
+            return result
+
+        pending: Set[asyncio.Future] = {asyncio.ensure_future(fn())}
+        try:
+            while True:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self._wait_timeout(
+                        started_at, hedge_after, cancellation_token
+                    ),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for future in done:
+                    if future.exception() is None:
+                        self._record(kind, time.monotonic() - started_at)
+                        return future.result()
+                    error = future.exception()
+                if done and not pending:
+                    raise error
+
+                if cancellation_token:
+                    cancellation_token.raise_if_cancelled()
+                elapsed = time.monotonic() - started_at
+                if self.timeout is not None and elapsed >= self.timeout:
+                    raise TimeoutError(f"The call took longer than {self.timeout}s.")
+                if hedge_after is not None and elapsed >= hedge_after:
+                    pending.add(asyncio.ensure_future(fn()))
+                    hedge_after = None
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _wait_timeout(
+        self,
+        started_at: float,
+        hedge_after: Optional[float],
+        cancellation_token: Optional[CancellationToken],
+    ) -> Optional[float]:
+        """How long to wait for the requests before the next hedge or timeout,
+        waking up regularly to notice a cancellation."""
+        deadlines: List[float] = []
+        if self.timeout is not None:
+            deadlines.append(self.timeout)
+        if hedge_after is not None:
+            deadlines.append(hedge_after)
+        timeouts = [
+            max(deadline + started_at - time.monotonic(), 0) for deadline in deadlines
+        ]
+        if cancellation_token:
+            timeouts.append(0.1)
+        return min(timeouts) if timeouts else None
+
+    def _record(self, kind: str, latency: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(kind, deque(maxlen=200)).append(latency)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether an error of an LLM call is worth retrying: rate limits, timeouts,
+    connection errors and server errors of the provider."""
+    if is_rate_limit_error(error) or isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    response = getattr(error, "response", None)
+    status_code = getattr(error, "status_code", None) or getattr(
+        response, "status_code", None
+    )
+    if isinstance(status_code, int) and status_code >= 500:
+        return True
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def _start(fn: Callable[[], Any]) -> Future:
+    """Run `fn` in a thread, in a copy of the current context."""
+    future: Future = Future()
+    context = contextvars.copy_context()
+
+    def run() -> None:
+        try:
+            future.set_result(context.run(fn))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
@@ -0,0 +1,76 @@
+import threading
+import weakref
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class SquadCancelledError(Exception):
+    """Exception raised when a squad execution is cancelled."""
+
+    def __init__(self, message: str = "The squad execution was cancelled.") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class CancellationToken:
+    """Token to cooperatively cancel a running squad execution.
+
+    Cancelling it makes the agents stop at their next step, tool usage, RPM wait
+    or wait for another task, raising a `SquadCancelledError`.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._children: "weakref.WeakSet[CancellationToken]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """Request the cancellation of the execution, and of its child tokens."""
+        with self._lock:
+            self._event.set()
+            children = list(self._children)
+        for child in children:
+            child.cancel()
+
+    def child(self) -> "CancellationToken":
+        """Token cancelled along with this one, that can also be cancelled on its own."""
+        child = CancellationToken()
+        with self._lock:
+            self._children.add(child)
+            cancelled = self._event.is_set()
+        if cancelled:
+            child.cancel()
+        return child
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise SquadCancelledError()
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep for the given time, waking up to raise as soon as it is cancelled."""
+        if self._event.wait(seconds):
+            raise SquadCancelledError()
+
+
+class CancellationHandler(BaseCallbackHandler):
+    """Stops the language model from generating once the execution is cancelled."""
+
+    raise_error = True
+    run_inline = True
+
+    def __init__(self, cancellation_token: CancellationToken):
+        self.cancellation_token = cancellation_token
+
+    def on_llm_start(self, *args: Any, **kwargs: Any) -> None:
+        self.cancellation_token.raise_if_cancelled()
+
+    def on_chat_model_start(self, *args: Any, **kwargs: Any) -> None:
+        self.cancellation_token.raise_if_cancelled()
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self.cancellation_token.raise_if_cancelled()
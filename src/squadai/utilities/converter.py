@@ -1,10 +1,13 @@
 import json
-from typing import Any, Optional
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
 
 from langchain.schema import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
+from squadai.utilities.call_policy import CallPolicy
+
 
 class ConverterError(Exception):
     """Error raised when Converter fails to parse the input."""
@@ -26,6 +29,14 @@ class Converter(BaseModel):
         description="Max number of attemps to try to get the output formated.",
         default=3,
     )
+    rpm_controller: Optional[Any] = Field(
+        description="Controller of the rate and in-flight limits the conversion calls respect.",
+        default=None,
+    )
+    call_policy: Optional[Any] = Field(
+        description="Backoff, timeout and hedging of the conversion calls, retried up to the max number of attempts.",
+        default=None,
+    )
 
     @model_validator(mode="after")
     def check_llm_provider(self):
@@ -34,30 +45,60 @@ class Converter(BaseModel):
 
     def to_pydantic(self, current_attempt=1):
         """Convert text to pydantic."""
+
+        def convert():
+            with self._limit():
+                if self._is_gpt:
+                    return self._create_instructor().to_pydantic()
+                else:
+                    return self._create_chain().invoke({})
+
         try:
-            if self._is_gpt:
-                return self._create_instructor().to_pydantic()
-            else:
-                return self._create_chain().invoke({})
+            return self._call(convert, current_attempt)
         except Exception as e:
-            if current_attempt < self.max_attemps:
-                return self.to_pydantic(current_attempt + 1)
             return ConverterError(
                 f"Failed to convert text into a pydantic model due to the following error: {e}"
             )
 
     def to_json(self, current_attempt=1):
         """Convert text to json."""
+
+        def convert():
+            with self._limit():
+                if self._is_gpt:
+                    return self._create_instructor().to_json()
+                else:
+                    return json.dumps(self._create_chain().invoke({}).model_dump())
+
         try:
-            if self._is_gpt:
-                return self._create_instructor().to_json()
-            else:
-                return json.dumps(self._create_chain().invoke({}).model_dump())
+            return self._call(convert, current_attempt)
         except Exception:
-            if current_attempt < self.max_attemps:
-                return self.to_json(current_attempt + 1)
             return ConverterError("Failed to convert text into JSON.")
 
+    def _call(self, convert, current_attempt: int) -> Any:
+        """Make the conversion call, retrying any error with the backoff of the
+        call policy until the max number of attempts."""
+        call_policy = self.call_policy or CallPolicy()
+        return call_policy.call(
+            convert,
+            retry_if=lambda e: True,
+            max_retries=max(self.max_attemps - current_attempt, 0),
+            kind="conversion",
+        )
+
+    @contextmanager
+    def _limit(self) -> Iterator[None]:
+        """Wait for the rate limits, and hold a slot of the in-flight limit for
+        the duration of the call."""
+        if not self.rpm_controller:
+            yield
+            return
+
+        self.rpm_controller.check_or_wait()
+        model_name = getattr(self.llm, "model_name", None) or type(self.llm).__name__
+        with self.rpm_controller.limit(model_name):
+            yield
+
     def _create_instructor(self):
         """Create an instructor."""
         from squadai.utilities import Instructor
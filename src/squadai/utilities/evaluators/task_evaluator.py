@@ -29,6 +29,8 @@ class TaskEvaluation(BaseModel):
 class TaskEvaluator:
     def __init__(self, original_agent):
         self.llm = original_agent.llm
+        self.rpm_controller = getattr(original_agent, "_rpm_controller", None)
+        self.call_policy = getattr(original_agent, "call_policy", None)
 
     def evaluate(self, task, ouput) -> TaskEvaluation:
         evaluation_query = (
@@ -53,6 +55,8 @@ class TaskEvaluator:
             text=evaluation_query,
             model=TaskEvaluation,
             instructions=instructions,
+            rpm_controller=self.rpm_controller,
+            call_policy=self.call_policy,
         )
 
         return converter.to_pydantic()
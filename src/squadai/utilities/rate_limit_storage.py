@@ -0,0 +1,128 @@
+import sqlite3
+import time
+from typing import List, Optional, Tuple
+
+from squadai.utilities.paths import db_storage_path
+from squadai.utilities.printer import Printer
+
+
+class RateLimitStorage:
+    """
+    SQLite store of the requests and tokens of the last minute, by budget, shared
+    by the processes of the host.
+    """
+
+    def __init__(self, db_path=f"{db_storage_path()}/rate_limits.db"):
+        self.db_path = db_path
+        self._printer: Printer = Printer()
+        self._initialize_db()
+
+    def _initialize_db(self):
+        """
+        Initializes the SQLite database and creates the usage table
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS rate_limit_usage (
+                        budget TEXT,
+                        kind TEXT,
+                        amount INTEGER,
+                        at REAL
+                    )
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS rate_limit_usage_window
+                    ON rate_limit_usage (budget, kind, at)
+                """
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"RATE LIMIT ERROR: An error occurred during database initialization: {e}",
+                color="red",
+            )
+
+    def admit(
+        self, budget: str, max_rpm: Optional[int], max_tpm: Optional[int]
+    ) -> Optional[Tuple[float, str]]:
+        """Counts a request if it fits the limits of the budget, in a transaction
+        locking out the other processes.
+
+        Returns:
+            None once counted, otherwise the time to wait for room and the kind
+            of usage, `request` or `tokens`, over the limit.
+
+        Raises:
+            sqlite3.Error: The database failed, leaving the caller to limit the
+                request on its own.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            conn.execute("DELETE FROM rate_limit_usage WHERE at <= ?", (now - 60,))
+
+            blocked = None
+            if max_rpm:
+                requests = self._usage(conn, budget, "request")
+                if len(requests) >= max_rpm:
+                    blocked = (
+                        requests[len(requests) - max_rpm][0] + 60 - now,
+                        "request",
+                    )
+            if blocked is None and max_tpm:
+                tokens = self._usage(conn, budget, "tokens")
+                remaining = sum(amount for _, amount in tokens)
+                for recorded_at, amount in tokens:
+                    if remaining < max_tpm:
+                        break
+                    remaining -= amount
+                    blocked = (recorded_at + 60 - now, "tokens")
+
+            if blocked is None:
+                conn.execute(
+                    "INSERT INTO rate_limit_usage (budget, kind, amount, at) VALUES (?, 'request', 1, ?)",
+                    (budget, now),
+                )
+            conn.execute("COMMIT")
+            return blocked
+        finally:
+            conn.close()
+
+    def record_tokens(self, budget: str, tokens: int) -> None:
+        """Counts tokens used against the budget, raising `sqlite3.Error` when
+        the database fails."""
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            conn.execute(
+                "INSERT INTO rate_limit_usage (budget, kind, amount, at) VALUES (?, 'tokens', ?, ?)",
+                (budget, tokens, time.time()),
+            )
+            conn.commit()
+
+    def requests(self, budget: str) -> int:
+        """Number of requests of the last minute counted against the budget."""
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                return conn.execute(
+                    "SELECT COUNT(*) FROM rate_limit_usage WHERE budget = ? AND kind = 'request' AND at > ?",
+                    (budget, time.time() - 60),
+                ).fetchone()[0]
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"RATE LIMIT ERROR: An error occurred while counting the requests: {e}",
+                color="red",
+            )
+        return 0
+
+    def _usage(
+        self, conn: sqlite3.Connection, budget: str, kind: str
+    ) -> List[Tuple[float, int]]:
+        return conn.execute(
+            "SELECT at, amount FROM rate_limit_usage WHERE budget = ? AND kind = ? ORDER BY at",
+            (budget, kind),
+        ).fetchall()
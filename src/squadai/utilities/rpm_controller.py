@@ -1,59 +1,419 @@
+import asyncio
+import math
 import threading
 import time
-from typing import Union
+import warnings
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Set, Tuple
 
-from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
+from squadai.utilities.cancellation import CancellationToken
 from squadai.utilities.logger import Logger
 
 
 class RPMController(BaseModel):
+    """Rate limiter of the LLM calls of agents.
+
+    Requests and tokens are counted over a sliding window of a minute, so a call
+    waiting for room goes as soon as the oldest requests or tokens leave the
+    window, and running calls are counted per model until they complete. Waiting
+    doesn't hold the limiter, and waiters are woken up as soon as there is room
+    for them.
+
+    In adaptive mode, the limits follow the provider: the rate limit and the
+    in-flight limit of the model are cut by `backoff_ratio` when a call is rate
+    limited or much slower than usual, and grow back by one after as many calls
+    succeeding in time as the limit, up to the limits set.
+    """
+
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    max_rpm: Union[int, None] = Field(default=None)
+    max_rpm: Optional[int] = Field(
+        default=None, description="Maximum number of requests per minute."
+    )
+    max_tpm: Optional[int] = Field(
+        default=None,
+        description="Maximum number of tokens per minute, as counted by the token counter.",
+    )
+    max_in_flight: Optional[int] = Field(
+        default=None,
+        description="Maximum number of LLM calls running at the same time, per model.",
+    )
+    adaptive: bool = Field(
+        default=False,
+        description="Whether the rate and in-flight limits adapt to rate limit errors and latency of the calls.",
+    )
+    backoff_ratio: float = Field(
+        default=0.5,
+        gt=0,
+        lt=1,
+        description="Ratio the adaptive limits are multiplied by when a call is rate limited or slow.",
+    )
+    latency_tolerance: float = Field(
+        default=2.0,
+        gt=1,
+        description="How many times slower than the average a call must be to cut the adaptive limits.",
+    )
     logger: Logger = Field(default=None)
-    _current_rpm: int = PrivateAttr(default=0)
-    _timer: threading.Timer | None = PrivateAttr(default=None)
-    _lock: threading.Lock = PrivateAttr(default=None)
-    _shutdown_flag = False
-
-    @model_validator(mode="after")
-    def reset_counter(self):
-        if self.max_rpm:
-            if not self._shutdown_flag:
-                self._lock = threading.Lock()
-                self._reset_request_count()
-        return self
-
-    def check_or_wait(self):
-        if not self.max_rpm:
-            return True
-
-        with self._lock:
-            if self._current_rpm < self.max_rpm:
-                self._current_rpm += 1
-                return True
+    _condition: threading.Condition = PrivateAttr(default_factory=threading.Condition)
+    _requests: Deque[float] = PrivateAttr(default_factory=deque)
+    _tokens: Deque[Tuple[float, int]] = PrivateAttr(default_factory=deque)
+    _token_count: int = PrivateAttr(default=0)
+    _in_flight: Dict[Optional[str], int] = PrivateAttr(default_factory=dict)
+    _async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = PrivateAttr(
+        default_factory=set
+    )
+    _adaptive_rpm: Optional[float] = PrivateAttr(default=None)
+    _adaptive_in_flight: Dict[Optional[str], float] = PrivateAttr(default_factory=dict)
+    _latency: Optional[float] = PrivateAttr(default=None)
+    _rpm_backed_off_at: float = PrivateAttr(default=-math.inf)
+    _backed_off_at: Dict[Optional[str], float] = PrivateAttr(default_factory=dict)
+    _rate_limited: int = PrivateAttr(default=0)
+
+    def check_or_wait(self, cancellation_token: Optional[CancellationToken] = None):
+        """Wait until a request fits the RPM and TPM limits, and count it.
+
+        Args:
+            cancellation_token: Token to stop waiting, which then raises a
+                `SquadCancelledError`.
+        """
+        self._acquire(None, cancellation_token, rate=True, in_flight=False)
+        return True
+
+    async def acheck_or_wait(
+        self, cancellation_token: Optional[CancellationToken] = None
+    ):
+        """Async version of `check_or_wait`, waiting without blocking the event loop."""
+        await self._aacquire(None, cancellation_token, rate=True, in_flight=False)
+        return True
+
+    def release(self, model: Optional[str] = None) -> None:
+        """Count a call to the model as completed, making room for the next one."""
+        with self._condition:
+            self._in_flight[model] = max(self._in_flight.get(model, 0) - 1, 0)
+            self._notify()
+
+    @contextmanager
+    def limit(
+        self,
+        model: Optional[str] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> Iterator[None]:
+        """Hold a slot of the in-flight limit for the duration of a call to the
+        model, waiting for one to be free. In adaptive mode, the outcome and
+        latency of the call adapt the limits."""
+        self._acquire(model, cancellation_token, rate=False, in_flight=True)
+        started_at = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._adapt(model, started_at, e)
+            raise
+        else:
+            self._adapt(model, started_at)
+        finally:
+            self.release(model)
+
+    @asynccontextmanager
+    async def alimit(
+        self,
+        model: Optional[str] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncIterator[None]:
+        """Async version of `limit`."""
+        await self._aacquire(model, cancellation_token, rate=False, in_flight=True)
+        started_at = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._adapt(model, started_at, e)
+            raise
+        else:
+            self._adapt(model, started_at)
+        finally:
+            self.release(model)
+
+    def record_tokens(self, tokens: int) -> None:
+        """Count tokens used by a call against the TPM limit."""
+        if not self.max_tpm or tokens <= 0:
+            return
+        with self._condition:
+            self._tokens.append((time.monotonic(), tokens))
+            self._token_count += tokens
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current limits and usage of the last minute, with the adaptive limits
+        in adaptive mode, the in-flight one being the lowest across models."""
+        with self._condition:
+            self._expire(time.monotonic())
+            return {
+                "max_rpm": self._rpm_limit(),
+                "max_tpm": self.max_tpm,
+                "max_in_flight": min(
+                    (
+                        self._in_flight_limit(model)
+                        for model in self._adaptive_in_flight
+                    ),
+                    default=self.max_in_flight,
+                ),
+                "requests": self._requests_in_window(),
+                "tokens": self._token_count,
+                "in_flight": sum(self._in_flight.values()),
+                "rate_limited": self._rate_limited,
+                "latency": self._latency,
+            }
+
+    def sum_prompt_tokens(self, tokens: int) -> None:
+        """Token counter interface, feeding the TPM limit."""
+        self.record_tokens(tokens)
+
+    def sum_completion_tokens(self, tokens: int) -> None:
+        """Token counter interface, feeding the TPM limit."""
+        self.record_tokens(tokens)
+
+    def sum_successful_requests(self, requests: int) -> None:
+        """Token counter interface, requests are counted when admitted."""
+
+    def stop_rpm_counter(self):
+        """Deprecated, nothing to stop as the windows slide without a timer."""
+        warnings.warn(
+            "stop_rpm_counter is deprecated and does nothing, the RPM controller has no timer to stop.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+    def _acquire(
+        self,
+        model: Optional[str],
+        cancellation_token: Optional[CancellationToken],
+        rate: bool,
+        in_flight: bool,
+    ) -> None:
+        """Wait until the call fits the limits checked, and count it."""
+        with self._condition:
+            blocked = self._admit(model, rate, in_flight)
+        if blocked is None:
+            return
+
+        self._log(blocked[1])
+        self._wait_for_capacity(model, cancellation_token, rate, in_flight)
+
+    async def _aacquire(
+        self,
+        model: Optional[str],
+        cancellation_token: Optional[CancellationToken],
+        rate: bool,
+        in_flight: bool,
+    ) -> None:
+        """Async version of `_acquire`."""
+        logged = False
+        while True:
+            if cancellation_token:
+                cancellation_token.raise_if_cancelled()
+            with self._condition:
+                blocked = self._admit(model, rate, in_flight)
+                if blocked is None:
+                    return
+                loop = asyncio.get_running_loop()
+                waiter = (loop, loop.create_future())
+                self._async_waiters.add(waiter)
+
+            if not logged:
+                self._log(blocked[1])
+                logged = True
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(waiter[1]),
+                    timeout=self._wait_timeout(blocked[0], cancellation_token),
+                )
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._condition:
+                    self._async_waiters.discard(waiter)
+
+    def _admit(
+        self, model: Optional[str], rate: bool, in_flight: bool
+    ) -> Optional[Tuple[float, str]]:
+        """Count the call if it fits the limits, otherwise tell how long to wait
+        for room and why. Must be called holding the condition."""
+        now = time.monotonic()
+        self._expire(now)
+        max_rpm = self._rpm_limit()
+        max_in_flight = self._in_flight_limit(model)
+
+        if rate and max_rpm and len(self._requests) >= max_rpm:
+            wait = self._requests[len(self._requests) - max_rpm] + 60 - now
+            return wait, "Max RPM reached, waiting for next minute to start."
+        if rate and self.max_tpm and self._token_count >= self.max_tpm:
+            return (
+                self._tokens_wait(now),
+                "Max TPM reached, waiting for tokens to free up.",
+            )
+        if (
+            in_flight
+            and max_in_flight
+            and self._in_flight.get(model, 0) >= max_in_flight
+        ):
+            return math.inf, "Max in-flight calls reached, waiting for one to complete."
+
+        if rate and self.max_rpm:
+            self._requests.append(now)
+        if in_flight:
+            self._in_flight[model] = self._in_flight.get(model, 0) + 1
+        return None
+
+    def _rpm_limit(self) -> Optional[int]:
+        """RPM limit in force, the adaptive one once it was cut."""
+        if self._adaptive_rpm is None:
+            return self.max_rpm
+        return max(int(self._adaptive_rpm), 1)
+
+    def _in_flight_limit(self, model: Optional[str]) -> Optional[int]:
+        """In-flight limit in force for the model, the adaptive one once it was
+        cut."""
+        if model not in self._adaptive_in_flight:
+            return self.max_in_flight
+        return max(int(self._adaptive_in_flight[model]), 1)
+
+    def _requests_in_window(self) -> int:
+        """Number of requests of the last minute. Must be called holding the
+        condition."""
+        return len(self._requests)
+
+    def _adapt(
+        self,
+        model: Optional[str],
+        started_at: float,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Cut the adaptive limits when the call was rate limited or slow, and
+        grow them back when it succeeded in time. Errors other than rate limits
+        leave them as they are."""
+        if not self.adaptive:
+            return
+
+        now = time.monotonic()
+        latency = now - started_at
+        with self._condition:
+            if error is not None:
+                if not is_rate_limit_error(error):
+                    return
+                self._rate_limited += 1
+                self._back_off(model, started_at, now, "rate limited")
+            elif self._latency and latency > self.latency_tolerance * self._latency:
+                self._back_off(model, started_at, now, "slowing down")
             else:
-                self.logger.log(
-                    "info", "Max RPM reached, waiting for next minute to start."
+                self._grow(model)
+            if error is None:
+                self._latency = (
+                    latency
+                    if self._latency is None
+                    else 0.9 * self._latency + 0.1 * latency
                 )
-                self._wait_for_next_minute()
-                self._current_rpm = 1
-                return True
+            self._notify()
 
-    def stop_rpm_counter(self):
-        if self._timer:
-            self._timer.cancel()
-            self._timer = None
-
-    def _wait_for_next_minute(self):
-        time.sleep(60)
-        self._current_rpm = 0
-
-    def _reset_request_count(self):
-        with self._lock:
-            self._current_rpm = 0
-        if self._timer:
-            self._shutdown_flag = True
-            self._timer.cancel()
-        self._timer = threading.Timer(60.0, self._reset_request_count)
-        self._timer.start()
+    def _back_off(
+        self, model: Optional[str], started_at: float, now: float, reason: str
+    ) -> None:
+        """Multiply the rate limit and the in-flight limit of the model by the
+        backoff ratio, each once for the calls started before its last cut.
+        Without a limit set, the in-flight limit starts from the calls running
+        and the rate isn't limited. Must be called holding the condition."""
+        limits = []
+        if started_at >= self._backed_off_at.get(model, -math.inf):
+            self._backed_off_at[model] = now
+            in_flight = self._in_flight_limit(model) or self._in_flight.get(model, 0)
+            self._adaptive_in_flight[model] = max(in_flight * self.backoff_ratio, 1)
+            limits.append(f"{self._in_flight_limit(model)} in-flight calls")
+        if self.max_rpm and started_at >= self._rpm_backed_off_at:
+            self._rpm_backed_off_at = now
+            self._adaptive_rpm = max(self._rpm_limit() * self.backoff_ratio, 1)
+            limits.append(f"{self._rpm_limit()} RPM")
+        if limits:
+            self._log(f"Provider {reason}, limiting to {' and '.join(limits)}.")
+
+    def _grow(self, model: Optional[str]) -> None:
+        """Grow the cut rate limit and in-flight limit of the model by one after
+        as many calls succeeding as the limit, while they are in use. Must be
+        called holding the condition."""
+        if self._adaptive_rpm is not None and self._requests_in_window() >= (
+            self._adaptive_rpm / 2
+        ):
+            self._adaptive_rpm += 1 / self._adaptive_rpm
+            if self._adaptive_rpm >= self.max_rpm:
+                self._adaptive_rpm = None
+        in_flight = self._adaptive_in_flight.get(model)
+        if in_flight is not None and self._in_flight.get(model, 0) >= in_flight / 2:
+            in_flight += 1 / in_flight
+            self._adaptive_in_flight[model] = in_flight
+            if self.max_in_flight and in_flight >= self.max_in_flight:
+                del self._adaptive_in_flight[model]
+
+    def _expire(self, now: float) -> None:
+        """Drop the requests and tokens that left the window."""
+        while self._requests and self._requests[0] <= now - 60:
+            self._requests.popleft()
+        while self._tokens and self._tokens[0][0] <= now - 60:
+            self._token_count -= self._tokens.popleft()[1]
+
+    def _tokens_wait(self, now: float) -> float:
+        """Time until enough tokens leave the window to be under the TPM limit."""
+        remaining = self._token_count
+        for recorded_at, tokens in self._tokens:
+            remaining -= tokens
+            if remaining < self.max_tpm:
+                return recorded_at + 60 - now
+        return 0
+
+    def _wait_for_capacity(
+        self,
+        model: Optional[str],
+        cancellation_token: Optional[CancellationToken],
+        rate: bool,
+        in_flight: bool,
+    ) -> None:
+        """Wait until the call fits the limits checked, and count it."""
+        with self._condition:
+            while (blocked := self._admit(model, rate, in_flight)) is not None:
+                if cancellation_token:
+                    cancellation_token.raise_if_cancelled()
+                self._condition.wait(self._wait_timeout(blocked[0], cancellation_token))
+
+    def _wait_timeout(
+        self, wait: float, cancellation_token: Optional[CancellationToken]
+    ) -> Optional[float]:
+        """How long to wait before checking again, waking up regularly to notice
+        a cancellation."""
+        if cancellation_token:
+            wait = min(wait, 0.1)
+        return None if wait == math.inf else max(wait, 0)
+
+    def _notify(self) -> None:
+        """Wake up the waiters. Must be called holding the condition."""
+        self._condition.notify_all()
+        for loop, future in self._async_waiters:
+            try:
+                loop.call_soon_threadsafe(_set_result, future)
+            except RuntimeError:
+                pass
+
+    def _log(self, message: str) -> None:
+        if self.logger:
+            self.logger.log("info", message)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an error of an LLM call is the provider rejecting it for going
+    over its rate limits."""
+    response = getattr(error, "response", None)
+    status_code = getattr(error, "status_code", None) or getattr(
+        response, "status_code", None
+    )
+    return status_code == 429 or "RateLimit" in type(error).__name__
+
+
+def _set_result(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,166 @@
+import asyncio
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import Field, PrivateAttr, model_validator
+
+from squadai.utilities.cancellation import CancellationToken
+from squadai.utilities.printer import Printer
+from squadai.utilities.rate_limit_storage import RateLimitStorage
+from squadai.utilities.rpm_controller import RPMController
+
+
+class SharedRPMController(RPMController):
+    """Rate limiter whose RPM and TPM limits are a budget shared by all the
+    processes of the host using the same budget name.
+
+    Requests and tokens are counted in a SQLite database of the storage
+    directory, in transactions locking out the other processes, so the limits
+    hold whatever the number of processes kicking off squads. The in-flight
+    limit stays per process. When the database fails, the limits are held per
+    process for a minute before trying it again.
+    """
+
+    budget: str = Field(
+        description="Name of the budget, shared with the controllers using the same name."
+    )
+    db_path: Optional[str] = Field(
+        default=None,
+        description="SQLite database the budget is counted in, defaults to rate_limits.db in the storage directory.",
+    )
+    agent_rpm_controller: Optional[RPMController] = Field(
+        default=None,
+        description="Controller of the agent, whose limits are respected as well.",
+    )
+    _storage: RateLimitStorage = PrivateAttr()
+    _storage_failed_at: Optional[float] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def open_storage(self) -> "SharedRPMController":
+        """Open the database the budget is counted in."""
+        self._storage = (
+            RateLimitStorage(self.db_path) if self.db_path else RateLimitStorage()
+        )
+        return self
+
+    def release(self, model: Optional[str] = None) -> None:
+        super().release(model)
+        if self.agent_rpm_controller:
+            self.agent_rpm_controller.release(model)
+
+    def record_tokens(self, tokens: int) -> None:
+        # Counted in the window of the process too, in case the database fails.
+        super().record_tokens(tokens)
+        if self.max_tpm and tokens > 0 and self._storage_available():
+            try:
+                self._storage.record_tokens(self.budget, tokens)
+            except sqlite3.Error as e:
+                self._storage_failed(e)
+        if self.agent_rpm_controller:
+            self.agent_rpm_controller.record_tokens(tokens)
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics = super().metrics()
+        if self._storage_available():
+            metrics["requests"] = self._storage.requests(self.budget)
+        return metrics
+
+    def _acquire(
+        self,
+        model: Optional[str],
+        cancellation_token: Optional[CancellationToken],
+        rate: bool,
+        in_flight: bool,
+    ) -> None:
+        if rate:
+            self._acquire_budget(cancellation_token)
+        if in_flight:
+            super()._acquire(model, cancellation_token, False, in_flight)
+        if self.agent_rpm_controller:
+            self.agent_rpm_controller._acquire(
+                model, cancellation_token, rate, in_flight
+            )
+
+    async def _aacquire(
+        self,
+        model: Optional[str],
+        cancellation_token: Optional[CancellationToken],
+        rate: bool,
+        in_flight: bool,
+    ) -> None:
+        if rate:
+            # The budget is counted in blocking SQLite transactions.
+            await asyncio.to_thread(self._acquire_budget, cancellation_token)
+        if in_flight:
+            await RPMController._aacquire(
+                self, model, cancellation_token, False, in_flight
+            )
+        if self.agent_rpm_controller:
+            await self.agent_rpm_controller._aacquire(
+                model, cancellation_token, rate, in_flight
+            )
+
+    def _acquire_budget(self, cancellation_token: Optional[CancellationToken]) -> None:
+        """Wait until a request fits the budget, and count it."""
+        logged = False
+        while (blocked := self._admit_budget()) is not None:
+            if not logged:
+                self._log(blocked[1])
+                logged = True
+            if cancellation_token:
+                cancellation_token.raise_if_cancelled()
+            with self._condition:
+                self._condition.wait(self._wait_timeout(blocked[0], cancellation_token))
+
+    def _admit_budget(self) -> Optional[Tuple[float, str]]:
+        """Count the request against the shared budget if it fits, otherwise
+        tell how long to wait for room and why. The database is used without
+        holding the condition, so the calls completing aren't held up by the
+        other processes; the requests are counted in the window of the process
+        as well, which holds the limits while the database is failing."""
+        if not (self.max_rpm or self.max_tpm):
+            return None
+        if self._storage_available():
+            try:
+                blocked = self._storage.admit(
+                    self.budget, self._rpm_limit(), self.max_tpm
+                )
+            except sqlite3.Error as e:
+                self._storage_failed(e)
+            else:
+                self._storage_failed_at = None
+                return self._count_admitted(blocked)
+        with self._condition:
+            return super()._admit(None, True, False)
+
+    def _count_admitted(
+        self, blocked: Optional[Tuple[float, str]]
+    ) -> Optional[Tuple[float, str]]:
+        """Count the request admitted in the budget in the window of the
+        process too, or tell why it wasn't admitted."""
+        if blocked is None:
+            with self._condition:
+                now = time.monotonic()
+                self._expire(now)
+                if self.max_rpm:
+                    self._requests.append(now)
+            return None
+        wait, kind = blocked
+        if kind == "request":
+            return wait, "Max RPM reached, waiting for next minute to start."
+        return wait, "Max TPM reached, waiting for tokens to free up."
+
+    def _storage_available(self) -> bool:
+        """Whether the budget is counted in the database, which is tried again
+        a minute after failing."""
+        failed_at = self._storage_failed_at
+        return failed_at is None or time.monotonic() - failed_at >= 60
+
+    def _storage_failed(self, error: sqlite3.Error) -> None:
+        if self._storage_failed_at is None:
+            Printer().print(
+                content=f"RATE LIMIT ERROR: The budget {self.budget} can't be counted, limiting the requests of this process only: {error}",
+                color="red",
+            )
+        self._storage_failed_at = time.monotonic()
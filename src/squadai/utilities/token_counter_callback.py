@@ -1,3 +1,4 @@
+import threading
 from typing import Any, Dict, List
 
 import tiktoken
@@ -11,16 +12,29 @@ class TokenProcess:
     completion_tokens: int = 0
     successful_requests: int = 0
 
+    def __init__(self):
+        self._lock = threading.Lock()
+
     def sum_prompt_tokens(self, tokens: int):
-        self.prompt_tokens = self.prompt_tokens + tokens
-        self.total_tokens = self.total_tokens + tokens
+        with self._lock:
+            self.prompt_tokens = self.prompt_tokens + tokens
+            self.total_tokens = self.total_tokens + tokens
 
     def sum_completion_tokens(self, tokens: int):
-        self.completion_tokens = self.completion_tokens + tokens
-        self.total_tokens = self.total_tokens + tokens
+        with self._lock:
+            self.completion_tokens = self.completion_tokens + tokens
+            self.total_tokens = self.total_tokens + tokens
 
     def sum_successful_requests(self, requests: int):
-        self.successful_requests = self.successful_requests + requests
+        with self._lock:
+            self.successful_requests = self.successful_requests + requests
+
+    def reset(self):
+        with self._lock:
+            self.total_tokens = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.successful_requests = 0
 
     def get_summary(self) -> str:
         return {
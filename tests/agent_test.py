@@ -424,7 +424,7 @@ def test_agent_respect_the_max_rpm_set(capsys):
         allow_delegation=False,
     )
 
-    with patch.object(RPMController, "_wait_for_next_minute") as moveon:
+    with patch.object(RPMController, "_wait_for_capacity") as moveon:
         moveon.return_value = True
         task = Task(
             description="Use tool logic for `get_final_answer` but fon't give you final answer yet, instead keep using it unless you're told to give your final answer",
@@ -470,7 +470,7 @@ def test_agent_respect_the_max_rpm_set_over_squad_rpm(capsys):
 
     squad = Squad(agents=[agent], tasks=[task], max_rpm=1, verbose=2)
 
-    with patch.object(RPMController, "_wait_for_next_minute") as moveon:
+    with patch.object(RPMController, "_wait_for_capacity") as moveon:
         moveon.return_value = True
         squad.kickoff()
         captured = capsys.readouterr()
@@ -521,8 +521,10 @@ def test_agent_without_max_rpm_respet_squad_rpm(capsys):
     ]
 
     squad = Squad(agents=[agent1, agent2], tasks=tasks, max_rpm=1, verbose=2)
+    # Use up the request of the minute, so the request of agent2 has to wait.
+    squad._rpm_controller.check_or_wait()
 
-    with patch.object(RPMController, "_wait_for_next_minute") as moveon:
+    with patch.object(RPMController, "_wait_for_capacity") as moveon:
         moveon.return_value = True
         squad.kickoff()
         captured = capsys.readouterr()
@@ -842,3 +844,437 @@ Thought:
 
 """
     )
+
+
+def test_agent_execute_task_async_awaits_async_tools():
+    import asyncio
+
+    from langchain.tools import StructuredTool
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    calls = []
+
+    def multiplier(first_number: int, second_number: int) -> float:
+        """Useful for when you need to multiply two numbers together."""
+        calls.append("sync")
+        return first_number * second_number
+
+    async def amultiplier(first_number: int, second_number: int) -> float:
+        """Useful for when you need to multiply two numbers together."""
+        calls.append("async")
+        return first_number * second_number
+
+    llm = FakeListChatModel(
+        responses=[
+            'Thought: I need to multiply the numbers\nAction: multiplier\nAction Input: {"first_number": 3, "second_number": 4}',
+            "Thought: I now know the final answer\nFinal Answer: 12",
+        ]
+    )
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=llm,
+        tools=[
+            StructuredTool.from_function(
+                func=multiplier, coroutine=amultiplier, name="multiplier"
+            )
+        ],
+        allow_delegation=False,
+    )
+    task = Task(
+        description="What is 3 times 4?",
+        expected_output="The result of the multiplication.",
+        agent=agent,
+    )
+
+    output = asyncio.run(agent.aexecute_task(task))
+
+    assert output == "12"
+    assert calls == ["async"]
+
+
+def test_rpm_wait_stops_when_cancelled():
+    import threading
+    import time
+
+    from squadai.utilities import CancellationToken, Logger, SquadCancelledError
+
+    rpm_controller = RPMController(max_rpm=1, logger=Logger(verbose_level=0))
+    cancellation_token = CancellationToken()
+    rpm_controller.check_or_wait(cancellation_token)
+
+    threading.Timer(0.1, cancellation_token.cancel).start()
+    start = time.time()
+    with pytest.raises(SquadCancelledError):
+        rpm_controller.check_or_wait(cancellation_token)
+
+    assert time.time() - start < 1
+
+
+def test_rpm_controller_wakes_waiters_as_soon_as_there_is_room():
+    import asyncio
+    import threading
+    import time
+
+    from squadai.utilities import Logger
+
+    rpm_controller = RPMController(
+        max_rpm=2, max_tpm=100, max_in_flight=1, logger=Logger(verbose_level=0)
+    )
+
+    rpm_controller.check_or_wait()
+    rpm_controller.check_or_wait()
+    rpm_controller._requests[0] -= 59.8
+    start = time.time()
+    rpm_controller.check_or_wait()
+    assert 0.1 < time.time() - start < 1
+
+    rpm_controller.max_rpm = None
+    rpm_controller.record_tokens(60)
+    rpm_controller.record_tokens(60)
+    rpm_controller._tokens[0] = (rpm_controller._tokens[0][0] - 59.8, 60)
+    start = time.time()
+    asyncio.run(rpm_controller.acheck_or_wait())
+    assert 0.1 < time.time() - start < 1
+
+    def hold(model, seconds):
+        with rpm_controller.limit(model):
+            time.sleep(seconds)
+
+    threading.Thread(target=hold, args=("gpt-4", 0.2)).start()
+    time.sleep(0.05)
+    start = time.time()
+    with rpm_controller.limit("gpt-3.5"):
+        assert time.time() - start < 0.1
+    with rpm_controller.limit("gpt-4"):
+        assert 0.1 < time.time() - start < 1
+
+    async def wait_for_slot():
+        threading.Thread(target=hold, args=("gpt-4", 0.2)).start()
+        await asyncio.sleep(0.05)
+        start = time.time()
+        async with rpm_controller.alimit("gpt-4"):
+            return time.time() - start
+
+    assert 0.1 < asyncio.run(wait_for_slot()) < 1
+
+
+def test_shared_rpm_controllers_share_the_budget_of_the_host(tmp_path):
+    import asyncio
+    import sqlite3
+    import time
+
+    from squadai.utilities import Logger, SharedRPMController
+
+    db_path = str(tmp_path / "rate_limits.db")
+    agent_rpm_controller = RPMController(max_in_flight=1)
+    controllers = [
+        SharedRPMController(
+            budget="openai",
+            db_path=db_path,
+            max_rpm=2,
+            max_tpm=100,
+            logger=Logger(verbose_level=0),
+            agent_rpm_controller=agent_rpm_controller,
+        )
+        for _ in range(2)
+    ]
+
+    def age_oldest(kind):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "UPDATE rate_limit_usage SET at = at - 59.8 WHERE rowid = "
+                "(SELECT MIN(rowid) FROM rate_limit_usage WHERE kind = ?)",
+                (kind,),
+            )
+
+    controllers[0].check_or_wait()
+    controllers[1].check_or_wait()
+    assert controllers[0]._admit_budget()[0] > 59
+    age_oldest("request")
+    start = time.time()
+    controllers[0].check_or_wait()
+    assert 0.1 < time.time() - start < 1
+
+    controllers[0].max_rpm = controllers[1].max_rpm = None
+    controllers[0].record_tokens(60)
+    controllers[1].record_tokens(60)
+    age_oldest("tokens")
+    start = time.time()
+    asyncio.run(controllers[1].acheck_or_wait())
+    assert 0.1 < time.time() - start < 1
+
+    with controllers[0].limit("gpt-4"):
+        assert agent_rpm_controller._in_flight["gpt-4"] == 1
+    assert agent_rpm_controller._in_flight["gpt-4"] == 0
+
+
+def test_shared_rpm_controller_counts_without_holding_the_process_limits(tmp_path):
+    import threading
+
+    from squadai.utilities import Logger, SharedRPMController
+    from squadai.utilities.rate_limit_storage import RateLimitStorage
+
+    rpm_controller = SharedRPMController(
+        budget="openai",
+        db_path=str(tmp_path / "rate_limits.db"),
+        max_rpm=2,
+        logger=Logger(verbose_level=0),
+    )
+    released = []
+    storage_admit = RateLimitStorage.admit
+
+    def admit(self, *args):
+        release = threading.Thread(target=rpm_controller.release, args=("gpt-4",))
+        release.start()
+        release.join(1)
+        released.append(not release.is_alive())
+        return storage_admit(self, *args)
+
+    with patch.object(RateLimitStorage, "admit", admit):
+        rpm_controller.check_or_wait()
+    assert released == [True]
+
+    rpm_controller._storage.db_path = str(tmp_path / "missing" / "rate_limits.db")
+    rpm_controller.check_or_wait()
+    assert rpm_controller._storage_failed_at is not None
+    assert rpm_controller._admit_budget()[0] > 59
+
+
+def test_adaptive_rpm_controller_backs_off_on_rate_limits_and_latency():
+    import time
+
+    from langchain_core.language_models.chat_models import SimpleChatModel
+    from pydantic import BaseModel
+
+    from squadai.utilities import Converter, ConverterError, Logger
+
+    class RateLimitError(Exception):
+        status_code = 429
+
+    def call(rpm_controller, seconds=0.01, error=None):
+        rpm_controller.check_or_wait()
+        with rpm_controller.limit("gpt-4"):
+            time.sleep(seconds)
+            if error:
+                raise error
+
+    rpm_controller = RPMController(
+        max_rpm=10, max_in_flight=4, adaptive=True, logger=Logger(verbose_level=0)
+    )
+    with pytest.raises(RateLimitError):
+        with rpm_controller.limit("gpt-4"):
+            call(rpm_controller, error=RateLimitError())
+    assert rpm_controller.metrics()["max_rpm"] == 5
+    assert rpm_controller.metrics()["max_in_flight"] == 2
+    assert rpm_controller.metrics()["rate_limited"] == 2
+    assert rpm_controller._in_flight_limit("gpt-3.5") == 4
+
+    for _ in range(3):
+        call(rpm_controller)
+    assert rpm_controller.metrics()["max_rpm"] == 5
+    assert 5 < rpm_controller._adaptive_rpm < 6
+
+    call(rpm_controller, seconds=0.1)
+    assert rpm_controller.metrics()["max_rpm"] == 2
+    assert rpm_controller.metrics()["max_in_flight"] == 1
+
+    class RateLimited(SimpleChatModel):
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            raise RateLimitError()
+
+        @property
+        def _llm_type(self) -> str:
+            return "rate-limited"
+
+    class Answer(BaseModel):
+        answer: str
+
+    rpm_controller = RPMController(max_in_flight=8, adaptive=True)
+    converter = Converter(
+        llm=RateLimited(),
+        text="The answer is 42.",
+        model=Answer,
+        instructions="Convert the text.",
+        max_attemps=2,
+        rpm_controller=rpm_controller,
+    )
+    assert isinstance(converter.to_pydantic(), ConverterError)
+    assert rpm_controller.metrics()["rate_limited"] == 2
+    assert rpm_controller.metrics()["max_in_flight"] == 2
+
+
+def test_call_policy_retries_times_out_and_hedges_llm_calls():
+    import asyncio
+    import time
+
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    from squadai.utilities import CallPolicy
+
+    call_policy = CallPolicy(max_retries=2, backoff=0.01, jitter=False, timeout=0.2)
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise ConnectionError("Connection reset.")
+        return "answer"
+
+    assert call_policy.call(flaky) == "answer"
+    assert attempts[1] - attempts[0] >= 0.01
+    assert attempts[2] - attempts[1] >= 0.02
+
+    attempts.clear()
+    with pytest.raises(ConnectionError):
+        CallPolicy().call(flaky)
+    assert len(attempts) == 1
+
+    attempts.clear()
+    with pytest.raises(ValueError):
+        call_policy.call(lambda: attempts.append(1) or int("not a number"))
+    assert len(attempts) == 1
+
+    with pytest.raises(TimeoutError):
+        call_policy.call(lambda: time.sleep(1), max_retries=0)
+
+    call_policy = CallPolicy(hedge_percentile=90, hedge_min_samples=5)
+    for _ in range(5):
+        call_policy.call(lambda: time.sleep(0.01))
+    assert call_policy.hedge_after() is not None
+    assert call_policy.hedge_after("tool_calling") is None
+    requests = []
+
+    def slow_first():
+        requests.append(1)
+        time.sleep(1 if len(requests) == 1 else 0.01)
+        return len(requests)
+
+    start = time.monotonic()
+    assert call_policy.call(slow_first) == 2
+    assert time.monotonic() - start < 0.5
+
+    async def aslow_first():
+        requests.append(1)
+        await asyncio.sleep(1 if len(requests) == 3 else 0.01)
+        return len(requests)
+
+    start = time.monotonic()
+    assert asyncio.run(call_policy.acall(aslow_first)) == 4
+    assert time.monotonic() - start < 0.5
+
+    class FlakyModel(SimpleChatModel):
+        calls: int = 0
+
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise ConnectionError("Connection reset.")
+            return "Thought: I know it\nFinal Answer: 42"
+
+        @property
+        def _llm_type(self) -> str:
+            return "flaky"
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=FlakyModel(),
+        call_policy=CallPolicy(max_retries=1, backoff=0),
+        allow_delegation=False,
+    )
+    task = Task(description="What is the answer?", expected_output="The answer.")
+    assert agent.execute_task(task) == "42"
+    assert agent.llm.calls == 2
+
+
+def test_retried_llm_calls_count_against_the_rpm_limit():
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    from squadai.utilities import CallPolicy
+
+    class FlakyModel(SimpleChatModel):
+        calls: int = 0
+
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise ConnectionError("Connection reset.")
+            return "Thought: I know it\nFinal Answer: 42"
+
+        @property
+        def _llm_type(self) -> str:
+            return "flaky"
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=FlakyModel(),
+        max_rpm=1,
+        call_policy=CallPolicy(max_retries=1, backoff=0),
+        allow_delegation=False,
+    )
+    task = Task(description="What is the answer?", expected_output="The answer.")
+
+    with patch.object(RPMController, "_wait_for_capacity") as moveon:
+        assert agent.execute_task(task) == "42"
+    moveon.assert_called_once()
+    assert len(agent._rpm_controller._requests) == 1
+
+
+def test_agent_runs_concurrent_tasks_with_isolated_executors(topic_echo):
+    import threading
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=topic_echo(delay=0.1),
+        allow_delegation=False,
+    )
+    agent_executor = agent.agent_executor
+
+    results = {}
+
+    def execute(topic):
+        task = Task(description=f"Write about {topic}.", expected_output="The topic.")
+        results[topic] = agent.execute_task(task)
+
+    threads = [
+        threading.Thread(target=execute, args=(topic,))
+        for topic in ["AI", "Sales", "Finance"]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"AI": "AI", "Sales": "Sales", "Finance": "Finance"}
+    assert agent.agent_executor is agent_executor
+    assert agent_executor.task is None
+
+
+def test_agent_keeps_a_bounded_number_of_compiled_executors():
+    from squadai.agent import MAX_COMPILED_EXECUTORS
+    from squadai.utilities.token_counter_callback import TokenProcess
+
+    assert TokenProcess()._lock is not TokenProcess()._lock
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        allow_delegation=False,
+    )
+    for _ in range(MAX_COMPILED_EXECUTORS + 4):
+
+        @tool
+        def echo(text: str) -> str:
+            """Echo the text back."""
+            return text
+
+        agent.compile_agent_executor([echo])
+    assert len(agent._compiled_executors) == MAX_COMPILED_EXECUTORS
@@ -66,3 +66,139 @@ def test_ask_question_to_wrong_agent():
         result
         == "\nError executing tool. Co-worker mentioned not found, it must to be one of the following options:\n- researcher\n"
     )
+
+
+def test_delegate_work_runs_on_free_replicas(concurrency_probe, slow_model):
+    import threading
+
+    replicated_researcher = Agent(
+        role="researcher",
+        goal="make the best research and analysis on content about AI and AI agents",
+        backstory="You're an expert researcher, specialized in technology",
+        llm=slow_model(),
+        allow_delegation=False,
+        replicas=2,
+    )
+    replicated_tools = AgentTools(agents=[replicated_researcher])
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                replicated_tools.delegate_work(
+                    coworker="researcher",
+                    task="share your take on AI Agents",
+                    context="I heard you hate them",
+                )
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["Done"] * 4
+    assert concurrency_probe.max_running == 2
+    assert replicated_researcher._busy_replicas == 0
+
+    researcher = Agent(
+        role="researcher",
+        goal="make the best research and analysis on content about AI and AI agents",
+        backstory="You're an expert researcher, specialized in technology",
+        llm=slow_model(),
+        allow_delegation=False,
+    )
+    tools = AgentTools(agents=[researcher])
+    concurrency_probe.reset()
+    threads = [
+        threading.Thread(
+            target=tools.delegate_work,
+            kwargs={
+                "coworker": "researcher",
+                "task": "share your take on AI Agents",
+                "context": "I heard you hate them",
+            },
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert concurrency_probe.max_running == 4
+
+
+def test_cancelled_replica_wait_holds_no_replica():
+    import asyncio
+
+    from squadai.agents.replicas import aacquire_replica, release_replica
+
+    researcher = Agent(
+        role="researcher",
+        goal="make the best research and analysis on content about AI and AI agents",
+        backstory="You're an expert researcher, specialized in technology",
+        allow_delegation=False,
+        replicas=1,
+    )
+
+    async def wait_for_replicas():
+        assert await aacquire_replica([researcher]) is researcher
+        cancelled = asyncio.create_task(aacquire_replica([researcher]))
+        waiting = asyncio.create_task(aacquire_replica([researcher]))
+        await asyncio.sleep(0.05)
+        cancelled.cancel()
+        release_replica(researcher)
+        assert await asyncio.wait_for(waiting, 1) is researcher
+        release_replica(researcher)
+
+    asyncio.run(wait_for_replicas())
+    assert researcher._busy_replicas == 0
+
+
+def test_delegate_work_in_parallel_runs_delegations_concurrently(
+    concurrency_probe, slow_model
+):
+    coworkers = [
+        Agent(
+            role=role,
+            goal=f"Be the best {role}",
+            backstory=f"You're an expert {role}",
+            llm=slow_model(answer=f"Done by the {role}"),
+            allow_delegation=False,
+        )
+        for role in ["researcher", "writer"]
+    ]
+    parallel_tools = AgentTools(agents=coworkers, parallel_delegation=True)
+
+    assert [tool.name for tool in parallel_tools.tools()] == [
+        "Delegate work to co-worker",
+        "Ask question to co-worker",
+        "Delegate work to co-workers in parallel",
+    ]
+
+    result = parallel_tools.delegate_work_in_parallel(
+        delegations=[
+            {"coworker": "researcher", "task": "research AI", "context": "none"},
+            {"coworker": "writer", "task": "write about AI", "context": "none"},
+            {"coworker": "designer", "task": "draw AI", "context": "none"},
+        ]
+    )
+
+    assert result == (
+        "researcher on the task 'research AI':\nDone by the researcher\n\n"
+        "writer on the task 'write about AI':\nDone by the writer\n\n"
+        "designer on the task 'draw AI':\n\nError executing tool. Co-worker mentioned not found, it must to be one of the following options:\n- researcher\n- writer\n"
+    )
+    assert concurrency_probe.max_running == 2
+
+    concurrency_probe.reset()
+    AgentTools(agents=coworkers, max_parallel_delegations=1).delegate_work_in_parallel(
+        delegations=[
+            {"coworker": "researcher", "task": "research AI", "context": "none"},
+            {"coworker": "writer", "task": "write about AI", "context": "none"},
+        ]
+    )
+    assert concurrency_probe.max_running == 1
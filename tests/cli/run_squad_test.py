@@ -0,0 +1,56 @@
+import json
+
+from squadai.cli.run_squad import _share_rpm_budget, run_squad
+from tests.helpers import echo_squad
+
+
+def test_run_squad_writes_a_result_per_input_and_resumes(tmp_path):
+    inputs_path = tmp_path / "inputs.jsonl"
+    inputs_path.write_text(
+        '{"topic": "AI"}\n\n{"topic": "Fail"}\n{"topic": "Sales"}\n{"topic": "Finance"}\n'
+    )
+    output_path = tmp_path / "inputs.results.jsonl"
+
+    assert run_squad(
+        "tests.helpers:echo_squad", str(inputs_path), workers=2, max_rpm=60
+    ) == (4, 0, 1)
+
+    results = {
+        result["index"]: result
+        for result in map(json.loads, output_path.read_text().splitlines())
+    }
+    assert results[0]["inputs"] == {"topic": "AI"}
+    assert results[0]["result"] == "AI"
+    assert results[0]["timings"]["duration"] >= 0
+    assert results[1]["error"] == "The model failed"
+    assert results[2]["result"] == "Sales"
+    assert results[3]["result"] == "Finance"
+    for index in [0, 2, 3]:
+        assert results[index]["usage_metrics"] == {
+            "total_tokens": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "successful_requests": 1,
+        }
+
+    with open(output_path, "a") as output:
+        output.write('{"index": 1, "res')
+
+    assert run_squad("tests.helpers:echo_squad", str(inputs_path), workers=1) == (
+        1,
+        3,
+        1,
+    )
+    lines = output_path.read_text().splitlines()
+    assert json.loads(lines[-1])["index"] == 1
+
+
+def test_run_squad_counts_the_agents_requests_against_one_budget():
+    squad = echo_squad()
+    squad.agents.append(squad.agents[0].copy())
+    _share_rpm_budget(squad, 60, "squadai-run-test")
+
+    controllers = {id(agent._rpm_controller) for agent in squad.agents}
+    assert len(controllers) == 1
+    assert squad.agents[0]._rpm_controller.budget == "squadai-run-test"
+    assert squad.agents[0]._rpm_controller.max_rpm == 60
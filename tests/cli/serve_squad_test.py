@@ -0,0 +1,74 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+from squadai.cli.serve_squad import SquadHTTPServer, SquadServer
+
+USAGE_OF_ONE_REQUEST = {
+    "total_tokens": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "successful_requests": 1,
+}
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def test_serve_squad_kicks_off_in_warm_workers_and_sheds_load():
+    squad_server = SquadServer("tests.helpers:echo_squad", workers=1, max_queue_size=1)
+    squad_server.start()
+    http_server = SquadHTTPServer(("127.0.0.1", 0), squad_server)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{http_server.server_port}"
+
+    try:
+        with urllib.request.urlopen(f"{url}/health") as response:
+            assert json.loads(response.read()) == {
+                "workers": 1,
+                "running": 0,
+                "queued": 0,
+                "max_queue_size": 1,
+            }
+
+        status, body = post(f"{url}/kickoff", {"inputs": {"topic": "AI"}})
+        assert status == 200
+        assert json.loads(body)["result"] == "AI"
+        assert json.loads(body)["usage_metrics"] == USAGE_OF_ONE_REQUEST
+
+        status, body = post(
+            f"{url}/kickoff", {"inputs": {"topic": "Sales"}, "stream": True}
+        )
+        events = [json.loads(line) for line in body.splitlines()]
+        assert status == 200
+        assert [event["type"] for event in events] == [
+            "started",
+            "task_started",
+            "task_output",
+            "result",
+        ]
+        assert events[-1]["result"] == "Sales"
+        assert events[-1]["usage_metrics"] == USAGE_OF_ONE_REQUEST
+
+        status, _ = post(f"{url}/kickoff", {"inputs": ["AI"]})
+        assert status == 400
+
+        running = squad_server.submit({"topic": "Slow"})
+        queued = squad_server.submit({"topic": "Slow"})
+        assert running is not None and queued is not None
+        status, _ = post(f"{url}/kickoff", {"inputs": {"topic": "AI"}})
+        assert status == 503
+
+        squad_server.cancel(queued[0])
+        assert list(squad_server.results(*running))[-1][0] == "result"
+        assert list(squad_server.results(*queued))[-1][0] == "error"
+    finally:
+        http_server.shutdown()
+        squad_server.close()
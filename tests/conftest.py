@@ -2,3 +2,25 @@
 from dotenv import load_dotenv
 
 load_result = load_dotenv(override=True)
+
+import pytest
+
+from tests.helpers import ConcurrencyProbe, SlowModel, TopicEcho
+
+
+@pytest.fixture
+def topic_echo():
+    return TopicEcho
+
+
+@pytest.fixture
+def concurrency_probe():
+    return ConcurrencyProbe()
+
+
+@pytest.fixture
+def slow_model(concurrency_probe):
+    def make(**kwargs):
+        return SlowModel(probe=concurrency_probe, **kwargs)
+
+    return make
@@ -0,0 +1,94 @@
+"""Fake models and squads shared by the tests, importable by worker processes."""
+
+import re
+import threading
+import time
+from typing import Any
+
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain_core.language_models.chat_models import SimpleChatModel
+
+from squadai.agent import Agent
+from squadai.squad import Squad
+from squadai.task import Task
+
+
+class TopicEcho(SimpleChatModel):
+    """Answers with the topic of the "Write about <topic>." prompt, after `delay`
+    seconds, or 2 seconds for the Slow topic, and fails for the Fail topic."""
+
+    delay: float = 0
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        topic = re.search(r"Write about (\w+)\.", messages[-1].content).group(1)
+        time.sleep(2 if topic == "Slow" else self.delay)
+        if topic == "Fail":
+            raise ValueError("The model failed")
+        return f"Thought: I know it\nFinal Answer: {topic}"
+
+    @property
+    def _llm_type(self) -> str:
+        return "topic-echo"
+
+
+class RequestCounter(BaseCallbackHandler):
+    """Counts the requests of a fake model in the token usage of its agent."""
+
+    def __init__(self, token_process):
+        self.token_process = token_process
+
+    def on_llm_end(self, response, **kwargs):
+        self.token_process.sum_successful_requests(1)
+
+
+class ConcurrencyProbe:
+    """Holds each call for `seconds`, recording the most calls held at once."""
+
+    def __init__(self, seconds: float = 0.1):
+        self.seconds = seconds
+        self.max_running = 0
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def hold(self) -> None:
+        with self._lock:
+            self._running += 1
+            self.max_running = max(self.max_running, self._running)
+        time.sleep(self.seconds)
+        with self._lock:
+            self._running -= 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.max_running = 0
+
+
+class SlowModel(SimpleChatModel):
+    """Answers `answer` once held by the concurrency probe."""
+
+    probe: Any
+    answer: str = "Done"
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        self.probe.hold()
+        return f"Thought: I know it\nFinal Answer: {self.answer}"
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow"
+
+
+def echo_squad():
+    """Squad writing about the topic of its inputs, loaded by the CLI workers."""
+    agent = Agent(
+        role="writer",
+        goal="Write about topics",
+        backstory="You're an expert writer.",
+        llm=TopicEcho(),
+        allow_delegation=False,
+    )
+    agent.llm.callbacks = [RequestCounter(agent._token_process)]
+    task = Task(
+        description="Write about {topic}.", expected_output="The topic.", agent=agent
+    )
+    return Squad(agents=[agent], tasks=[task])
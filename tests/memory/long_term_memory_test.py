@@ -27,3 +27,31 @@ def test_save_and_search(long_term_memory):
     assert find["metadata"]["quality"] == 0.5
     assert find["metadata"]["task"] == "test_task"
     assert find["metadata"]["expected_output"] == "test_output"
+
+
+def test_save_executions_and_expect_their_average_duration(long_term_memory):
+    import uuid
+
+    task = f"test_task_{uuid.uuid4()}"
+    assert long_term_memory.expected_duration(task) is None
+
+    for duration in [1.0, 2.0, 6.0]:
+        long_term_memory.save_execution(
+            task=task,
+            agent="test_agent",
+            duration=duration,
+            token_usage={
+                "total_tokens": 30,
+                "prompt_tokens": 20,
+                "completion_tokens": 10,
+            },
+        )
+
+    assert long_term_memory.expected_duration(task) == 3.0
+    assert long_term_memory.expected_duration(task, latest_n=2) == 4.0
+    latest = long_term_memory.storage.load_executions(task, latest_n=1)[0]
+    assert latest["agent"] == "test_agent"
+    assert latest["duration"] == 6.0
+    assert latest["total_tokens"] == 30
+    assert latest["prompt_tokens"] == 20
+    assert latest["completion_tokens"] == 10
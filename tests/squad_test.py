@@ -12,6 +12,7 @@ from squadai.memory.contextual.contextual_memory import ContextualMemory
 from squadai.process import Process
 from squadai.task import Task
 from squadai.utilities import Logger, RPMController
+from tests.helpers import RequestCounter
 
 ceo = Agent(
     role="CEO",
@@ -349,7 +350,7 @@ def test_api_calls_throttling(capsys):
 
     squad = Squad(agents=[agent], tasks=[task], max_rpm=2, verbose=2)
 
-    with patch.object(RPMController, "_wait_for_next_minute") as moveon:
+    with patch.object(RPMController, "_wait_for_capacity") as moveon:
         moveon.return_value = True
         squad.kickoff()
         captured = capsys.readouterr()
@@ -408,10 +409,10 @@ def test_agents_rpm_is_never_set_if_squad_max_RPM_is_not_set():
 
 
 def test_async_task_execution():
-    import threading
+    from concurrent.futures import ThreadPoolExecutor
     from unittest.mock import patch
 
-    from squadai.tasks.task_output import TaskOutput
+    from squadai.tasks.executor_backend import wait_for_worker
 
     list_ideas = Task(
         description="Give me a list of 5 interesting ideas to explore for na article, what makes them unique and interesting.",
@@ -440,19 +441,20 @@ def test_async_task_execution():
 
     with patch.object(Agent, "execute_task") as execute:
         execute.return_value = "ok"
-        with patch.object(threading.Thread, "start") as start:
-            thread = threading.Thread(target=lambda: None, args=()).start()
-            start.return_value = thread
-            with patch.object(threading.Thread, "join", wraps=thread.join()) as join:
-                list_ideas.output = TaskOutput(
-                    description="A 4 paragraph article about AI.", raw_output="ok"
-                )
-                list_important_history.output = TaskOutput(
-                    description="A 4 paragraph article about AI.", raw_output="ok"
-                )
+        with patch.object(
+            ThreadPoolExecutor,
+            "submit",
+            autospec=True,
+            side_effect=ThreadPoolExecutor.submit,
+        ) as submit:
+            with patch(
+                "squadai.task.wait_for_worker", wraps=wait_for_worker
+            ) as wait_for:
                 squad.kickoff()
-                start.assert_called()
-                join.assert_called()
+                assert submit.call_count == 2
+                assert wait_for.call_count == 2
+                assert list_ideas.future.done()
+                assert list_important_history.future.done()
 
 
 def test_set_agents_step_callback():
@@ -685,6 +687,30 @@ def test_agent_usage_metrics_are_captured_for_hierarchical_process():
     }
 
 
+def test_usage_metrics_only_cover_the_last_kickoff(topic_echo):
+    agent = Agent(
+        role="writer",
+        goal="Write about topics",
+        backstory="You're an expert writer.",
+        llm=topic_echo(),
+        allow_delegation=False,
+    )
+    agent.llm.callbacks = [RequestCounter(agent._token_process)]
+    task = Task(
+        description="Write about {topic}.", expected_output="The topic.", agent=agent
+    )
+    squad = Squad(agents=[agent], tasks=[task])
+
+    for topic in ["AI", "Sales"]:
+        assert squad.kickoff(inputs={"topic": topic}) == topic
+        assert squad.usage_metrics == {
+            "total_tokens": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "successful_requests": 1,
+        }
+
+
 def test_squad_inputs_interpolate_both_agents_and_tasks():
     agent = Agent(
         role="{topic} Researcher",
@@ -757,7 +783,7 @@ def test_task_callback_on_squad():
         agents=[researcher_agent],
         process=Process.sequential,
         tasks=[list_ideas],
-        task_callback=lambda: None,
+        task_callback=lambda output: None,
     )
 
     with patch.object(Agent, "execute_task") as execute:
@@ -918,6 +944,8 @@ def test_squad_log_file_output(tmp_path):
 def test_manager_agent():
     from unittest.mock import patch
 
+    from squadai.tools.agent_tools import AgentTools
+
     task = Task(
         description="Come up with a list of 5 interesting ideas to explore for an article, then write one amazing paragraph highlight for each idea that showcases how good an article about this topic could be. Return the list of ideas with their paragraph and your notes.",
         expected_output="5 bullet points with a paragraph for each idea.",
@@ -942,6 +970,11 @@ def test_manager_agent():
         assert manager.allow_delegation == True
         execute.assert_called()
 
+        squad.kickoff()
+        assert len(manager.tools) == len(
+            AgentTools(agents=[researcher, writer], parallel_delegation=True).tools()
+        )
+
 
 def test_manager_agent_in_agents_raises_exception():
     task = Task(
@@ -995,3 +1028,981 @@ def test_manager_agent_with_tools_raises_exception():
 
     with pytest.raises(Exception):
         squad.kickoff()
+
+
+def test_parallel_process_runs_independent_tasks_concurrently():
+    import threading
+    import time
+    from unittest.mock import patch
+
+    list_ideas = Task(
+        description="Give me a list of 5 interesting ideas to explore for na article, what makes them unique and interesting.",
+        expected_output="Bullet point list of 5 important events.",
+        agent=researcher,
+    )
+    list_important_history = Task(
+        description="Research the history of AI and give me the 5 most important events that shaped the technology.",
+        expected_output="Bullet point list of 5 important events.",
+        agent=researcher,
+        context=[],
+    )
+    write_article = Task(
+        description="Write an article about the history of AI and its most important events.",
+        expected_output="A 4 paragraph article about AI.",
+        agent=writer,
+        context=[list_ideas, list_important_history],
+    )
+
+    squad = Squad(
+        agents=[researcher, writer],
+        process=Process.parallel,
+        tasks=[list_ideas, list_important_history, write_article],
+        full_output=True,
+    )
+
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def execute_task(task, context=None, tools=None):
+        with lock:
+            running.append(task)
+            max_running.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.remove(task)
+        return task.description
+
+    with patch.object(Agent, "execute_task", side_effect=execute_task):
+        result = squad.kickoff()
+
+    assert max(max_running) == 2
+    assert result["final_output"] == write_article.description
+    assert [output.raw_output for output in result["tasks_outputs"]] == [
+        list_ideas.description,
+        list_important_history.description,
+        write_article.description,
+    ]
+
+
+def test_parallel_process_passes_previous_output_as_context():
+    from unittest.mock import patch
+
+    list_ideas = Task(
+        description="Give me a list of 5 interesting ideas to explore for na article, what makes them unique and interesting.",
+        expected_output="Bullet point list of 5 important events.",
+        agent=researcher,
+    )
+    write_article = Task(
+        description="Write an article about the history of AI and its most important events.",
+        expected_output="A 4 paragraph article about AI.",
+        agent=writer,
+    )
+
+    squad = Squad(
+        agents=[researcher, writer],
+        process=Process.parallel,
+        tasks=[list_ideas, write_article],
+    )
+
+    with patch.object(Agent, "execute_task", return_value="ideas") as execute:
+        squad.kickoff()
+        execute.assert_called_with(
+            task=write_article, context="ideas", tools=write_article.tools
+        )
+
+
+def test_parallel_process_rejects_dependency_cycles():
+    first_task = Task(
+        description="Give me a list of 5 interesting ideas to explore for na article, what makes them unique and interesting.",
+        expected_output="Bullet point list of 5 important events.",
+        agent=researcher,
+    )
+    second_task = Task(
+        description="Write an article about the history of AI and its most important events.",
+        expected_output="A 4 paragraph article about AI.",
+        agent=writer,
+        context=[first_task],
+    )
+    first_task.context = [second_task]
+
+    with pytest.raises(pydantic_core._pydantic_core.ValidationError):
+        Squad(
+            agents=[researcher, writer],
+            process=Process.parallel,
+            tasks=[first_task, second_task],
+        )
+
+
+def test_kickoff_async_waits_for_async_tasks():
+    import asyncio
+    from unittest.mock import patch
+
+    list_ideas = Task(
+        description="Give me a list of 5 interesting ideas to explore for na article, what makes them unique and interesting.",
+        expected_output="Bullet point list of 5 important events.",
+        agent=researcher,
+        async_execution=True,
+    )
+    write_article = Task(
+        description="Write an article about the history of AI and its most important events.",
+        expected_output="A 4 paragraph article about AI.",
+        agent=writer,
+        context=[list_ideas],
+    )
+
+    squad = Squad(
+        agents=[researcher, writer],
+        tasks=[list_ideas, write_article],
+    )
+
+    async def aexecute_task(task, context=None, tools=None):
+        await asyncio.sleep(0)
+        return task.description
+
+    with patch.object(Agent, "aexecute_task", side_effect=aexecute_task) as execute:
+        result = asyncio.run(squad.kickoff_async())
+
+    assert result == write_article.description
+    execute.assert_called_with(
+        task=write_article, context=list_ideas.description, tools=write_article.tools
+    )
+    assert list_ideas.output.raw_output == list_ideas.description
+    assert squad._async_executor._shutdown
+
+
+def test_kickoff_for_each_runs_a_copy_of_the_squad_per_input():
+    from unittest.mock import patch
+
+    task = Task(
+        description="Write an article about {topic}.",
+        expected_output="A 4 paragraph article about {topic}.",
+        agent=writer,
+    )
+    squad = Squad(agents=[writer], tasks=[task])
+
+    def execute_task(task, context=None, tools=None):
+        task.agent._token_process.sum_prompt_tokens(10)
+        task.agent._token_process.sum_successful_requests(1)
+        return task.description
+
+    with patch.object(Agent, "execute_task", side_effect=execute_task):
+        results = squad.kickoff_for_each(
+            [{"topic": "dogs"}, {"topic": "cats"}, {"topic": "birds"}],
+            max_concurrency=2,
+        )
+
+    assert results == [
+        "Write an article about dogs.",
+        "Write an article about cats.",
+        "Write an article about birds.",
+    ]
+    assert task.description == "Write an article about {topic}."
+    assert task.output is None
+    assert squad.usage_metrics == {
+        "total_tokens": 30,
+        "prompt_tokens": 30,
+        "completion_tokens": 0,
+        "successful_requests": 3,
+    }
+
+
+def test_kickoff_for_each_copies_the_squad_when_an_execution_starts(topic_echo):
+    import asyncio
+    from unittest.mock import patch
+
+    events = []
+    agent = Agent(
+        role="writer",
+        goal="Write about topics",
+        backstory="You're an expert writer.",
+        llm=topic_echo(),
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Write about {topic}.",
+        expected_output="The topic.",
+        agent=agent,
+        callback=lambda output: events.append(output.raw_output),
+    )
+    squad = Squad(agents=[agent], tasks=[task])
+    copy_squad = Squad.copy
+    build_agent_executor = Agent._build_agent_executor
+
+    def copy(squad):
+        events.append("copy")
+        return copy_squad(squad)
+
+    with patch.object(Squad, "copy", autospec=True, side_effect=copy), patch.object(
+        Agent,
+        "_build_agent_executor",
+        autospec=True,
+        side_effect=build_agent_executor,
+    ) as build:
+        inputs = [{"topic": "AI"}, {"topic": "Sales"}]
+        assert squad.kickoff_for_each(inputs, max_concurrency=1) == ["AI", "Sales"]
+        assert events == ["copy", "AI", "copy", "Sales"]
+        assert build.call_count == 2
+
+        events.clear()
+        assert asyncio.run(squad.kickoff_for_each_async(inputs, max_concurrency=1)) == [
+            "AI",
+            "Sales",
+        ]
+        assert events == ["copy", "AI", "copy", "Sales"]
+        assert build.call_count == 4
+
+
+def test_squad_copy_shares_cache_and_rpm_controller():
+    researcher = Agent(
+        role="Researcher",
+        goal="Make the best research and analysis on content about AI and AI agents",
+        backstory="You're an expert researcher, specialized in technology.",
+        allow_delegation=False,
+    )
+    writer = Agent(
+        role="Senior Writer",
+        goal="Write the best content about AI and AI agents.",
+        backstory="You're a senior writer, specialized in technology.",
+        allow_delegation=False,
+    )
+    first_task = Task(
+        description="Give me a list of 5 interesting ideas to explore for na article, what makes them unique and interesting.",
+        expected_output="Bullet point list of 5 important events.",
+        agent=researcher,
+    )
+    second_task = Task(
+        description="Write an article about the history of AI and its most important events.",
+        expected_output="A 4 paragraph article about AI.",
+        agent=writer,
+        context=[first_task],
+    )
+    squad = Squad(
+        agents=[researcher, writer], tasks=[first_task, second_task], max_rpm=10
+    )
+
+    copied_squad = squad.copy()
+
+    copied_researcher, copied_writer = copied_squad.agents
+    copied_first_task, copied_second_task = copied_squad.tasks
+    assert copied_squad.id != squad.id
+    assert copied_researcher is not researcher
+    assert copied_first_task.agent is copied_researcher
+    assert copied_second_task.context == [copied_first_task]
+    assert copied_writer.cache_handler is squad._cache_handler
+    assert copied_writer._rpm_controller is squad._rpm_controller
+    assert copied_writer._token_process is not writer._token_process
+    assert copied_writer.agent_executor is not writer.agent_executor
+    assert [handler.token_cost_process for handler in copied_writer.llm.callbacks] == [
+        copied_writer._token_process
+    ]
+    assert [handler.token_cost_process for handler in writer.llm.callbacks] == [
+        writer._token_process
+    ]
+
+
+def test_consensual_process_runs_agents_in_parallel_and_votes():
+    import threading
+    import time
+    from unittest.mock import patch
+
+    editor = Agent(
+        role="Editor",
+        goal="Make sure the articles are accurate.",
+        backstory="You're an editor with years of experience in technology publications.",
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Who wrote the first algorithm intended to be run by a machine?",
+        expected_output="The name of the person.",
+        agent=researcher,
+    )
+    squad = Squad(
+        agents=[researcher, writer, editor],
+        tasks=[task],
+        process=Process.consensual,
+    )
+
+    answers = {
+        researcher.role: "Ada Lovelace",
+        writer.role: "Charles Babbage",
+        editor.role: "ada  lovelace",
+    }
+    lock = threading.Lock()
+    running, max_running = [0], [0]
+
+    def execute_task(self, task, context=None, tools=None):
+        with lock:
+            running[0] += 1
+            max_running[0] = max(max_running[0], running[0])
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+        return answers[self.role]
+
+    with patch.object(Agent, "execute_task", autospec=True, side_effect=execute_task):
+        result = squad.kickoff()
+
+    assert result == "Ada Lovelace"
+    assert task.output.raw_output == "Ada Lovelace"
+    assert max_running[0] == 3
+
+
+def test_consensual_process_uses_judge():
+    from unittest.mock import patch
+
+    task = Task(
+        description="Who wrote the first algorithm intended to be run by a machine?",
+        expected_output="The name of the person.",
+        agent=researcher,
+    )
+    squad = Squad(
+        agents=[researcher, writer],
+        tasks=[task],
+        process=Process.consensual,
+        judge=lambda answers: " or ".join(answers),
+    )
+
+    with patch.object(
+        Agent, "execute_task", autospec=True, side_effect=lambda self, **_: self.role
+    ):
+        result = squad.kickoff()
+
+    assert result == "Researcher or Senior Writer"
+
+
+def test_consensual_process_asks_judge_agent():
+    from unittest.mock import patch
+
+    judge = Agent(
+        role="Judge",
+        goal="Pick the best answer.",
+        backstory="You're an impartial judge.",
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Who wrote the first algorithm intended to be run by a machine?",
+        expected_output="The name of the person.",
+        agent=researcher,
+    )
+    squad = Squad(
+        agents=[researcher, writer],
+        tasks=[task],
+        process=Process.consensual,
+        judge=judge,
+    )
+
+    def execute_task(self, task, context=None, tools=None):
+        if self is judge:
+            assert "Researcher: Ada Lovelace" in task.description
+            assert "Senior Writer: Charles Babbage" in task.description
+            return "Ada Lovelace"
+        return "Ada Lovelace" if self is researcher else "Charles Babbage"
+
+    with patch.object(Agent, "execute_task", autospec=True, side_effect=execute_task):
+        result = squad.kickoff()
+
+    assert result == "Ada Lovelace"
+
+
+def test_judge_agent_shares_the_limits_of_the_squad_and_counts_its_tokens():
+    from unittest.mock import patch
+
+    agents = [
+        Agent(
+            role=role,
+            goal="Answer questions.",
+            backstory=f"You're the {role}.",
+            allow_delegation=False,
+        )
+        for role in ["Researcher", "Writer", "Judge"]
+    ]
+    judge = agents.pop()
+    task = Task(
+        description="Who wrote the first algorithm intended to be run by a machine?",
+        expected_output="The name of the person.",
+        agent=agents[0],
+    )
+    squad = Squad(
+        agents=agents,
+        tasks=[task],
+        process=Process.consensual,
+        judge=judge,
+        max_rpm=10,
+    )
+
+    assert judge._rpm_controller is squad._rpm_controller
+    assert judge.cache_handler is squad._cache_handler
+
+    def execute_task(self, task, context=None, tools=None):
+        self._token_process.sum_prompt_tokens(10)
+        self._token_process.sum_successful_requests(1)
+        return "Ada Lovelace"
+
+    with patch.object(Agent, "execute_task", autospec=True, side_effect=execute_task):
+        assert squad.kickoff() == "Ada Lovelace"
+
+    assert squad.usage_metrics == {
+        "total_tokens": 30,
+        "prompt_tokens": 30,
+        "completion_tokens": 0,
+        "successful_requests": 3,
+    }
+
+
+def test_kickoff_resumes_from_checkpointed_run(tmp_path):
+    from unittest.mock import patch
+
+    from squadai.squads import RunJournal
+
+    def create_squad():
+        tasks = [
+            Task(
+                description=f"Write the part {part} of an article about {{topic}}.",
+                expected_output="A paragraph.",
+                agent=writer,
+            )
+            for part in range(3)
+        ]
+        squad = Squad(agents=[writer], tasks=tasks, checkpoint=True)
+        squad._run_journal = RunJournal(db_path=f"{tmp_path}/squad_runs.db")
+        return squad
+
+    def fail_last_task(task, context=None, tools=None):
+        if "part 2" in task.description:
+            raise Exception("Connection error.")
+        return task.description
+
+    squad = create_squad()
+    with patch.object(Agent, "execute_task", side_effect=fail_last_task):
+        with pytest.raises(Exception, match="Connection error."):
+            squad.kickoff(inputs={"topic": "AI"})
+
+    resumed_squad = create_squad()
+    with patch.object(Agent, "execute_task", return_value="Last part.") as execute:
+        result = resumed_squad.kickoff(resume_from=squad.run_id)
+
+    assert result == "Last part."
+    execute.assert_called_once_with(
+        task=resumed_squad.tasks[2],
+        context="Write the part 1 of an article about AI.",
+        tools=resumed_squad.tasks[2].tools,
+    )
+    assert resumed_squad.run_id == squad.run_id
+    assert resumed_squad.tasks[0].output.raw_output == (
+        "Write the part 0 of an article about AI."
+    )
+
+
+def test_kickoff_stream_yields_events_as_they_happen():
+    import asyncio
+
+    from langchain.tools import tool
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    from squadai.squads import (
+        AgentActionEvent,
+        FinalResultEvent,
+        TaskOutputEvent,
+        TaskStartedEvent,
+        TokenChunkEvent,
+        ToolObservationEvent,
+    )
+
+    @tool
+    def multiplier(first_number: int, second_number: int) -> float:
+        """Useful for when you need to multiply two numbers together."""
+        return first_number * second_number
+
+    def create_squad():
+        llm = FakeListChatModel(
+            responses=[
+                'Thought: I need to multiply the numbers\nAction: multiplier\nAction Input: {"first_number": 3, "second_number": 4}',
+                "Thought: I now know the final answer\nFinal Answer: 12",
+            ]
+        )
+        agent = Agent(
+            role="Math Professor",
+            goal="Answer math questions.",
+            backstory="You're a math professor.",
+            llm=llm,
+            tools=[multiplier],
+            allow_delegation=False,
+        )
+        task = Task(
+            description="What is 3 times 4?",
+            expected_output="The result of the multiplication.",
+            agent=agent,
+        )
+        return Squad(agents=[agent], tasks=[task])
+
+    events = list(create_squad().kickoff_stream())
+
+    event_types = [type(event) for event in events if type(event) != TokenChunkEvent]
+    assert event_types == [
+        TaskStartedEvent,
+        AgentActionEvent,
+        ToolObservationEvent,
+        TaskOutputEvent,
+        FinalResultEvent,
+    ]
+    assert events[-1].result == "12"
+    assert events[-1].usage_metrics["total_tokens"] == 0
+    assert events[-2].output.raw_output == "12"
+    tool_observation = next(
+        event for event in events if isinstance(event, ToolObservationEvent)
+    )
+    assert tool_observation.tool == "multiplier"
+    assert tool_observation.observation == "12"
+    assert "".join(
+        [event.text for event in events if isinstance(event, TokenChunkEvent)]
+    ).endswith("Final Answer: 12")
+
+    async def collect_events():
+        return [event async for event in create_squad().kickoff_stream_async()]
+
+    async_events = asyncio.run(collect_events())
+    assert [type(event) for event in async_events] == [type(event) for event in events]
+    assert async_events[-1].usage_metrics == events[-1].usage_metrics
+
+
+def test_kickoff_stops_when_cancelled():
+    from langchain.tools import tool
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    from squadai.utilities import CancellationToken, SquadCancelledError
+
+    cancellation_token = CancellationToken()
+    calls = []
+
+    @tool
+    def get_final_answer(anything: str) -> float:
+        """Get the final answer but don't give it yet, just re-use this
+        tool non-stop."""
+        calls.append(anything)
+        cancellation_token.cancel()
+        return 42
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=FakeListChatModel(
+            responses=[
+                f'Thought: I need to use the tool\nAction: get_final_answer\nAction Input: {{"anything": "{attempt}"}}'
+                for attempt in range(5)
+            ]
+        ),
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Keep using the `get_final_answer` tool.",
+        expected_output="The final answer.",
+        tools=[get_final_answer],
+        agent=agent,
+    )
+    squad = Squad(agents=[agent], tasks=[task])
+
+    with pytest.raises(SquadCancelledError):
+        squad.kickoff(cancellation_token=cancellation_token)
+
+    assert calls == ["0"]
+    assert task.output is None
+
+
+def test_process_executor_backend_runs_tasks_in_reused_workers():
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    from squadai.tasks.executor_backend import ExecutorBackend, get_process_pool
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=FakeListChatModel(
+            responses=["Thought: I know it\nFinal Answer: Hello from a worker"]
+        ),
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Say hello to {name}.",
+        expected_output="A greeting.",
+        agent=agent,
+    )
+    squad = Squad(
+        agents=[agent],
+        tasks=[task],
+        executor_backend=ExecutorBackend.process,
+        max_workers=1,
+    )
+
+    assert squad.kickoff(inputs={"name": "John"}) == "Hello from a worker"
+    pool = get_process_pool(1)
+    assert squad.kickoff(inputs={"name": "Jane"}) == "Hello from a worker"
+    assert get_process_pool(1) is pool
+    assert task.output.raw_output == "Hello from a worker"
+    assert squad.usage_metrics["total_tokens"] == 0
+
+
+def test_process_executor_backend_counts_worker_requests_against_the_rate_limits():
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    from squadai.tasks.executor_backend import ExecutorBackend
+
+    agents = [
+        Agent(
+            role=f"test role {max_rpm}",
+            goal="test goal",
+            backstory="test backstory",
+            llm=FakeListChatModel(
+                responses=["Thought: I know it\nFinal Answer: Hello from a worker"]
+            ),
+            allow_delegation=False,
+            max_rpm=max_rpm,
+        )
+        for max_rpm in [None, 10]
+    ]
+    tasks = [
+        Task(description="Say hello.", expected_output="A greeting.", agent=agent)
+        for agent in agents
+    ]
+    squad = Squad(
+        agents=agents,
+        tasks=tasks,
+        executor_backend=ExecutorBackend.process,
+        max_workers=1,
+        max_rpm=10,
+    )
+
+    assert squad.kickoff() == "Hello from a worker"
+    assert squad.rate_limit_metrics["requests"] == 1
+    assert agents[1]._rpm_controller.metrics()["requests"] == 1
+
+
+def test_process_executor_backend_keeps_tasks_able_to_delegate_in_the_squad_process():
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    from squadai.tasks.executor_backend import ExecutorBackend
+
+    agents = [
+        Agent(
+            role=f"test role {index}",
+            goal="test goal",
+            backstory="test backstory",
+            llm=FakeListChatModel(
+                responses=["Thought: I know it\nFinal Answer: Hello from the squad"]
+            ),
+        )
+        for index in range(2)
+    ]
+    task = Task(
+        description="Say hello.", expected_output="A greeting.", agent=agents[0]
+    )
+    squad = Squad(
+        agents=agents,
+        tasks=[task],
+        executor_backend=ExecutorBackend.process,
+        max_workers=1,
+    )
+
+    with pytest.warns(UserWarning, match="allow_delegation=False"):
+        assert squad.kickoff() == "Hello from the squad"
+
+
+def test_inline_executor_backend_runs_async_tasks_in_the_calling_thread():
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=FakeListChatModel(responses=["Thought: I know it\nFinal Answer: Done"]),
+        allow_delegation=False,
+    )
+    async_task = Task(
+        description="Do something.",
+        expected_output="Something done.",
+        agent=agent,
+        async_execution=True,
+    )
+    task = Task(
+        description="Do something else.",
+        expected_output="Something else done.",
+        agent=agent,
+        context=[async_task],
+    )
+    squad = Squad(agents=[agent], tasks=[async_task, task], executor_backend="inline")
+
+    assert squad.kickoff() == "Done"
+    assert async_task.future is None
+    assert async_task.output.raw_output == "Done"
+
+
+def test_prepared_squad_reuses_compiled_executors_across_kickoffs():
+    from unittest.mock import patch
+
+    from langchain_core.callbacks import BaseCallbackHandler
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    prompts = []
+
+    class PromptRecorder(BaseCallbackHandler):
+        def on_chat_model_start(self, serialized, messages, **kwargs):
+            prompts.append(messages[0][0].content)
+
+    agent = Agent(
+        role="{topic} Researcher",
+        goal="Research {topic}",
+        backstory="You're an expert in {topic}.",
+        llm=FakeListChatModel(
+            responses=["Thought: I know it\nFinal Answer: Done"],
+            callbacks=[PromptRecorder()],
+        ),
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Research {topic}.",
+        expected_output="A summary.",
+        agent=agent,
+    )
+    squad = Squad(agents=[agent], tasks=[task]).prepare()
+
+    with patch.object(
+        Agent, "_build_agent_executor", wraps=agent._build_agent_executor
+    ) as build_agent_executor:
+        squad.kickoff(inputs={"topic": "AI"})
+        squad.kickoff(inputs={"topic": "Sales"})
+        build_agent_executor.assert_not_called()
+
+    assert prompts[0].startswith("You are AI Researcher. You're an expert in AI.")
+    assert prompts[1].startswith("You are Sales Researcher. You're an expert in Sales.")
+
+
+def test_concurrent_kickoffs_on_the_same_squad_dont_collide(topic_echo):
+    import threading
+
+    agent = Agent(
+        role="{topic} writer",
+        goal="Write about {topic}",
+        backstory="You're an expert in {topic}.",
+        llm=topic_echo(delay=0.1),
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Write about {topic}.",
+        expected_output="The topic.",
+        agent=agent,
+    )
+    squad = Squad(agents=[agent], tasks=[task])
+
+    results = {}
+
+    def kickoff(topic):
+        results[topic] = squad.kickoff(inputs={"topic": topic})
+
+    threads = [
+        threading.Thread(target=kickoff, args=(topic,))
+        for topic in ["AI", "Sales", "Finance"]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"AI": "AI", "Sales": "Sales", "Finance": "Finance"}
+    assert task.output.raw_output in results
+
+
+def test_async_tasks_run_in_a_bounded_executor_and_raise_their_errors(
+    concurrency_probe,
+):
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    class SlowModel(SimpleChatModel):
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            if "Fail" in messages[-1].content:
+                raise ValueError("The model failed")
+            if "Do something" in messages[-1].content:
+                concurrency_probe.hold()
+            return "Thought: I know it\nFinal Answer: Done"
+
+        @property
+        def _llm_type(self) -> str:
+            return "slow"
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=SlowModel(),
+        allow_delegation=False,
+    )
+    async_tasks = [
+        Task(
+            description=f"Do something {i}.",
+            expected_output="Something done.",
+            agent=agent,
+            async_execution=True,
+        )
+        for i in range(3)
+    ]
+    task = Task(description="Say hi.", expected_output="Hi.", agent=agent)
+    squad = Squad(agents=[agent], tasks=async_tasks + [task], max_workers=1)
+
+    assert squad.kickoff() == "Done"
+    assert concurrency_probe.max_running == 1
+    assert [async_task.output.raw_output for async_task in async_tasks] == ["Done"] * 3
+
+    failing_task = Task(
+        description="Fail.",
+        expected_output="Nothing.",
+        agent=agent,
+        async_execution=True,
+    )
+    squad = Squad(agents=[agent], tasks=[task, failing_task])
+
+    with pytest.raises(ValueError, match="The model failed"):
+        squad.kickoff()
+
+
+def test_parallel_process_starts_the_longest_critical_path_first():
+    from unittest.mock import MagicMock, patch
+
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    from squadai.agents import SquadAgentExecutor
+
+    started = []
+
+    class RecordingModel(SimpleChatModel):
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            started.append(messages[-1].content.split("Current Task: ")[1][:7])
+            return "Thought: I know it\nFinal Answer: Done"
+
+        @property
+        def _llm_type(self) -> str:
+            return "recording"
+
+    agent = Agent(
+        role="test role",
+        goal="test goal",
+        backstory="test backstory",
+        llm=RecordingModel(),
+        allow_delegation=False,
+    )
+    short_task = Task(
+        description="Task 1.", expected_output="Done.", agent=agent, context=[]
+    )
+    long_task = Task(
+        description="Task 2.", expected_output="Done.", agent=agent, context=[]
+    )
+    dependent_task = Task(
+        description="Task 3.",
+        expected_output="Done.",
+        agent=agent,
+        context=[short_task],
+    )
+    squad = Squad(
+        agents=[agent],
+        tasks=[short_task, long_task, dependent_task],
+        process=Process.parallel,
+        max_workers=1,
+    )
+
+    with patch.object(
+        Squad,
+        "_expected_durations",
+        return_value={short_task: 1.0, long_task: 2.0, dependent_task: 3.0},
+    ):
+        squad.kickoff()
+
+    assert started == ["Task 1.", "Task 3.", "Task 2."]
+
+    squad.memory = True
+    squad._short_term_memory = MagicMock()
+    squad._entity_memory = MagicMock()
+    squad._long_term_memory = MagicMock()
+    squad._long_term_memory.expected_duration.return_value = None
+    with patch.object(
+        ContextualMemory, "build_context_for_task", return_value=""
+    ), patch.object(SquadAgentExecutor, "_create_long_term_memory"):
+        squad.kickoff()
+
+    assert started[3:] == ["Task 1.", "Task 2.", "Task 3."]
+    recorded = {
+        call.kwargs["task"]: call.kwargs
+        for call in squad._long_term_memory.save_execution.call_args_list
+    }
+    assert set(recorded) == {"Task 1.", "Task 2.", "Task 3."}
+    assert recorded["Task 1."]["agent"] == "test role"
+    assert recorded["Task 1."]["duration"] >= 0
+    assert recorded["Task 1."]["token_usage"]["total_tokens"] == 0
+
+
+def test_pipeline_chains_squads_with_bounded_queues():
+    import re
+    import time
+
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    from squadai.pipeline import Pipeline, PipelineStage
+
+    class PatternEcho(SimpleChatModel):
+        pattern: str
+        delay: float
+
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            time.sleep(self.delay)
+            answer = re.search(self.pattern, messages[-1].content).group(1)
+            return f"Thought: I know it\nFinal Answer: {answer}"
+
+        @property
+        def _llm_type(self) -> str:
+            return "pattern-echo"
+
+    def squad(description, pattern, delay):
+        agent = Agent(
+            role="test role",
+            goal="test goal",
+            backstory="test backstory",
+            llm=PatternEcho(pattern=pattern, delay=delay),
+            allow_delegation=False,
+        )
+        task = Task(description=description, expected_output="Done.", agent=agent)
+        return Squad(agents=[agent], tasks=[task])
+
+    pipeline = Pipeline(
+        stages=[
+            squad("Research {topic}.", r"Research (\w+)\.", 0.05),
+            PipelineStage(
+                squad=squad("Write about {output}.", r"Write about (\w+)\.", 0.1),
+                max_concurrency=2,
+            ),
+        ]
+    )
+    read = []
+
+    def inputs():
+        for topic in ["AI", "Sales", "Finance", "Health", "Energy", "Retail"]:
+            read.append(topic)
+            yield {"topic": topic}
+
+    stream = pipeline.stream(inputs())
+    first_result = next(stream)
+    assert len(read) < 6
+    results = dict([first_result, *stream])
+
+    assert results == {
+        0: "AI",
+        1: "Sales",
+        2: "Finance",
+        3: "Health",
+        4: "Energy",
+        5: "Retail",
+    }
+    assert pipeline.usage_metrics is not None
+    assert pipeline.run([{"topic": "AI"}, {"topic": "RAG"}]) == ["AI", "RAG"]
+
+    failing = Pipeline(stages=[squad("Research {topic}.", r"(Unknown)", 0)])
+    with pytest.raises(AttributeError):
+        failing.run([{"topic": "AI"}])
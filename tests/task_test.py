@@ -1,5 +1,6 @@
 """Test Agent creation and execution basic functionality."""
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -483,3 +484,251 @@ def test_interpolate_inputs():
         == "Give me a list of 5 interesting ideas about ML to explore for an article, what makes them unique and interesting."
     )
     assert task.expected_output == "Bullet point list of 5 interesting ideas about ML."
+
+
+def test_task_result_cache_reuses_results_of_identical_tasks(tmp_path):
+    from squadai.tasks.result_cache import TaskResultCache
+
+    class ScoreOutput(BaseModel):
+        score: int
+
+    researcher = Agent(
+        role="Researcher",
+        goal="Make the best research and analysis on content about AI and AI agents",
+        backstory="You're an expert researcher, specialized in technology, software engineering, AI and startups. You work as a freelancer and is now working on doing research and analysis for a new customer.",
+        allow_delegation=False,
+    )
+    result_cache = TaskResultCache(db_path=f"{tmp_path}/task_result_cache.db")
+
+    def create_squad():
+        task = Task(
+            description="Give me an integer score between 1-5 for the following title: 'The impact of AI in the future of work'",
+            expected_output="The score of the title.",
+            output_pydantic=ScoreOutput,
+            agent=researcher,
+        )
+        return Squad(agents=[researcher], tasks=[task], result_cache=result_cache)
+
+    with patch.object(Agent, "execute_task", return_value='{"score": 4}') as execute:
+        first_squad = create_squad()
+        first_squad.kickoff()
+        second_squad = create_squad()
+        second_squad.kickoff()
+        assert execute.call_count == 1
+
+        second_squad.tasks[0].execute(context="Something else.")
+        assert execute.call_count == 2
+
+    assert second_squad.tasks[0].output.raw_output == '{"score": 4}'
+    assert create_squad().kickoff() == ScoreOutput(score=4)
+
+
+def test_task_result_cache_evicts_least_recently_used_results(tmp_path):
+    from squadai.tasks.result_cache import TaskResultCache
+
+    result_cache = TaskResultCache(
+        db_path=f"{tmp_path}/task_result_cache.db", max_size=30
+    )
+
+    result_cache.add("first", "12345", "12345")
+    result_cache.add("second", "12345", "12345")
+    assert result_cache.get("first") is not None
+    result_cache.add("third", "12345", "12345")
+
+    assert result_cache.get("first") == {
+        "raw_output": "12345",
+        "exported_output": "12345",
+    }
+    assert result_cache.get("second") is None
+    assert result_cache.get("third") is not None
+
+
+def test_hedged_execution_returns_the_first_output_and_cancels_the_others():
+    import threading
+    import time
+
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    calls = {"slow": 0, "fast": 0}
+    release = threading.Event()
+
+    class RaceModel(SimpleChatModel):
+        name: str
+        delay: float
+
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            calls[self.name] += 1
+            release.wait(self.delay)
+            return f"Thought: I keep going\nAction: missing tool\nAction Input: {{}}"
+
+        @property
+        def _llm_type(self) -> str:
+            return "race"
+
+    class FastModel(RaceModel):
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            calls[self.name] += 1
+            time.sleep(self.delay)
+            return f"Thought: I know it\nFinal Answer: Answer by {self.name}"
+
+    slow_agent = Agent(
+        role="slow",
+        goal="test goal",
+        backstory="test backstory",
+        llm=RaceModel(name="slow", delay=0.5),
+        allow_delegation=False,
+        max_iter=50,
+    )
+    fast_agent = Agent(
+        role="fast",
+        goal="test goal",
+        backstory="test backstory",
+        llm=FastModel(name="fast", delay=0.1),
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Do something.",
+        expected_output="Something done.",
+        agent=slow_agent,
+        hedged_executions=2,
+        hedge_delay=0.2,
+        hedge_agents=[fast_agent],
+    )
+
+    started_at = time.monotonic()
+    assert task.execute() == "Answer by fast"
+    assert time.monotonic() - started_at < 1
+    assert task.output.raw_output == "Answer by fast"
+
+    release.set()
+    time.sleep(0.2)
+    assert calls == {"slow": 1, "fast": 1}
+
+
+def test_hedged_execution_prefers_a_valid_output():
+    import time
+
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    class ScoreOutput(BaseModel):
+        score: int
+
+    class AnswerModel(SimpleChatModel):
+        answer: str
+        delay: float
+
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            time.sleep(self.delay)
+            return f"Thought: I know it\nFinal Answer: {self.answer}"
+
+        @property
+        def _llm_type(self) -> str:
+            return "answer"
+
+    invalid_agent = Agent(
+        role="invalid",
+        goal="test goal",
+        backstory="test backstory",
+        llm=AnswerModel(answer="a score of four", delay=0),
+        allow_delegation=False,
+    )
+    valid_agent = Agent(
+        role="valid",
+        goal="test goal",
+        backstory="test backstory",
+        llm=AnswerModel(answer='{"score": 4}', delay=0.2),
+        allow_delegation=False,
+    )
+    task = Task(
+        description="Give me a score.",
+        expected_output="The score.",
+        agent=invalid_agent,
+        output_pydantic=ScoreOutput,
+        hedged_executions=2,
+        hedge_agents=[valid_agent],
+    )
+
+    with patch("squadai.task.Converter.to_pydantic", return_value="a score of four"):
+        assert task.execute() == ScoreOutput(score=4)
+
+    async def aexecute():
+        return await task.aexecute()
+
+    with patch("squadai.task.Converter.to_pydantic", return_value="a score of four"):
+        assert asyncio.run(aexecute()) == ScoreOutput(score=4)
+
+
+def test_map_reduce_task_maps_shards_in_parallel_and_reduces_their_answers(
+    concurrency_probe,
+):
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    from squadai import MapReduceTask
+
+    prompts = []
+
+    class MapModel(SimpleChatModel):
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            prompt = messages[-1].content
+            concurrency_probe.hold()
+            item = prompt.split("context you're working with:\n")[1].split("\n")[0]
+            return f"Thought: I know it\nFinal Answer: Summary of {item}"
+
+        @property
+        def _llm_type(self) -> str:
+            return "map"
+
+    class ReduceModel(SimpleChatModel):
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            prompts.append(messages[-1].content)
+            return "Thought: I know it\nFinal Answer: All summaries"
+
+        @property
+        def _llm_type(self) -> str:
+            return "reduce"
+
+    mapper = Agent(
+        role="mapper",
+        goal="test goal",
+        backstory="test backstory",
+        llm=MapModel(),
+        allow_delegation=False,
+    )
+    reducer = Agent(
+        role="reducer",
+        goal="test goal",
+        backstory="test backstory",
+        llm=ReduceModel(),
+        allow_delegation=False,
+    )
+    task = MapReduceTask(
+        description="Summarize the documents.",
+        expected_output="A summary.",
+        agent=mapper,
+        reduce_agent=reducer,
+        map_input=["doc 1", "doc 2", "doc 3"],
+        max_workers=2,
+    )
+
+    assert task.shards() == ["doc 1", "doc 2", "doc 3"]
+    assert task.execute() == "All summaries"
+    assert concurrency_probe.max_running == 2
+    assert (
+        "Part 1: Summary of doc 1\n\nPart 2: Summary of doc 2\n\nPart 3: Summary of doc 3"
+        in prompts[0]
+    )
+
+    async def aexecute():
+        return await task.aexecute()
+
+    concurrency_probe.reset()
+    assert asyncio.run(aexecute()) == "All summaries"
+    assert concurrency_probe.max_running == 2
+
+    with pytest.raises(ValidationError):
+        MapReduceTask(
+            description="Summarize the documents.",
+            expected_output="A summary.",
+            agent=mapper,
+            hedged_executions=2,
+        )